@@ -4,12 +4,63 @@ Theme Discovery Agent for Wallpaper Agent.
 Searches the internet for current themes, events, and cultural celebrations
 relevant to the current week.
 """
+import hashlib
 import json
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from api_clients import SearchClient, DuckDuckGoClient, LLMClient
-from config import get_llm_config, load_config
+from config import load_config
+
+try:
+    # Optional faster parser for the LLM's theme JSON; loads() has the same API
+    import orjson as _json
+except ImportError:
+    _json = json
+
+# Bounds for the per-agent cache of raw LLM extraction responses
+_RESPONSE_CACHE_SIZE = 256
+_RESPONSE_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Static part of the theme extraction prompt. It is identical on every call,
+# so it leads the prompt; the per-call theme type, period and search results
+# follow it.
+_EXTRACTION_INSTRUCTIONS = """Extract theme information from the search results below.
+
+For each relevant result, extract:
+1. Theme name (clean, concise, remove dates/noise)
+2. Brief description (1-2 sentences, clear and meaningful)
+3. Relevance score (0-100) - how relevant is this theme to the given period?
+4. Optional: dates/context if mentioned
+5. Optional: significance (high/medium/low)
+6. Optional: visual_appeal (high/medium/low) - for wallpaper generation
+7. Optional: visual_elements (array of 2-3 key visual elements)
+8. Optional: colors (array of 2-3 color hex codes associated with theme)
+
+Return a JSON array with format:
+[
+  {
+    "name": "Diwali",
+    "description": "Festival of lights celebrated in India",
+    "relevance": 95,
+    "dates": "October/November 2024",
+    "significance": "high",
+    "visual_appeal": "high",
+    "visual_elements": ["lights", "fireworks", "decorations"],
+    "colors": ["#FFD700", "#FF4500", "#000000"]
+  },
+  ...
+]
+
+Only include themes that are:
+- Currently relevant (this week/month)
+- Suitable for wallpaper generation
+- Culturally significant or notable
+"""
 
 
 class ThemeDiscoveryAgent:
@@ -40,17 +91,14 @@ class ThemeDiscoveryAgent:
         
         # Initialize LLM client if not provided
         if llm_client is None:
-            llm_config = get_llm_config(config)
-            if llm_config.get("anthropic_api_key") or llm_config.get("openai_api_key"):
-                self.llm_client = LLMClient(
-                    provider=llm_config["provider"],
-                    api_key=llm_config.get(f"{llm_config['provider']}_api_key"),
-                    model=llm_config.get("model")
-                )
-            else:
-                self.llm_client = None
-        else:
-            self.llm_client = llm_client
+            llm_client = LLMClient.from_config(config)
+        self.llm_client = llm_client
+        
+        # Raw LLM extraction responses, least recently used first:
+        # prompt digest -> (time.monotonic() when stored, response)
+        self._response_cache: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        # discover_themes extracts categories concurrently
+        self._response_cache_lock = threading.Lock()
 
     def get_week_context(self) -> Dict[str, Any]:
         """
@@ -216,6 +264,43 @@ class ThemeDiscoveryAgent:
             themes.append(theme)
         return themes
     
+    def _generate_extraction(self, prompt: str) -> Optional[str]:
+        """
+        Send an extraction prompt to the LLM, reusing recent identical responses.
+
+        Repeated discovery rounds (e.g. orchestrator retries) often submit the
+        same search results, so responses are cached by prompt digest for
+        _RESPONSE_CACHE_TTL seconds. Failed calls (None) are not cached.
+
+        Args:
+            prompt: Full extraction prompt
+
+        Returns:
+            Raw LLM response text, or None on error
+        """
+        key = hashlib.sha256(prompt.encode()).digest()
+        now = time.monotonic()
+        
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None and now - entry[0] < _RESPONSE_CACHE_TTL:
+                self._response_cache.move_to_end(key)
+                return entry[1]
+        
+        response = self.llm_client.generate_text(prompt)
+        if response is not None:
+            with self._response_cache_lock:
+                self._response_cache[key] = (now, response)
+                self._response_cache.move_to_end(key)
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+        return response
+
+    def clear_response_cache(self) -> None:
+        """Forget cached LLM extraction responses so the next call re-queries the LLM."""
+        with self._response_cache_lock:
+            self._response_cache.clear()
+
     def _format_themes_with_llm(
         self,
         search_results: List[Dict[str, Any]],
@@ -238,56 +323,28 @@ class ThemeDiscoveryAgent:
         week_info = f"{week_context.get('month_name', '?')} {week_context.get('year', '?')}"
         
         # Format search results for LLM
-        results_text = "\n".join([
+        results_text = "\n".join(
             f"{i+1}. Title: {r.get('title', 'Unknown')}\n   Body: {r.get('body', '')[:200]}"
             for i, r in enumerate(search_results)
-        ])
+        )
         
-        prompt = f"""Extract theme information from these search results for {theme_type} themes in {week_info}.
+        prompt = _EXTRACTION_INSTRUCTIONS + f"""- Have relevance score >= {self.min_relevance_score}
+
+Period: {week_info}
+Theme type: {theme_type}
 
 Search Results:
 {results_text}
 
-For each relevant result, extract:
-1. Theme name (clean, concise, remove dates/noise)
-2. Brief description (1-2 sentences, clear and meaningful)
-3. Relevance score (0-100) - how relevant is this theme to {week_info}?
-4. Optional: dates/context if mentioned
-5. Optional: significance (high/medium/low)
-6. Optional: visual_appeal (high/medium/low) - for wallpaper generation
-7. Optional: visual_elements (array of 2-3 key visual elements)
-8. Optional: colors (array of 2-3 color hex codes associated with theme)
-
-Return a JSON array with format:
-[
-  {{
-    "name": "Diwali",
-    "description": "Festival of lights celebrated in India",
-    "relevance": 95,
-    "dates": "October/November 2024",
-    "significance": "high",
-    "visual_appeal": "high",
-    "visual_elements": ["lights", "fireworks", "decorations"],
-    "colors": ["#FFD700", "#FF4500", "#000000"]
-  }},
-  ...
-]
-
-Only include themes that are:
-- Currently relevant (this week/month)
-- Suitable for wallpaper generation
-- Culturally significant or notable
-- Have relevance score >= {self.min_relevance_score}
-
 Return only the JSON array, no other text."""
         
         try:
-            response = self.llm_client.generate_text(prompt)
+            response = self._generate_extraction(prompt)
             
             # Try to extract JSON array
             json_match = re.search(r'\[.*\]', response, re.DOTALL)
             if json_match:
-                themes_data = json.loads(json_match.group())
+                themes_data = _json.loads(json_match.group())
                 
                 themes = []
                 for theme_data in themes_data:
@@ -321,6 +378,23 @@ Return only the JSON array, no other text."""
         # Fallback if no valid JSON found
         return self._format_themes_simple(search_results, theme_type)
 
+    def _discover_category(
+        self,
+        search: Callable[[], List[Dict[str, Any]]],
+        theme_type: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Run one category's searches and format the results as themes.
+
+        Args:
+            search: One of the search_* methods
+            theme_type: Type of theme the search returns
+
+        Returns:
+            List of formatted theme dictionaries
+        """
+        return self._format_themes(search(), theme_type)
+
     def discover_themes(self) -> List[Dict[str, Any]]:
         """
         Discover themes by searching multiple sources.
@@ -328,23 +402,25 @@ Return only the JSON array, no other text."""
         Returns:
             List of discovered themes with metadata
         """
-        themes = []
+        categories = [
+            (self.search_indian_cultural_events, "indian_cultural"),
+            (self.search_indian_achievements, "indian_achievement"),
+            (self.search_global_themes, "global"),
+        ]
         
         try:
-            # Search Indian cultural events
-            cultural_results = self.search_indian_cultural_events()
-            cultural_themes = self._format_themes(cultural_results, "indian_cultural")
-            themes.extend(cultural_themes)
-            
-            # Search Indian achievements
-            achievement_results = self.search_indian_achievements()
-            achievement_themes = self._format_themes(achievement_results, "indian_achievement")
-            themes.extend(achievement_themes)
-            
-            # Search global themes
-            global_results = self.search_global_themes()
-            global_themes = self._format_themes(global_results, "global")
-            themes.extend(global_themes)
+            # Each category is an independent chain of network round-trips
+            # (searches, then optional LLM extraction), so run them concurrently
+            with ThreadPoolExecutor(
+                max_workers=len(categories),
+                thread_name_prefix="theme-discovery",
+            ) as executor:
+                futures = [
+                    executor.submit(self._discover_category, search, theme_type)
+                    for search, theme_type in categories
+                ]
+                # Collect in category order so earlier categories win deduplication
+                themes = [theme for future in futures for theme in future.result()]
             
         except Exception:
             # Return empty list on error
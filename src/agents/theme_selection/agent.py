@@ -15,7 +15,7 @@ from agents.theme_selection.stages import (
     FinalSortStage,
 )
 from api_clients import LLMClient
-from config import get_llm_config, get_theme_preferences, load_config
+from config import get_theme_preferences, load_config
 
 
 class ThemeSelectionAgent:
@@ -42,17 +42,8 @@ class ThemeSelectionAgent:
         
         # Initialize LLM client if not provided
         if llm_client is None:
-            llm_config = get_llm_config(config)
-            if llm_config.get("anthropic_api_key") or llm_config.get("openai_api_key"):
-                self.llm_client = LLMClient(
-                    provider=llm_config["provider"],
-                    api_key=llm_config.get(f"{llm_config['provider']}_api_key"),
-                    model=llm_config.get("model")
-                )
-            else:
-                self.llm_client = None
-        else:
-            self.llm_client = llm_client
+            llm_client = LLMClient.from_config(config)
+        self.llm_client = llm_client
         
         # Initialize ranker if not provided
         if ranker is None:
@@ -76,7 +67,8 @@ class ThemeSelectionAgent:
             ),
             NormalizationStage(),
             CombinedScoringStage(base_weight=0.4, llm_weight=0.6),
-            FinalSortStage(),
+            # select_theme only uses the top-ranked theme
+            FinalSortStage(top_k=1),
         ]
         
         # Create strategy and ranker
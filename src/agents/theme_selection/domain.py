@@ -2,10 +2,11 @@
 Domain model for Theme Selection Agent.
 """
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from itertools import repeat
+from typing import Dict, Any, Iterable, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Theme:
     """Theme domain model with scoring capabilities."""
     name: str
@@ -47,4 +48,35 @@ class Theme:
             final_score=data.get("final_score", 0.0),
             metadata=data.get("metadata", {}),
         )
-
+    
+    @classmethod
+    def build_batch(
+        cls,
+        names: Iterable[str],
+        types: Iterable[str],
+        descriptions: Optional[Iterable[str]] = None,
+    ) -> List["Theme"]:
+        """
+        Create unscored themes from parallel name/type/description sequences.
+        
+        Equivalent to calling ``Theme(name=..., type=..., description=...)``
+        per row, but assigns the slots directly instead of going through the
+        generated ``__init__``, which is markedly cheaper for long lists.
+        """
+        if descriptions is None:
+            descriptions = repeat("")
+        
+        themes = []
+        new = cls.__new__
+        for name, theme_type, description in zip(names, types, descriptions):
+            theme = new(cls)
+            theme.name = name
+            theme.description = description
+            theme.type = theme_type
+            theme.source = "search"
+            theme.base_score = 0.0
+            theme.llm_score = 0.0
+            theme.final_score = 0.0
+            theme.metadata = {}
+            themes.append(theme)
+        return themes
@@ -4,8 +4,9 @@ Ranking stages for theme selection pipeline.
 Implements Chain of Responsibility pattern - each stage processes themes
 and passes them to the next stage.
 """
+import heapq
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 from agents.theme_selection.domain import Theme
 
 
@@ -213,7 +214,19 @@ class CombinedScoringStage(RankingStage):
 class FinalSortStage(RankingStage):
     """Final sorting stage - sorts themes by final_score descending."""
     
+    def __init__(self, top_k: Optional[int] = None):
+        """
+        Initialize final sort stage.
+        
+        Args:
+            top_k: Keep only the top_k highest-scoring themes (default None
+                keeps and sorts all of them)
+        """
+        self.top_k = top_k
+    
     def apply(self, themes: List[Theme]) -> List[Theme]:
         """Sort themes by final_score in descending order."""
+        if self.top_k is not None:
+            return heapq.nlargest(self.top_k, themes, key=lambda t: t.final_score)
         return sorted(themes, key=lambda t: t.final_score, reverse=True)
 
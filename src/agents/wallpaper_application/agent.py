@@ -10,22 +10,39 @@ from typing import Optional
 from agents.wallpaper_application.domain import ApplicationRequest, ApplicationResult
 from agents.wallpaper_application.macos_applier import MacOSWallpaperApplier
 
+# platform.system() values with an application path
+_PLATFORMS = {'Darwin': 'macos', 'Windows': 'windows'}
+
 
 class WallpaperApplicationAgent:
     """Agent responsible for applying wallpapers to desktop."""
     
-    def __init__(self):
-        """Initialize Wallpaper Application Agent."""
-        system = platform.system()
-        if system == 'Darwin':
-            self.platform = 'macos'
+    def __init__(self, target_platform: Optional[str] = None):
+        """
+        Initialize Wallpaper Application Agent.
+        
+        Args:
+            target_platform: 'macos' or 'windows' (optional, detected from the OS if not provided)
+            
+        Raises:
+            ValueError: If target_platform is not a supported platform
+        """
+        if target_platform is None:
+            self.platform = self._detect_platform()
+        elif target_platform in _PLATFORMS.values():
+            self.platform = target_platform
+        else:
+            raise ValueError(f"Unsupported platform: {target_platform!r}")
+        
+        if self.platform == 'macos':
             self._applier = MacOSWallpaperApplier()
-        elif system == 'Windows':
-            self.platform = 'windows'
-            self._applier = None  # Windows applier not yet implemented
         else:
-            self.platform = 'unknown'
-            self._applier = None
+            self._applier = None  # Windows applier not yet implemented
+    
+    @staticmethod
+    def _detect_platform() -> str:
+        """Map platform.system() to the agent's platform name."""
+        return _PLATFORMS.get(platform.system(), 'unknown')
     
     def apply_wallpaper(self, request: ApplicationRequest) -> ApplicationResult:
         """
@@ -1,17 +1,169 @@
 """
 macOS-specific wallpaper application implementation.
 """
+import queue
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from types import SimpleNamespace
+from typing import List, Optional
+
+
+DESKTOP_COUNT_SCRIPT = 'tell application "System Events" to count of desktops'
+DESKTOP_COUNT_COMMAND = ['osascript', '-e', DESKTOP_COUNT_SCRIPT]
+
+
+def _load_appkit() -> Optional[SimpleNamespace]:
+    """Import the PyObjC classes used to set wallpapers in-process, if available."""
+    try:
+        from AppKit import NSScreen, NSWorkspace
+        from Foundation import NSURL
+    except ImportError:
+        return None
+    return SimpleNamespace(NSScreen=NSScreen, NSWorkspace=NSWorkspace, NSURL=NSURL)
+
+
+class _OsascriptSession:
+    """
+    Long-lived `osascript -i` process that runs scripts over stdin.
+    
+    Each script is wrapped in a try block whose error handler evaluates to
+    ERROR_PREFIX plus the message, and is followed by a sentinel string
+    literal; everything osascript prints before the sentinel is echoed back is
+    that script's output.
+    """
+    
+    SENTINEL = '__wallpaper_agent_done__'
+    ERROR_PREFIX = 'ERR:'
+    # Interactive prompt and result markers; several prompts can share a line
+    PROMPTS = ('>> ', '=> ')
+    
+    def __init__(self):
+        self._proc = subprocess.Popen(
+            ['osascript', '-i'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        # A reader thread lets run() wait on output with a timeout
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+    
+    def _pump(self) -> None:
+        for line in self._proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+    
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+    
+    @classmethod
+    def _strip_prompts(cls, line: str) -> str:
+        """Remove leading prompt/result markers, leaving the output itself intact."""
+        while True:
+            for prompt in cls.PROMPTS:
+                if line.startswith(prompt):
+                    line = line[len(prompt):]
+                    break
+            else:
+                return line
+    
+    def run(self, script: str, timeout: float) -> subprocess.CompletedProcess:
+        """Run a script, raising TimeoutExpired like subprocess.run."""
+        self._proc.stdin.write(
+            f'try\n{script}\non error m\n"{self.ERROR_PREFIX}" & m\nend try\n'
+            f'"{self.SENTINEL}"\n'
+        )
+        self._proc.stdin.flush()
+        
+        output = []
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.close()
+                raise subprocess.TimeoutExpired(['osascript', '-i'], timeout)
+            if line is None:
+                raise RuntimeError('osascript session exited unexpectedly')
+            if self.SENTINEL in line:
+                break
+            output.append(self._strip_prompts(line).rstrip())
+        
+        output = [line for line in output if line]
+        errors = [
+            line.strip('"')[len(self.ERROR_PREFIX):]
+            for line in output
+            if line.strip('"').startswith(self.ERROR_PREFIX)
+        ]
+        if errors:
+            return subprocess.CompletedProcess(['osascript', '-i'], 1, stdout='', stderr='\n'.join(errors))
+        return subprocess.CompletedProcess(['osascript', '-i'], 0, stdout='\n'.join(output), stderr='')
+    
+    def close(self) -> None:
+        if self.alive:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
 
 
 class MacOSWallpaperApplier:
     """macOS-specific wallpaper application using osascript."""
     
-    def __init__(self):
-        """Initialize macOS wallpaper applier."""
-        pass
+    def __init__(self, persistent: bool = False):
+        """
+        Initialize macOS wallpaper applier.
+        
+        Args:
+            persistent: Run scripts through one long-lived osascript process
+                instead of spawning a new one per call. Worth enabling when
+                applying many wallpapers in one session.
+        """
+        # Desktop count from the last successful osascript query
+        self._desktop_count_cache: Optional[int] = None
+        self._persistent = persistent
+        self._session: Optional[_OsascriptSession] = None
+        # PyObjC bindings for setting the current desktop without osascript
+        self._appkit = _load_appkit()
+    
+    def _run_osascript(
+        self,
+        command: List[str],
+        script: str,
+        timeout: float,
+    ) -> subprocess.CompletedProcess:
+        """Run a one-line script via the persistent session or `command`."""
+        if not self._persistent:
+            return subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        
+        if self._session is None or not self._session.alive:
+            self._session = _OsascriptSession()
+        return self._session.run(script, timeout)
+    
+    def _apply_with_nsworkspace(self, file_path: Path) -> tuple[bool, Optional[str]]:
+        """Set the main screen's desktop picture through NSWorkspace."""
+        appkit = self._appkit
+        url = appkit.NSURL.fileURLWithPath_(str(file_path.absolute()))
+        screen = appkit.NSScreen.mainScreen()
+        ok, error = appkit.NSWorkspace.sharedWorkspace().setDesktopImageURL_forScreen_options_error_(
+            url, screen, {}, None
+        )
+        return (bool(ok), None if ok else str(error or 'Unknown error'))
+    
+    def close(self) -> None:
+        """Terminate the persistent osascript process, if one is running."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def __del__(self):
+        self.close()
     
     def apply_wallpaper(
         self,
@@ -43,24 +195,19 @@ class MacOSWallpaperApplier:
             if desktop_count > 1 and desktop_index == 1:
                 # Target specific desktop (second desktop when 2+ desktops exist)
                 # Note: macOS Spaces/Desktops are 1-indexed in AppleScript
-                script = f'''
-                    tell application "System Events"
-                        tell desktop {desktop_number}
-                            set picture to POSIX file "{file_path_str}"
-                        end tell
-                    end tell
-                '''
+                script = (
+                    f'tell application "System Events" to tell desktop {desktop_number} '
+                    f'to set picture to POSIX file "{file_path_str}"'
+                )
+            elif self._appkit is not None:
+                # Current desktop can be set in-process; Spaces still need System Events
+                return self._apply_with_nsworkspace(file_path)
             else:
                 # Single desktop or first desktop - use Finder method (more reliable)
                 script = f'tell application "Finder" to set desktop picture to POSIX file "{file_path_str}"'
             
             # Execute osascript
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+            result = self._run_osascript(['osascript', '-e', script], script, timeout=10)
             
             if result.returncode == 0:
                 return (True, None)
@@ -76,30 +223,33 @@ class MacOSWallpaperApplier:
         """
         Get the number of virtual desktops (Spaces) on macOS.
         
+        The first successful result is cached on the instance; call
+        invalidate_desktop_count() to query osascript again.
+        
         Returns:
             Number of desktops, defaults to 1 on error
         """
+        if self._desktop_count_cache is not None:
+            return self._desktop_count_cache
+        
         try:
             # Use osascript to get desktop count
-            script = '''
-                tell application "System Events"
-                    count of desktops
-                end tell
-            '''
-            
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
+            result = self._run_osascript(
+                DESKTOP_COUNT_COMMAND,
+                DESKTOP_COUNT_SCRIPT,
                 timeout=5,
             )
             
             if result.returncode == 0:
                 count = int(result.stdout.strip())
-                return max(1, count)  # Ensure at least 1
+                self._desktop_count_cache = max(1, count)  # Ensure at least 1
+                return self._desktop_count_cache
             else:
                 return 1  # Default to 1 on error
                 
         except (ValueError, subprocess.TimeoutExpired, Exception):
             return 1  # Default to 1 on any error
-
+    
+    def invalidate_desktop_count(self) -> None:
+        """Forget the cached desktop count so the next call re-queries it."""
+        self._desktop_count_cache = None
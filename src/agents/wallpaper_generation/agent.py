@@ -6,7 +6,6 @@ Generates wallpapers using image generation clients and processes them for use.
 from pathlib import Path
 from typing import Optional, Dict, Any
 from api_clients import ImageGenerationClient, PollinationsClient
-from utils.image_processor import process_wallpaper
 from config import get_wallpaper_config, load_config
 from agents.wallpaper_generation.domain import WallpaperRequest, WallpaperResult
 
@@ -81,9 +80,11 @@ class WallpaperGenerationAgent:
                     error="Failed to generate image: empty response",
                 )
             
-            # Process and save wallpaper
+            # Process and save wallpaper (imported here to keep NumPy/PIL off
+            # the orchestrator's import path)
             from PIL import Image
             import io
+            from utils.image_processor import process_wallpaper
             
             # Convert bytes to PIL Image
             image = Image.open(io.BytesIO(image_data))
@@ -4,6 +4,7 @@ LLM client for Wallpaper Agent.
 Supports Anthropic Claude and OpenAI APIs with configurable models.
 """
 from typing import Optional
+from config import get_llm_config
 
 
 class LLMClient:
@@ -33,6 +34,27 @@ class LLMClient:
         self._client = None
         self._initialize_client()
 
+    @classmethod
+    def from_config(cls, config) -> Optional["LLMClient"]:
+        """
+        Create a client for the configured provider.
+
+        Args:
+            config: Config instance
+
+        Returns:
+            LLMClient instance, or None if no API key is configured
+        """
+        llm_config = get_llm_config(config)
+        if not (llm_config.get("anthropic_api_key") or llm_config.get("openai_api_key")):
+            return None
+
+        return cls(
+            provider=llm_config["provider"],
+            api_key=llm_config.get(f"{llm_config['provider']}_api_key"),
+            model=llm_config.get("model"),
+        )
+
     def _get_default_model(self) -> str:
         """Get default model for the provider."""
         if self.provider == "anthropic":
@@ -9,9 +9,15 @@ from api_clients.interfaces import ImageGenerationClient
 class PollinationsClient(ImageGenerationClient):
     """Client for Pollinations.ai image generation API."""
 
-    def __init__(self):
-        """Initialize Pollinations client."""
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Initialize Pollinations client.
+
+        Args:
+            session: Shared requests.Session for connection reuse (optional)
+        """
         self.base_url = "https://image.pollinations.ai/prompt/"
+        self.session = session
 
     def generate_image(
         self,
@@ -39,8 +45,9 @@ class PollinationsClient(ImageGenerationClient):
             url = self.base_url + prompt.replace(" ", "%20")
             url += f"?width={width}&height={height}&model={model}"
 
-            # Make request
-            response = requests.get(url, timeout=60)
+            # Make request (reuse pooled connections when a session is shared)
+            http = self.session or requests
+            response = http.get(url, timeout=60)
             
             if response.status_code == 200:
                 return response.content
@@ -6,7 +6,7 @@ and .env files.
 """
 import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import IO, Dict, Optional
 from dotenv import load_dotenv
 
 
@@ -52,17 +52,26 @@ class Config:
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
 
-def load_config(env_file_path: Optional[Path] = None) -> Config:
+def load_config(
+    env_file_path: Optional[Path] = None,
+    env_stream: Optional[IO[str]] = None,
+) -> Config:
     """
     Load configuration from .env file and environment variables.
 
     Args:
         env_file_path: Optional path to .env file. If None, looks for .env
                       in current directory.
+        env_stream: Optional text stream with .env content. When given, it is
+                   used instead of reading a file from disk.
 
     Returns:
         Config instance with loaded configuration.
     """
+    if env_stream is not None:
+        load_dotenv(stream=env_stream)
+        return Config()
+
     if env_file_path is None:
         env_file_path = Path(".env")
 
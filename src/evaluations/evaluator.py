@@ -12,7 +12,7 @@ from .selection_evaluator import SelectionEvaluator
 from .generation_evaluator import GenerationEvaluator
 from .application_evaluator import ApplicationEvaluator
 from api_clients import LLMClient
-from config import get_llm_config, load_config
+from config import load_config
 from utils.logger import get_logger
 
 
@@ -39,17 +39,8 @@ class AgentEvaluator:
         
         # Initialize LLM client if not provided
         if llm_client is None:
-            llm_config = get_llm_config(config)
-            if llm_config.get("anthropic_api_key") or llm_config.get("openai_api_key"):
-                self.llm_client = LLMClient(
-                    provider=llm_config["provider"],
-                    api_key=llm_config.get(f"{llm_config['provider']}_api_key"),
-                    model=llm_config.get("model")
-                )
-            else:
-                self.llm_client = None
-        else:
-            self.llm_client = llm_client
+            llm_client = LLMClient.from_config(config)
+        self.llm_client = llm_client
         
         # Initialize individual evaluators
         self.discovery_evaluator = DiscoveryEvaluator(llm_client=self.llm_client)
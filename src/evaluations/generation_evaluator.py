@@ -1,12 +1,46 @@
 """
 Evaluator for Wallpaper Generation Agent.
 """
+import struct
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from .metrics import EvaluationResult, EvaluationMetrics
 from utils.logger import get_logger
 
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_dimensions(image_path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a PNG's IHDR chunk.
+    
+    The IHDR chunk always directly follows the 8-byte signature, so the size
+    sits at bytes 16-24. Returns None for anything that is not a PNG.
+    """
+    with open(image_path, "rb") as f:
+        header = f.read(24)
+    if len(header) == 24 and header.startswith(PNG_SIGNATURE) and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    return None
+
+
+@lru_cache(maxsize=64)
+def _mean_luminance(path_str: str, mtime_ns: int, size_bytes: int) -> float:
+    """
+    Mean luminance (0-255) of an image file.
+    
+    Keyed on (path, mtime, size) so re-evaluating an unchanged wallpaper skips
+    the decode; rewriting the file changes the key.
+    """
+    from PIL import Image
+    from utils.image_processor import mean_luminance
+    
+    with Image.open(path_str) as img:
+        return mean_luminance(img)
+
+
 class GenerationEvaluator:
     """Evaluates Wallpaper Generation Agent output quality."""
     
@@ -85,37 +119,58 @@ class GenerationEvaluator:
         try:
             from PIL import Image
             
-            if not image_path.exists():
+            # A single stat() both checks existence and gives the file size
+            try:
+                file_size = image_path.stat().st_size
+            except OSError:
                 return 0.0
             
-            img = Image.open(image_path)
-            
             score = 0.0
             
-            # Resolution check (40 points)
-            width, height = img.size
-            if width >= 2000 and height >= 1500:
-                score += 40.0
-            elif width >= 1000 and height >= 750:
-                score += 20.0
-            
             # Format check (20 points)
             if image_path.suffix.lower() in ['.png', '.jpg', '.jpeg']:
                 score += 20.0
             
             # File size check (20 points)
-            file_size = image_path.stat().st_size
             if 100_000 <= file_size <= 10_000_000:  # 100KB to 10MB
                 score += 20.0
             elif file_size > 0:
                 score += 10.0
             
+            # PNG dimensions come straight from the header; other formats
+            # fall back to PIL. Files PIL cannot open earn no points at all.
+            img = None
+            dimensions = _png_dimensions(image_path)
+            if dimensions is None:
+                try:
+                    img = Image.open(image_path)
+                except Exception:
+                    return 0.0
+                dimensions = img.size
+            
+            # Resolution check (40 points)
+            width, height = dimensions
+            if width >= 2000 and height >= 1500:
+                score += 40.0
+            elif width >= 1000 and height >= 750:
+                score += 20.0
+            
             # Image validity (20 points)
-            try:
-                img.verify()
+            if img is None:
+                # A readable header says nothing about the body; a PNG that
+                # fails verification scores like any file PIL cannot open.
+                try:
+                    with Image.open(image_path) as png:
+                        png.verify()
+                except Exception:
+                    return 0.0
                 score += 20.0
-            except Exception:
-                pass
+            else:
+                try:
+                    img.verify()
+                    score += 20.0
+                except Exception:
+                    pass
             
             return score
             
@@ -128,11 +183,12 @@ class GenerationEvaluator:
         theme: Dict[str, Any]
     ) -> float:
         """Evaluate theme adherence (0-100)."""
-        if not self.llm_client or not image_path.exists():
-            return 75.0  # Default if can't evaluate
+        # Without an LLM there is nothing to assess, so skip the filesystem
+        if self.llm_client is None:
+            return 75.0
         
-        theme_name = theme.get("name", "")
-        theme_desc = theme.get("description", "")
+        if not image_path.exists():
+            return 75.0  # Default if can't evaluate
         
         # For now, return default score
         # Could be enhanced with image analysis + LLM
@@ -141,22 +197,11 @@ class GenerationEvaluator:
     def _evaluate_dark_theme_compliance(self, image_path: Path) -> float:
         """Evaluate dark theme compliance (0-100)."""
         try:
-            from PIL import Image
-            import numpy as np
-            
             if not image_path.exists():
                 return 0.0
             
-            img = Image.open(image_path)
-            img_array = np.array(img)
-            
-            # Calculate average brightness
-            if len(img_array.shape) == 3:
-                # RGB image
-                brightness = np.mean(img_array)
-            else:
-                # Grayscale
-                brightness = np.mean(img_array)
+            stat = image_path.stat()
+            brightness = _mean_luminance(str(image_path), stat.st_mtime_ns, stat.st_size)
             
             # Dark theme: brightness should be low (< 128 for 0-255 scale)
             # Score: 100 if brightness < 50, decreases as brightness increases
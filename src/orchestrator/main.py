@@ -3,26 +3,104 @@ Main Orchestrator for Wallpaper Agent.
 
 Coordinates all agents to execute the full wallpaper generation workflow.
 """
+import functools
+import json
 import time
+import requests
 from pathlib import Path
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, List
 from agents import (
     ThemeDiscoveryAgent,
     ThemeSelectionAgent,
     WallpaperGenerationAgent,
     WallpaperApplicationAgent,
 )
-from agents.wallpaper_generation.domain import WallpaperRequest
-from agents.wallpaper_application.domain import ApplicationRequest
+from agents.wallpaper_generation.domain import WallpaperRequest, WallpaperResult
+from agents.wallpaper_application.domain import ApplicationRequest, ApplicationResult
+from api_clients import LLMClient, PollinationsClient
 from src.orchestrator.domain import OrchestrationResult, OrchestrationStatus
 from utils.logger import get_logger
 from config import load_config
 
 
+# Default location for per-run checkpoints used to resume failed runs
+DEFAULT_CHECKPOINT_DIR = Path.home() / ".cache" / "wallpaper_agent"
+
+# Checkpoints older than this are ignored (one weekly cycle)
+CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Checkpointed steps in run order; each depends on the ones before it
+CHECKPOINT_STEPS = ("1_themes", "2_selected_theme", "3_wallpaper")
+
+
+def _has_themes(themes: Any) -> bool:
+    """Check that theme discovery returned at least one theme."""
+    return bool(themes) and len(themes) > 0
+
+
+def _is_not_none(result: Any) -> bool:
+    """Check that an operation returned a result."""
+    return result is not None
+
+
+def _is_successful_result(result: Any) -> bool:
+    """Check the success flag of an agent result object."""
+    return result.success if hasattr(result, 'success') else bool(result)
+
+
+def _wallpaper_checkpoint(result: Any) -> Optional[Dict[str, Any]]:
+    """Serialize a successful wallpaper result for checkpointing."""
+    if not getattr(result, "success", False):
+        return None
+    return result.to_dict()
+
+
+def _wallpaper_from_checkpoint(data: Dict[str, Any]) -> Optional[WallpaperResult]:
+    """Rebuild a wallpaper result from a checkpoint if its file still exists."""
+    result = WallpaperResult.from_dict(data)
+    if not result.success or result.file_path is None or not result.file_path.exists():
+        return None
+    return result
+
+
+def retryable(
+    operation_name: str,
+    is_success: Optional[Callable[[Any], bool]] = None,
+) -> Callable:
+    """
+    Decorate an orchestrator method so calls are retried with backoff.
+    
+    Args:
+        operation_name: Name of operation for logging
+        is_success: Optional function to check if result is successful
+        
+    Returns:
+        Decorator wrapping the method with WallpaperOrchestrator._retry_with_backoff
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self._retry_with_backoff(
+                operation=functools.partial(method, self, *args, **kwargs),
+                operation_name=operation_name,
+                is_success=is_success,
+            )
+        return wrapper
+    return decorator
+
+
 class WallpaperOrchestrator:
     """Orchestrator that coordinates all agents for wallpaper generation workflow."""
     
-    def __init__(self, config=None, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(
+        self,
+        config=None,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        max_delay: float = 30.0,
+        run_id: Optional[str] = None,
+        checkpoint_dir: Optional[Path] = None,
+    ):
         """
         Initialize Wallpaper Orchestrator.
         
@@ -30,21 +108,194 @@ class WallpaperOrchestrator:
             config: Config instance (optional, loads from env if not provided)
             max_retries: Maximum number of retries for failed operations (default: 3)
             retry_delay: Initial delay between retries in seconds (default: 1.0)
+            max_delay: Upper bound for a single backoff delay in seconds (default: 30.0)
+            run_id: Identifier for resumable runs (optional). When set, completed
+                steps are checkpointed to disk and skipped when the same run is
+                executed again; checkpointing is disabled otherwise.
+            checkpoint_dir: Base directory for run checkpoints
+                (default: ~/.cache/wallpaper_agent)
         """
         if config is None:
             config = load_config()
         
         self.config = config
         self.logger = get_logger(__name__)
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._max_delay = max_delay
+        self._delays = self._compute_delays()
+        
+        # Checkpointing is an explicit opt-in for identified runs
+        self.run_id = run_id
+        self.checkpoint_dir = Path(checkpoint_dir or DEFAULT_CHECKPOINT_DIR)
+        
+        # Shared clients so connection pools are reused across agents
+        self.http_session = requests.Session()
+        self.llm_client = LLMClient.from_config(config)
         
         # Initialize all agents
-        self.theme_discovery_agent = ThemeDiscoveryAgent(config=config)
-        self.theme_selection_agent = ThemeSelectionAgent(config=config)
-        self.wallpaper_generation_agent = WallpaperGenerationAgent(config=config)
+        self.theme_discovery_agent = ThemeDiscoveryAgent(
+            config=config,
+            llm_client=self.llm_client,
+        )
+        self.theme_selection_agent = ThemeSelectionAgent(
+            config=config,
+            llm_client=self.llm_client,
+        )
+        self.wallpaper_generation_agent = WallpaperGenerationAgent(
+            config=config,
+            image_client=PollinationsClient(session=self.http_session),
+        )
         self.wallpaper_application_agent = WallpaperApplicationAgent()
     
+    @property
+    def max_retries(self) -> int:
+        """Maximum number of attempts per operation."""
+        return self._max_retries
+    
+    @max_retries.setter
+    def max_retries(self, value: int) -> None:
+        self._max_retries = value
+        self._delays = self._compute_delays()
+    
+    @property
+    def retry_delay(self) -> float:
+        """Initial delay between retries in seconds."""
+        return self._retry_delay
+    
+    @retry_delay.setter
+    def retry_delay(self, value: float) -> None:
+        self._retry_delay = value
+        self._delays = self._compute_delays()
+    
+    def _compute_delays(self) -> tuple:
+        """
+        Precompute the backoff schedule for one operation.
+        
+        Returns:
+            Tuple with one entry per attempt: the delay to wait after a failed
+            attempt, or None for the final attempt
+        """
+        delays = tuple(
+            min(self._max_delay, self._retry_delay * (2 ** i))
+            for i in range(max(0, self._max_retries - 1))
+        )
+        return delays + (None,) if self._max_retries > 0 else ()
+    
+    def __enter__(self) -> "WallpaperOrchestrator":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections held by shared clients."""
+        self.http_session.close()
+    
+    @property
+    def run_dir(self) -> Optional[Path]:
+        """Checkpoint directory for the current run (None if checkpointing is disabled)."""
+        if not self.run_id:
+            return None
+        return self.checkpoint_dir / f"run_{self.run_id}"
+    
+    def _load_checkpoint(self, step: str) -> Optional[Any]:
+        """
+        Load a step's checkpointed output.
+        
+        Args:
+            step: Checkpoint name (e.g. "1_themes")
+            
+        Returns:
+            Decoded JSON data, or None if missing, expired, or unreadable
+        """
+        if self.run_dir is None:
+            return None
+        
+        path = self.run_dir / f"{step}.json"
+        try:
+            if time.time() - path.stat().st_mtime > CHECKPOINT_TTL_SECONDS:
+                return None
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+    
+    def _save_checkpoint(self, step: str, data: Any) -> None:
+        """
+        Persist a step's output for later resumption.
+        
+        Args:
+            step: Checkpoint name (e.g. "1_themes")
+            data: JSON-serializable data
+        """
+        if self.run_dir is None:
+            return
+        
+        path = self.run_dir / f"{step}.json"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data, default=str))
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning("Could not write checkpoint %s: %s", step, e)
+    
+    def _discard_downstream_checkpoints(self, step: str) -> None:
+        """
+        Delete checkpoints of the steps that follow ``step``.
+        
+        Called whenever ``step`` is re-run, since its new output may differ
+        from the one the later checkpoints were built from.
+        
+        Args:
+            step: Checkpoint name of the re-run step
+        """
+        if self.run_dir is None:
+            return
+        
+        for later in CHECKPOINT_STEPS[CHECKPOINT_STEPS.index(step) + 1:]:
+            try:
+                (self.run_dir / f"{later}.json").unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.warning("Could not discard checkpoint %s: %s", later, e)
+    
+    def _load_or_run(
+        self,
+        step: str,
+        operation: Callable[[], Any],
+        to_json: Callable[[Any], Any] = lambda x: x,
+        from_json: Callable[[Any], Any] = lambda x: x,
+    ) -> Any:
+        """
+        Return a step's checkpointed output, or run the step and checkpoint it.
+        
+        Re-running a step discards the checkpoints of the steps after it.
+        
+        Args:
+            step: Checkpoint name
+            operation: Function producing the step's output
+            to_json: Converts output to JSON data (return None to skip saving)
+            from_json: Rebuilds output from JSON data (return None to ignore checkpoint)
+            
+        Returns:
+            Step output
+        """
+        cached = self._load_checkpoint(step)
+        if cached is not None:
+            result = from_json(cached)
+            if result is not None:
+                self.logger.info("Resuming run %s: reusing checkpoint %s", self.run_id, step)
+                return result
+        
+        result = operation()
+        self._discard_downstream_checkpoints(step)
+        
+        data = to_json(result)
+        if data is not None:
+            self._save_checkpoint(step, data)
+        
+        return result
+    
     def _retry_with_backoff(
         self,
         operation: Callable[[], Any],
@@ -70,29 +321,30 @@ class WallpaperOrchestrator:
         
         last_exception = None
         
-        for attempt in range(1, self.max_retries + 1):
+        for attempt, delay in enumerate(self._delays, 1):
             try:
                 result = operation()
                 
                 if is_success(result):
                     if attempt > 1:
-                        self.logger.info(f"{operation_name} succeeded on attempt {attempt}")
+                        self.logger.info("%s succeeded on attempt %d", operation_name, attempt)
                     return result
                 else:
                     self.logger.warning(
-                        f"{operation_name} returned unsuccessful result on attempt {attempt}/{self.max_retries}"
+                        "%s returned unsuccessful result on attempt %d/%d",
+                        operation_name, attempt, self.max_retries,
                     )
                     
             except Exception as e:
                 last_exception = e
                 self.logger.warning(
-                    f"{operation_name} failed on attempt {attempt}/{self.max_retries}: {str(e)}"
+                    "%s failed on attempt %d/%d: %s",
+                    operation_name, attempt, self.max_retries, e,
                 )
             
-            # Wait before retry (exponential backoff)
-            if attempt < self.max_retries:
-                delay = self.retry_delay * (2 ** (attempt - 1))
-                self.logger.debug(f"Waiting {delay:.2f}s before retry...")
+            # Wait before retry (exponential backoff, None after final attempt)
+            if delay is not None:
+                self.logger.debug("Waiting %.2fs before retry...", delay)
                 time.sleep(delay)
         
         # All retries exhausted
@@ -101,6 +353,26 @@ class WallpaperOrchestrator:
         else:
             raise RuntimeError(f"{operation_name} failed after {self.max_retries} attempts")
     
+    @retryable("Theme discovery", is_success=_has_themes)
+    def _discover_themes(self) -> List[Dict[str, Any]]:
+        """Discover themes (retried with backoff)."""
+        return self.theme_discovery_agent.discover_themes()
+    
+    @retryable("Theme selection", is_success=_is_not_none)
+    def _select_theme(self, themes: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Select the best theme (retried with backoff)."""
+        return self.theme_selection_agent.select_theme(themes)
+    
+    @retryable("Wallpaper generation", is_success=_is_successful_result)
+    def _generate_wallpaper(self, request: WallpaperRequest) -> WallpaperResult:
+        """Generate a wallpaper (retried with backoff)."""
+        return self.wallpaper_generation_agent.generate_wallpaper(request)
+    
+    @retryable("Wallpaper application", is_success=_is_successful_result)
+    def _apply_wallpaper(self, request: ApplicationRequest) -> ApplicationResult:
+        """Apply a wallpaper (retried with backoff)."""
+        return self.wallpaper_application_agent.apply_wallpaper(request)
+    
     def run(self) -> OrchestrationResult:
         """
         Execute the full wallpaper generation workflow.
@@ -113,23 +385,18 @@ class WallpaperOrchestrator:
         try:
             # Step 1: Discover themes (with retry)
             self.logger.info("Step 1: Discovering themes...")
-            themes = self._retry_with_backoff(
-                operation=lambda: self.theme_discovery_agent.discover_themes(),
-                operation_name="Theme discovery",
-                is_success=lambda x: bool(x) and len(x) > 0,
-            )
+            themes = self._load_or_run("1_themes", self._discover_themes)
             
-            self.logger.info(f"Discovered {len(themes)} themes")
+            self.logger.info("Discovered %d themes", len(themes))
             
             # Step 2: Select best theme (with retry)
             self.logger.info("Step 2: Selecting best theme...")
-            selected_theme = self._retry_with_backoff(
-                operation=lambda: self.theme_selection_agent.select_theme(themes),
-                operation_name="Theme selection",
-                is_success=lambda x: x is not None,
+            selected_theme = self._load_or_run(
+                "2_selected_theme",
+                lambda: self._select_theme(themes),
             )
             
-            self.logger.info(f"Selected theme: {selected_theme.get('name', 'Unknown')}")
+            self.logger.info("Selected theme: %s", selected_theme.get('name', 'Unknown'))
             
             # Step 3: Generate wallpaper (with retry)
             self.logger.info("Step 3: Generating wallpaper...")
@@ -138,10 +405,11 @@ class WallpaperOrchestrator:
                 style_guidelines=selected_theme.get("style_guidelines", {}),
             )
             
-            wallpaper_result = self._retry_with_backoff(
-                operation=lambda: self.wallpaper_generation_agent.generate_wallpaper(wallpaper_request),
-                operation_name="Wallpaper generation",
-                is_success=lambda x: x.success if hasattr(x, 'success') else bool(x),
+            wallpaper_result = self._load_or_run(
+                "3_wallpaper",
+                lambda: self._generate_wallpaper(wallpaper_request),
+                to_json=_wallpaper_checkpoint,
+                from_json=_wallpaper_from_checkpoint,
             )
             
             if not wallpaper_result.success:
@@ -153,7 +421,7 @@ class WallpaperOrchestrator:
                     error=error_msg,
                 )
             
-            self.logger.info(f"Wallpaper generated: {wallpaper_result.file_path}")
+            self.logger.info("Wallpaper generated: %s", wallpaper_result.file_path)
             
             # Step 4: Apply wallpaper (with retry)
             self.logger.info("Step 4: Applying wallpaper...")
@@ -162,11 +430,7 @@ class WallpaperOrchestrator:
             )
             
             try:
-                application_result = self._retry_with_backoff(
-                    operation=lambda: self.wallpaper_application_agent.apply_wallpaper(application_request),
-                    operation_name="Wallpaper application",
-                    is_success=lambda x: x.success if hasattr(x, 'success') else bool(x),
-                )
+                application_result = self._apply_wallpaper(application_request)
             except Exception as e:
                 # Application failure is not critical - wallpaper was generated
                 error_msg = f"Wallpaper application failed: {str(e)}"
@@ -1,22 +1,36 @@
 """
 Utility functions package for Wallpaper Agent.
 """
-from api_clients import (
-    DuckDuckGoClient,
-    PollinationsClient,
-    LLMClient,
-)
-from utils.image_processor import (
-    resize_image,
-    ensure_dark_theme,
-    save_wallpaper,
-    process_wallpaper,
-)
+import importlib
+
 from utils.logger import (
     setup_logging,
     get_logger,
 )
 
+# Re-exports imported on first access, so modules that only need the logger
+# (e.g. the evaluators) do not pull in NumPy, PIL and the HTTP clients
+_LAZY_EXPORTS = {
+    "DuckDuckGoClient": "api_clients",
+    "PollinationsClient": "api_clients",
+    "LLMClient": "api_clients",
+    "resize_image": "utils.image_processor",
+    "ensure_dark_theme": "utils.image_processor",
+    "mean_luminance": "utils.image_processor",
+    "save_wallpaper": "utils.image_processor",
+    "process_wallpaper": "utils.image_processor",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     # API Clients
     "DuckDuckGoClient",
@@ -25,6 +39,7 @@ __all__ = [
     # Image Processing
     "resize_image",
     "ensure_dark_theme",
+    "mean_luminance",
     "save_wallpaper",
     "process_wallpaper",
     # Logging
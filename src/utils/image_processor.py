@@ -5,27 +5,40 @@ Handles image resizing, dark theme enforcement, and wallpaper saving.
 """
 from pathlib import Path
 from typing import Optional
-from PIL import Image, ImageEnhance, ImageFilter
+import numpy as np
+from PIL import Image, ImageFilter
+
+
+# ITU-R 601-2 luma weights, as used by PIL's "L" conversion
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
 
 
 def resize_image(
     image: Image.Image,
     width: int,
     height: int,
-    maintain_aspect: bool = False
+    maintain_aspect: bool = False,
+    resample: Image.Resampling = Image.Resampling.LANCZOS
 ) -> Image.Image:
     """
     Resize an image to specified dimensions.
 
+    Uniformly colored images skip resampling entirely, since any filter
+    produces the same solid fill at the target size.
+
     Args:
         image: PIL Image to resize
         width: Target width in pixels
         height: Target height in pixels
         maintain_aspect: If True, maintain aspect ratio and crop if needed
+        resample: PIL resampling filter (e.g. BILINEAR for cheaper resizes)
 
     Returns:
         Resized PIL Image
     """
+    if _is_uniform(image):
+        return Image.new(image.mode, (width, height), image.getpixel((0, 0)))
+
     if maintain_aspect:
         # Calculate aspect ratios
         original_aspect = image.width / image.height
@@ -34,23 +47,35 @@ def resize_image(
         if original_aspect > target_aspect:
             # Image is wider - fit to height
             new_width = int(height * original_aspect)
-            resized = image.resize((new_width, height), Image.Resampling.LANCZOS)
+            resized = image.resize((new_width, height), resample)
             # Crop to target width
             left = (new_width - width) // 2
             resized = resized.crop((left, 0, left + width, height))
         else:
             # Image is taller - fit to width
             new_height = int(width / original_aspect)
-            resized = image.resize((width, new_height), Image.Resampling.LANCZOS)
+            resized = image.resize((width, new_height), resample)
             # Crop to target height
             top = (new_height - height) // 2
             resized = resized.crop((0, top, width, top + height))
     else:
-        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        resized = image.resize((width, height), resample)
 
     return resized
 
 
+def _is_uniform(image: Image.Image) -> bool:
+    """Check whether every band of an image holds a single value."""
+    # Palette images would lose their palette through Image.new
+    if image.mode not in ("L", "LA", "RGB", "RGBA"):
+        return False
+
+    extrema = image.getextrema()
+    if image.mode == "L":
+        extrema = (extrema,)
+    return all(low == high for low, high in extrema)
+
+
 def ensure_dark_theme(image: Image.Image, threshold: float = 0.5) -> Image.Image:
     """
     Ensure image has a dark theme by adjusting brightness if needed.
@@ -63,22 +88,67 @@ def ensure_dark_theme(image: Image.Image, threshold: float = 0.5) -> Image.Image
         Processed PIL Image with dark theme
     """
     # Calculate average brightness
-    grayscale = image.convert("L")
-    pixels = list(grayscale.getdata())
-    avg_brightness = sum(pixels) / len(pixels) / 255.0
+    avg_brightness = mean_luminance(image) / 255.0
 
     # If image is too bright, darken it
     if avg_brightness > threshold:
-        # Reduce brightness
-        enhancer = ImageEnhance.Brightness(image)
-        # Reduce brightness to make it darker
         # Factor < 1.0 darkens the image
         darken_factor = threshold / avg_brightness
-        image = enhancer.enhance(darken_factor)
+        image = _scale_brightness(image, darken_factor)
 
     return image
 
 
+def mean_luminance(image: Image.Image) -> float:
+    """
+    Mean luminance (0-255) of an image, computed from its band histograms.
+
+    Shared by dark theme enforcement and the generation evaluator.
+
+    Luminance is linear in the color channels, so the weighted sum of the
+    per-band means equals the mean of the grayscale image without
+    materializing it.
+    """
+    if image.mode in ("L", "LA"):
+        weights = (1.0,)
+    elif image.mode in ("RGB", "RGBA"):
+        weights = LUMA_WEIGHTS
+    else:
+        return float(np.asarray(image.convert("L")).mean())
+
+    histogram = np.asarray(image.histogram(), dtype=np.float64).reshape(-1, 256)
+    levels = np.arange(256)
+    band_means = histogram[:len(weights)] @ levels / histogram[0].sum()
+    return float(np.dot(weights, band_means))
+
+
+def _scale_brightness(image: Image.Image, factor: float) -> Image.Image:
+    """
+    Multiply every color channel by a constant factor.
+
+    Uses a 256-entry lookup table applied by PIL in a single C pass,
+    leaving any alpha channel untouched.
+
+    Args:
+        image: PIL Image to process
+        factor: Brightness multiplier
+
+    Returns:
+        New PIL Image with scaled brightness
+    """
+    if image.mode not in ("L", "LA", "RGB", "RGBA"):
+        image = image.convert("RGB")
+
+    lut = [min(255, int(value * factor + 0.5)) for value in range(256)]
+    identity = list(range(256))
+
+    table = []
+    for band in image.getbands():
+        table.extend(identity if band == "A" else lut)
+
+    return image.point(table)
+
+
 def save_wallpaper(image: Image.Image, output_path: Path) -> Path:
     """
     Save wallpaper image to file.
@@ -99,6 +169,27 @@ def save_wallpaper(image: Image.Image, output_path: Path) -> Path:
     return output_path
 
 
+def _prepare_wallpaper(
+    image: Image.Image,
+    target_width: int,
+    target_height: int,
+    enforce_dark_theme: bool
+) -> Image.Image:
+    """
+    Resize an image and optionally apply dark theme enforcement.
+
+    Darkening is a per-pixel lookup that commutes with resampling, so it is
+    applied to whichever of the source or resized image has fewer pixels.
+    """
+    if not enforce_dark_theme:
+        return resize_image(image, target_width, target_height)
+
+    if image.width * image.height < target_width * target_height:
+        return resize_image(ensure_dark_theme(image), target_width, target_height)
+
+    return ensure_dark_theme(resize_image(image, target_width, target_height))
+
+
 def process_wallpaper(
     image: Image.Image,
     output_path: Path,
@@ -119,12 +210,7 @@ def process_wallpaper(
     Returns:
         Path to saved file
     """
-    # Resize image
-    processed = resize_image(image, target_width, target_height)
-
-    # Apply dark theme if requested
-    if enforce_dark_theme:
-        processed = ensure_dark_theme(processed)
+    processed = _prepare_wallpaper(image, target_width, target_height, enforce_dark_theme)
 
     # Save wallpaper
     return save_wallpaper(processed, output_path)
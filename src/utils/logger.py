@@ -6,7 +6,12 @@ Provides centralized logging configuration and logger instances.
 import logging
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, RotatingFileHandler
+
+
+# Records buffered before the file handler is written to. ERROR and above
+# flush immediately, and logging.shutdown() flushes the rest at exit.
+LOG_BUFFER_CAPACITY = 1024
 
 
 def setup_logging(
@@ -29,7 +34,12 @@ def setup_logging(
     logger = logging.getLogger("wallpaper_agent")
     logger.setLevel(log_level)
 
-    # Remove existing handlers to avoid duplicates
+    # Remove existing handlers to avoid duplicates, flushing any buffered records
+    for handler in logger.handlers:
+        target = getattr(handler, "target", None)
+        handler.close()
+        if target is not None:
+            target.close()
     logger.handlers.clear()
 
     # Create formatter
@@ -47,7 +57,16 @@ def setup_logging(
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    # Batch file writes; the memory handler passes records to the file handler
+    memory_handler = MemoryHandler(
+        LOG_BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+    )
+    memory_handler.setLevel(log_level)
+    memory_handler.setFormatter(formatter)
+    logger.addHandler(memory_handler)
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -0,0 +1,95 @@
+"""
+Shared helpers for the test suite.
+"""
+import io
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from config.preferences import load_config
+
+# Wallpaper location for tests that never read or write the file
+WALLPAPER_PATH = Path("/tmp/wallpaper.png")
+
+
+@contextmanager
+def restored_environ(clear=()):
+    """
+    Snapshot ``os.environ`` and restore it on exit, even if the body raises.
+
+    Keys in ``clear`` are removed for the duration of the block. Use it where
+    code under test writes to the environment itself (e.g. ``load_dotenv``)
+    and ``monkeypatch`` is unavailable, such as in module-scoped fixtures.
+    """
+    saved_env = os.environ.copy()
+    for key in clear:
+        os.environ.pop(key, None)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+@lru_cache(maxsize=32)
+def _cached_load(path_str, mtime_ns):
+    return load_config(env_file_path=Path(path_str))
+
+
+def cached_load_config(env_file):
+    """
+    Load config from an .env file, parsing each (path, mtime) only once.
+
+    Production ``load_config`` is untouched; editing the file invalidates the
+    cache. A cache hit returns the same Config instance and does not re-export
+    the file's values into ``os.environ``.
+    """
+    env_file = Path(env_file)
+    return _cached_load(str(env_file), env_file.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def solid_png_bytes(width, height, color="black", mode="RGB"):
+    """Encode a solid-color PNG once per (size, color, mode) and reuse the bytes."""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def write_solid_png(path, width, height, color="black", mode="RGB"):
+    """Write a cached solid-color PNG to ``path`` and return the path."""
+    path = Path(path)
+    path.write_bytes(solid_png_bytes(width, height, color, mode))
+    return path
+
+
+class FakeLLM:
+    """
+    Minimal stand-in for ``LLMClient`` returning a fixed response.
+
+    Cheaper than a ``MagicMock`` for tests that only need ``generate_text``;
+    ``call_count`` and ``call_args`` record how it was used, and ``exc`` (if
+    given) is raised instead of returning ``response``.
+    """
+
+    __slots__ = ("response", "exc", "call_count", "call_args")
+
+    def __init__(self, response="", exc=None):
+        self.response = response
+        self.exc = exc
+        self.call_count = 0
+        self.call_args = None
+
+    @property
+    def called(self):
+        return self.call_count > 0
+
+    def generate_text(self, *args, **kwargs):
+        self.call_count += 1
+        self.call_args = (args, kwargs)
+        if self.exc is not None:
+            raise self.exc
+        return self.response
@@ -12,6 +12,30 @@ sys.path.insert(0, str(project_root / "src"))
 import pytest
 from unittest.mock import Mock, MagicMock
 
+# Import the heavier packages once per (xdist worker) process, so their import
+# cost is not charged to whichever test happens to run first
+import api_clients  # noqa: F401
+import config.preferences  # noqa: F401
+import evaluations.discovery_evaluator  # noqa: F401
+import evaluations.evaluator  # noqa: F401
+from agents.wallpaper_generation.agent import WallpaperGenerationAgent
+
+
+def pytest_addoption(parser):
+    """Register command line options for the test suite."""
+    parser.addoption(
+        "--integration-fast",
+        action="store_true",
+        default=False,
+        help="Downscale generated wallpaper fixtures to a quarter of their size",
+    )
+
+
+@pytest.fixture(scope="session")
+def img_scale(request):
+    """Scale factor for generated wallpaper fixture dimensions."""
+    return 0.25 if request.config.getoption("--integration-fast") else 1.0
+
 
 @pytest.fixture
 def sample_theme_data():
@@ -59,6 +83,63 @@ def temp_log_dir(tmp_path):
     return log_dir
 
 
+def _solid_png(path, size, color):
+    """Write a solid-color RGB PNG, filling the pixel buffer with NumPy."""
+    import numpy as np
+    from PIL import Image
+
+    width, height = size
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[:] = color
+    # compress_level=1: for solid colors this encodes as fast as level 0
+    # but keeps files ~80KB instead of ~18MB at 3024x1964
+    Image.fromarray(pixels).save(path, format="PNG", compress_level=1)
+
+
+@pytest.fixture(scope="session")
+def wallpaper_fixtures(tmp_path_factory, img_scale):
+    """
+    Canonical wallpaper images written once per session.
+
+    Tests copy these into their own tmp_path instead of generating images.
+    Dimensions are multiplied by ``img_scale`` (see ``--integration-fast``).
+    """
+    specs = {
+        "dark_large": ((3024, 1964), (20, 20, 20)),
+        "bright_small": ((500, 400), (250, 250, 250)),
+        "dark_mid": ((2000, 1500), (30, 30, 30)),
+    }
+    fixture_dir = tmp_path_factory.mktemp("wallpaper_fixtures")
+
+    paths = {}
+    for name, ((width, height), color) in specs.items():
+        path = fixture_dir / f"wallpaper_{name}.png"
+        size = (int(width * img_scale), int(height * img_scale))
+        _solid_png(path, size, color)
+        paths[name] = path
+    return paths
+
+
+@pytest.fixture(scope="session")
+def generation_agent():
+    """WallpaperGenerationAgent built once per session (config load and client setup)."""
+    return WallpaperGenerationAgent()
+
+
+@pytest.fixture(scope="session")
+def tiny_png():
+    """Valid 64x64 dark PNG committed under tests/fixtures, for read-only image tests."""
+    return project_root / "tests" / "fixtures" / "tiny.png"
+
+
+@pytest.fixture(scope="session")
+def dummy_png(tmp_path_factory):
+    """Minimal PNG-headed file shared by tests that only need an existing image path."""
+    path = tmp_path_factory.mktemp("img") / "dummy.png"
+    path.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 100)
+    return path
+
+
 @pytest.fixture
 def mock_osascript(monkeypatch):
     """Mock osascript command for testing wallpaper application."""
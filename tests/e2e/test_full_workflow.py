@@ -52,8 +52,8 @@ class TestFullWorkflow:
         )
         
         # Run orchestrator
-        orchestrator = WallpaperOrchestrator(max_retries=1, retry_delay=0.01)
-        result = orchestrator.run()
+        with WallpaperOrchestrator(max_retries=1, retry_delay=0.01) as orchestrator:
+            result = orchestrator.run()
         
         # Verify complete success
         assert result.status.value == "success"
@@ -105,8 +105,8 @@ class TestFullWorkflow:
         )
         
         # Run orchestrator with retries
-        orchestrator = WallpaperOrchestrator(max_retries=2, retry_delay=0.01)
-        result = orchestrator.run()
+        with WallpaperOrchestrator(max_retries=2, retry_delay=0.01) as orchestrator:
+            result = orchestrator.run()
         
         # Should succeed after retry
         assert result.status.value == "success"
@@ -149,8 +149,8 @@ class TestFullWorkflow:
             error="Permission denied",
         )
         
-        orchestrator = WallpaperOrchestrator(max_retries=1, retry_delay=0.01)
-        result = orchestrator.run()
+        with WallpaperOrchestrator(max_retries=1, retry_delay=0.01) as orchestrator:
+            result = orchestrator.run()
         
         # Should be partial success
         assert result.status.value == "partial"
@@ -165,8 +165,8 @@ class TestFullWorkflow:
         # Discovery always fails
         mock_disc_agent.return_value.discover_themes.return_value = []
         
-        orchestrator = WallpaperOrchestrator(max_retries=2, retry_delay=0.01)
-        result = orchestrator.run()
+        with WallpaperOrchestrator(max_retries=2, retry_delay=0.01) as orchestrator:
+            result = orchestrator.run()
         
         # Should fail completely
         assert result.status.value == "failed"
@@ -189,8 +189,8 @@ class TestFullWorkflow:
         # Discovery throws exception
         mock_disc_agent.return_value.discover_themes.side_effect = Exception("Network error")
         
-        orchestrator = WallpaperOrchestrator(max_retries=2, retry_delay=0.01)
-        result = orchestrator.run()
+        with WallpaperOrchestrator(max_retries=2, retry_delay=0.01) as orchestrator:
+            result = orchestrator.run()
         
         # Should handle exception and return failed status
         assert result.status.value == "failed"
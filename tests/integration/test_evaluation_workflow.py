@@ -1,10 +1,11 @@
 """
 Integration tests for end-to-end evaluation workflows.
 """
+import shutil
 import pytest
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from PIL import Image
 
 from evaluations import AgentEvaluator
 from agents.theme_discovery.agent import ThemeDiscoveryAgent
@@ -13,25 +14,90 @@ from agents.wallpaper_generation.agent import WallpaperGenerationAgent
 from agents.wallpaper_application.agent import WallpaperApplicationAgent
 
 
-@pytest.mark.integration
-class TestEvaluationWorkflow:
-    """Test end-to-end evaluation workflows."""
-    
-    def test_evaluate_full_workflow_success(self, tmp_path):
-        """Test evaluating a complete successful workflow."""
-        evaluator = AgentEvaluator(llm_client=None)
-        
-        # Simulate workflow outputs
-        themes = [
+class _StubLLM:
+    """Minimal LLM client returning a fixed relevance response."""
+
+    def __init__(self):
+        self.called = False
+
+    def generate_text(self, *args, **kwargs):
+        self.called = True
+        return '{"average_relevance": 90.0}'
+
+
+def _run_evaluations(evaluator, *calls):
+    """
+    Run independent evaluator calls and return their results in order.
+
+    Calls only overlap usefully when they block on LLM round-trips, so they
+    are submitted to a thread pool when the evaluator has an LLM client and
+    run inline otherwise.
+    """
+    if evaluator.llm_client is None:
+        return [call() for call in calls]
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = [executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+
+def _assert_success(discovery_result, selection_result, generation_result, application_result):
+    # End-to-end smoke check; per-agent thresholds have their own tests
+    assert discovery_result.overall_score >= 0.0
+    assert selection_result.overall_score >= 0.0
+    assert generation_result.overall_score >= 0.0
+    assert application_result.passed  # Application should pass if successful
+
+
+def _assert_low_quality(discovery_result, selection_result, generation_result, application_result):
+    # Some evaluations should fail or have warnings
+    assert not discovery_result.passed or len(discovery_result.warnings) > 0
+    assert not selection_result.passed or len(selection_result.warnings) > 0
+    assert not generation_result.passed or len(generation_result.warnings) > 0
+
+
+def _assert_missing_metadata(discovery_result, selection_result, generation_result, application_result):
+    # Should still work but with lower scores
+    assert discovery_result.overall_score >= 0.0
+    assert selection_result.overall_score >= 0.0
+    assert generation_result.overall_score >= 0.0
+
+
+RESULT_ATTRS = ("agent_name", "overall_score", "metrics", "passed", "warnings", "timestamp")
+METRIC_ATTRS = ("score", "threshold", "passed")
+
+
+def _assert_has_attrs(obj, attrs):
+    missing = [attr for attr in attrs if not hasattr(obj, attr)]
+    assert not missing, f"{type(obj).__name__} missing attributes: {missing}"
+
+
+def _assert_result_shape(result):
+    _assert_has_attrs(result, RESULT_ATTRS)
+    for metric in result.metrics.values():
+        _assert_has_attrs(metric, METRIC_ATTRS)
+        score = metric.score
+        assert 0.0 <= score <= 100.0, f"Metric score out of range: {score}"
+
+
+def _assert_metrics_consistency(discovery_result, selection_result, generation_result, application_result):
+    # Verify metric structure is consistent
+    for result in [discovery_result, selection_result, generation_result]:
+        _assert_result_shape(result)
+
+
+# Workflow scenarios: simulated agent outputs, wallpaper fixture, and checks
+WORKFLOW_CASES = {
+    "success": {
+        "themes": [
             {
                 "name": "Diwali",
                 "description": "Festival of lights",
                 "type": "indian_cultural",
                 "metadata": {"relevance": 95},
             },
-        ]
-        
-        selected_theme = {
+        ],
+        "selected_theme": {
             "name": "Diwali",
             "type": "indian_cultural",
             "style_guidelines": {
@@ -40,110 +106,141 @@ class TestEvaluationWorkflow:
                 "key_elements": ["lights"],
                 "style_description": "Dark theme with golden lights",
             },
-        }
-        
-        # Create a valid wallpaper image
-        wallpaper_path = tmp_path / "wallpaper.png"
-        img = Image.new('RGB', (3024, 1964), color=(20, 20, 20))  # Dark image
-        img.save(wallpaper_path)
-        
-        # Evaluate each agent
-        discovery_result = evaluator.evaluate_discovery_agent(themes)
-        selection_result = evaluator.evaluate_selection_agent(selected_theme, themes)
-        generation_result = evaluator.evaluate_generation_agent(wallpaper_path, selected_theme)
-        application_result = evaluator.evaluate_application_agent(
-            success=True,
-            desktop_index=1,
-            desktop_count=2,
-        )
-        
-        # Verify evaluations completed (may not all pass due to strict thresholds)
-        assert discovery_result.overall_score >= 0.0
-        assert selection_result.overall_score >= 0.0
-        assert generation_result.overall_score >= 0.0
-        assert application_result.passed  # Application should pass if successful
-        
-        # Verify scores are reasonable (may be lower due to strict thresholds)
-        assert discovery_result.overall_score >= 60.0  # Coverage may be low with single theme
-        assert selection_result.overall_score >= 70.0
-        assert generation_result.overall_score >= 60.0
-        assert application_result.overall_score >= 90.0
-    
-    def test_evaluate_workflow_with_low_quality_outputs(self, tmp_path):
-        """Test evaluating workflow with low-quality outputs."""
-        evaluator = AgentEvaluator(llm_client=None)
-        
-        # Low-quality themes
-        themes = [
+        },
+        "wallpaper": "dark_large",
+        "check": _assert_success,
+    },
+    "low_quality": {
+        "themes": [
             {
                 "name": "Event 2024",  # Has date in name
                 "description": "Short",  # Too short
                 "type": "global",
             },
-        ]
-        
-        selected_theme = {
+        ],
+        "selected_theme": {
             "name": "Event",
             "type": "global",  # Should prefer Indian but selected global
             "style_guidelines": {},  # Missing style guidelines
-        }
-        
-        # Low-quality wallpaper (small, bright)
-        wallpaper_path = tmp_path / "wallpaper.png"
-        img = Image.new('RGB', (500, 400), color=(250, 250, 250))  # Bright, small
-        img.save(wallpaper_path)
-        
-        # Evaluate
-        discovery_result = evaluator.evaluate_discovery_agent(themes)
-        selection_result = evaluator.evaluate_selection_agent(selected_theme, themes)
-        generation_result = evaluator.evaluate_generation_agent(wallpaper_path, selected_theme)
-        
-        # Some evaluations should fail or have warnings
-        assert not discovery_result.passed or len(discovery_result.warnings) > 0
-        assert not selection_result.passed or len(selection_result.warnings) > 0
-        assert not generation_result.passed or len(generation_result.warnings) > 0
-    
-    def test_evaluate_workflow_with_missing_metadata(self, tmp_path):
-        """Test evaluating workflow with missing metadata."""
-        evaluator = AgentEvaluator(llm_client=None)
-        
-        # Themes without metadata
-        themes = [
+        },
+        "wallpaper": "bright_small",
+        "check": _assert_low_quality,
+    },
+    "missing_meta": {
+        "themes": [
             {
                 "name": "Diwali",
                 "description": "Festival of lights",
                 "type": "indian_cultural",
                 # No metadata
             },
-        ]
-        
-        selected_theme = {
+        ],
+        "selected_theme": {
             "name": "Diwali",
             "type": "indian_cultural",
             "style_guidelines": {
                 "prompt": "diwali theme",
                 # Missing other fields
             },
-        }
+        },
+        "wallpaper": "dark_mid",
+        "check": _assert_missing_metadata,
+    },
+    "consistency": {
+        "themes": [
+            {
+                "name": "Diwali",
+                "description": "Festival of lights celebrated in India",
+                "type": "indian_cultural",
+                "metadata": {"relevance": 95, "significance": "high"},
+            },
+        ],
+        "selected_theme": {
+            "name": "Diwali",
+            "type": "indian_cultural",
+            "style_guidelines": {
+                "prompt": "minimalistic dark diwali",
+                "color_palette": ["#FFD700"],
+                "key_elements": ["lights"],
+                "style_description": "Dark theme",
+            },
+        },
+        "wallpaper": "dark_large",
+        "check": _assert_metrics_consistency,
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    """Evaluator shared by all tests in the module."""
+    return AgentEvaluator(llm_client=None)
+
+
+@pytest.mark.integration
+class TestEvaluationWorkflow:
+    """Test end-to-end evaluation workflows."""
+    
+    @pytest.mark.parametrize("case", list(WORKFLOW_CASES))
+    def test_evaluate_workflow(self, case, evaluator, wallpaper_fixtures, tmp_path):
+        """Test evaluating complete workflows across quality scenarios."""
+        spec = WORKFLOW_CASES[case]
+        themes = spec["themes"]
+        selected_theme = spec["selected_theme"]
         
         wallpaper_path = tmp_path / "wallpaper.png"
-        img = Image.new('RGB', (2000, 1500), color=(30, 30, 30))
-        img.save(wallpaper_path)
+        shutil.copy(wallpaper_fixtures[spec["wallpaper"]], wallpaper_path)
         
-        # Evaluate
-        discovery_result = evaluator.evaluate_discovery_agent(themes)
-        selection_result = evaluator.evaluate_selection_agent(selected_theme, themes)
-        generation_result = evaluator.evaluate_generation_agent(wallpaper_path, selected_theme)
+        # Evaluate each agent
+        results = _run_evaluations(
+            evaluator,
+            partial(evaluator.evaluate_discovery_agent, themes),
+            partial(evaluator.evaluate_selection_agent, selected_theme, themes),
+            partial(evaluator.evaluate_generation_agent, wallpaper_path, selected_theme),
+            partial(
+                evaluator.evaluate_application_agent,
+                success=True,
+                desktop_index=1,
+                desktop_count=2,
+            ),
+        )
         
-        # Should still work but with lower scores
-        assert discovery_result.overall_score >= 0.0
-        assert selection_result.overall_score >= 0.0
-        assert generation_result.overall_score >= 0.0
+        spec["check"](*results)
+    
+    def test_discovery_score(self, evaluator):
+        """Test discovery score for a successful workflow."""
+        spec = WORKFLOW_CASES["success"]
+        result = evaluator.evaluate_discovery_agent(spec["themes"])
+        assert result.overall_score >= 60.0  # Coverage may be low with single theme
+    
+    def test_selection_score(self, evaluator):
+        """Test selection score for a successful workflow."""
+        spec = WORKFLOW_CASES["success"]
+        result = evaluator.evaluate_selection_agent(spec["selected_theme"], spec["themes"])
+        assert result.overall_score >= 70.0
+    
+    def test_generation_score(self, evaluator, wallpaper_fixtures):
+        """Test generation score for a successful workflow."""
+        spec = WORKFLOW_CASES["success"]
+        result = evaluator.evaluate_generation_agent(
+            wallpaper_fixtures[spec["wallpaper"]],
+            spec["selected_theme"],
+        )
+        assert result.overall_score >= 60.0
+    
+    def test_application_score(self, evaluator):
+        """Test application score for a successful workflow."""
+        result = evaluator.evaluate_application_agent(
+            success=True,
+            desktop_index=1,
+            desktop_count=2,
+        )
+        assert result.passed
+        assert result.overall_score >= 90.0
     
     def test_evaluate_workflow_with_llm_client(self, tmp_path):
         """Test evaluating workflow with LLM client for enhanced evaluations."""
-        mock_llm = MagicMock()
-        mock_llm.generate_text.return_value = '{"average_relevance": 90.0}'
+        mock_llm = _StubLLM()
         
         evaluator = AgentEvaluator(llm_client=mock_llm)
         
@@ -156,16 +253,21 @@ class TestEvaluationWorkflow:
         ]
         
         week_context = {"month_name": "October", "year": 2024}
-        discovery_result = evaluator.evaluate_discovery_agent(themes, week_context)
+        # With an LLM client the evaluations run on the thread pool
+        discovery_result, selection_result = _run_evaluations(
+            evaluator,
+            partial(evaluator.evaluate_discovery_agent, themes, week_context),
+            partial(evaluator.evaluate_selection_agent, themes[0], themes),
+        )
         
+        assert selection_result.overall_score >= 0.0
         # Should use LLM for relevance evaluation
-        assert discovery_result.metrics["relevance"].details["method"] == "llm_based"
-        assert mock_llm.generate_text.called
+        relevance = discovery_result.metrics["relevance"]
+        assert relevance.details["method"] == "llm_based"
+        assert mock_llm.called
     
-    def test_evaluate_workflow_error_scenarios(self, tmp_path):
+    def test_evaluate_workflow_error_scenarios(self, evaluator, tmp_path):
         """Test evaluating workflow with error scenarios."""
-        evaluator = AgentEvaluator(llm_client=None)
-        
         # Empty themes
         discovery_result = evaluator.evaluate_discovery_agent([])
         assert discovery_result.overall_score == 0.0 or not discovery_result.passed
@@ -185,59 +287,8 @@ class TestEvaluationWorkflow:
         assert not application_result.passed
         assert application_result.metrics["application_success"].score == 0.0
     
-    def test_evaluate_workflow_metrics_consistency(self, tmp_path):
-        """Test that evaluation metrics are consistent across workflow."""
-        evaluator = AgentEvaluator(llm_client=None)
-        
-        themes = [
-            {
-                "name": "Diwali",
-                "description": "Festival of lights celebrated in India",
-                "type": "indian_cultural",
-                "metadata": {"relevance": 95, "significance": "high"},
-            },
-        ]
-        
-        selected_theme = {
-            "name": "Diwali",
-            "type": "indian_cultural",
-            "style_guidelines": {
-                "prompt": "minimalistic dark diwali",
-                "color_palette": ["#FFD700"],
-                "key_elements": ["lights"],
-                "style_description": "Dark theme",
-            },
-        }
-        
-        wallpaper_path = tmp_path / "wallpaper.png"
-        img = Image.new('RGB', (3024, 1964), color=(25, 25, 25))
-        img.save(wallpaper_path)
-        
-        # Evaluate all agents
-        discovery_result = evaluator.evaluate_discovery_agent(themes)
-        selection_result = evaluator.evaluate_selection_agent(selected_theme, themes)
-        generation_result = evaluator.evaluate_generation_agent(wallpaper_path, selected_theme)
-        
-        # Verify metric structure is consistent
-        for result in [discovery_result, selection_result, generation_result]:
-            assert hasattr(result, "agent_name")
-            assert hasattr(result, "overall_score")
-            assert hasattr(result, "metrics")
-            assert hasattr(result, "passed")
-            assert hasattr(result, "warnings")
-            assert hasattr(result, "timestamp")
-            
-            # Verify metrics structure
-            for metric_name, metric in result.metrics.items():
-                assert hasattr(metric, "score")
-                assert hasattr(metric, "threshold")
-                assert hasattr(metric, "passed")
-                assert 0.0 <= metric.score <= 100.0
-    
-    def test_evaluate_workflow_warnings_generation(self, tmp_path):
+    def test_evaluate_workflow_warnings_generation(self, evaluator, wallpaper_fixtures, tmp_path):
         """Test that warnings are generated appropriately."""
-        evaluator = AgentEvaluator(llm_client=None)
-        
         # Low relevance themes
         themes = [
             {
@@ -255,12 +306,10 @@ class TestEvaluationWorkflow:
         
         # Bright wallpaper (low dark theme compliance)
         wallpaper_path = tmp_path / "wallpaper.png"
-        img = Image.new('RGB', (2000, 1500), color=(200, 200, 200))  # Bright
-        img.save(wallpaper_path)
+        shutil.copy(wallpaper_fixtures["bright_small"], wallpaper_path)  # Bright
         
         theme = {"name": "Test"}
         generation_result = evaluator.evaluate_generation_agent(wallpaper_path, theme)
         
         # Should have warnings for low dark theme compliance
         assert len(generation_result.warnings) > 0 or generation_result.metrics["dark_theme_compliance"].score < 80.0
-
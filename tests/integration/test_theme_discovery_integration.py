@@ -3,26 +3,41 @@ Integration tests for Theme Discovery Agent.
 
 These tests call the actual DuckDuckGo API to verify real-world functionality.
 Marked with @pytest.mark.integration and @pytest.mark.api for selective running.
+The structure contract is checked against canned search results so it runs
+without network access.
 """
+import json
+import time
 import pytest
+from unittest.mock import patch
 from agents.theme_discovery.agent import ThemeDiscoveryAgent
 
 
+@pytest.fixture(scope="module")
+def agent():
+    """One agent (and search client) shared by all real-API tests."""
+    return ThemeDiscoveryAgent()
+
+
+@pytest.fixture(scope="module")
+def discovered_themes(agent):
+    """Run the real discovery fan-out once and share it across the module."""
+    return agent.discover_themes()
+
+
 @pytest.mark.integration
 @pytest.mark.api
 class TestThemeDiscoveryAgentIntegration:
     """Integration tests for Theme Discovery Agent with real API calls."""
 
-    def test_agent_initialization_real(self):
+    def test_agent_initialization_real(self, agent):
         """Test agent initialization with real dependencies."""
-        agent = ThemeDiscoveryAgent()
         assert agent is not None
         assert agent.search_client is not None
 
     @pytest.mark.slow
-    def test_get_week_context_real(self):
+    def test_get_week_context_real(self, agent):
         """Test getting real week context."""
-        agent = ThemeDiscoveryAgent()
         week_context = agent.get_week_context()
         
         assert "year" in week_context
@@ -34,9 +49,8 @@ class TestThemeDiscoveryAgentIntegration:
         assert 1 <= week_context["month"] <= 12
 
     @pytest.mark.slow
-    def test_search_indian_cultural_events_real(self):
+    def test_search_indian_cultural_events_real(self, agent):
         """Test searching for Indian cultural events with real API."""
-        agent = ThemeDiscoveryAgent()
         results = agent.search_indian_cultural_events()
         
         # Should return a list
@@ -49,9 +63,8 @@ class TestThemeDiscoveryAgentIntegration:
             assert "body" in results[0] or "description" in results[0]
 
     @pytest.mark.slow
-    def test_search_indian_achievements_real(self):
+    def test_search_indian_achievements_real(self, agent):
         """Test searching for Indian achievements with real API."""
-        agent = ThemeDiscoveryAgent()
         results = agent.search_indian_achievements()
         
         # Should return a list
@@ -62,9 +75,8 @@ class TestThemeDiscoveryAgentIntegration:
             assert "title" in results[0] or "name" in results[0]
 
     @pytest.mark.slow
-    def test_search_global_themes_real(self):
+    def test_search_global_themes_real(self, agent):
         """Test searching for global themes with real API."""
-        agent = ThemeDiscoveryAgent()
         results = agent.search_global_themes()
         
         # Should return a list
@@ -74,15 +86,14 @@ class TestThemeDiscoveryAgentIntegration:
             assert "title" in results[0] or "name" in results[0]
 
     @pytest.mark.slow
-    def test_discover_themes_full_workflow_real(self):
+    def test_discover_themes_full_workflow_real(self, discovered_themes, request):
         """
         Test full theme discovery workflow with real API calls.
         
         This is the main integration test that verifies the complete
         discovery process works end-to-end.
         """
-        agent = ThemeDiscoveryAgent()
-        themes = agent.discover_themes()
+        themes = discovered_themes
         
         # Should return a list
         assert isinstance(themes, list)
@@ -107,71 +118,80 @@ class TestThemeDiscoveryAgentIntegration:
             names = [t.get("name", "").lower() for t in themes]
             assert len(names) == len(set(names)), "Duplicate themes found"
             
-            # Print detailed output for verification
-            print(f"\n✅ Discovered {len(themes)} unique themes")
-            print("\n" + "=" * 70)
-            print("DISCOVERED THEMES BY TYPE:")
-            print("=" * 70)
+            # Print detailed output for verification (pytest -vv)
+            if request.config.getoption("verbose") > 1:
+                print(f"\n✅ Discovered {len(themes)} unique themes")
+                print("\n" + "=" * 70)
+                print("DISCOVERED THEMES BY TYPE:")
+                print("=" * 70)
             
-            # Group by type
-            by_type = {}
-            for theme in themes:
-                theme_type = theme.get("type", "unknown")
-                if theme_type not in by_type:
-                    by_type[theme_type] = []
-                by_type[theme_type].append(theme)
+                # Group by type
+                by_type = {}
+                for theme in themes:
+                    theme_type = theme.get("type", "unknown")
+                    if theme_type not in by_type:
+                        by_type[theme_type] = []
+                    by_type[theme_type].append(theme)
             
-            # Print themes by type
-            for theme_type, theme_list in by_type.items():
-                print(f"\n📌 {theme_type.upper().replace('_', ' ')} ({len(theme_list)} themes):")
-                print("-" * 70)
-                for i, t in enumerate(theme_list[:10], 1):  # Show first 10 of each type
-                    name = t.get('name', 'Unknown')
-                    desc = t.get('description', '')[:80] if t.get('description') else ''
-                    print(f"  {i}. {name}")
-                    if desc:
-                        print(f"     {desc}...")
+                # Print themes by type
+                for theme_type, theme_list in by_type.items():
+                    print(f"\n📌 {theme_type.upper().replace('_', ' ')} ({len(theme_list)} themes):")
+                    print("-" * 70)
+                    for i, t in enumerate(theme_list[:10], 1):  # Show first 10 of each type
+                        name = t.get('name', 'Unknown')
+                        desc = t.get('description', '')[:80] if t.get('description') else ''
+                        print(f"  {i}. {name}")
+                        if desc:
+                            print(f"     {desc}...")
             
-            print("\n" + "=" * 70)
-            print("SAMPLE THEME STRUCTURE (JSON):")
-            print("=" * 70)
-            if themes:
-                import json
+                print("\n" + "=" * 70)
+                print("SAMPLE THEME STRUCTURE (JSON):")
+                print("=" * 70)
                 print(json.dumps(themes[0], indent=2))
 
     @pytest.mark.slow
-    def test_discover_themes_returns_structured_data(self):
-        """Test that discovered themes have proper structure."""
-        agent = ThemeDiscoveryAgent()
-        themes = agent.discover_themes()
+    def test_theme_discovery_performance(self, benchmark):
+        """Test that theme discovery completes in reasonable time (cold run, no shared results)."""
+        agent = ThemeDiscoveryAgent()  # Fresh agent so the extraction cache starts empty
+        benchmark.extra_info["slo"] = 30.0
+        # Timed here as well: pytest-benchmark is disabled under xdist (-n auto)
+        # and then records no stats, but the SLO must still be enforced
+        start = time.perf_counter()
+        themes = benchmark.pedantic(agent.discover_themes, rounds=1, iterations=1)
+        elapsed = time.perf_counter() - start
         
-        if themes:
-            for theme in themes:
-                # Required fields
-                assert "name" in theme, f"Theme missing 'name': {theme}"
-                assert "type" in theme, f"Theme missing 'type': {theme}"
-                assert "source" in theme, f"Theme missing 'source': {theme}"
-                
-                # Type validation
-                assert theme["type"] in [
-                    "indian_cultural",
-                    "indian_achievement",
-                    "global"
-                ], f"Invalid theme type: {theme['type']}"
-                
-                # Name should not be empty
-                assert theme["name"], f"Theme name is empty: {theme}"
+        assert isinstance(themes, list)
+        # Should complete within 30 seconds (reasonable for multiple API calls)
+        assert elapsed < 30, f"Theme discovery took too long: {elapsed:.2f}s"
 
-    @pytest.mark.slow
-    def test_theme_discovery_performance(self):
-        """Test that theme discovery completes in reasonable time."""
-        import time
-        
+@pytest.mark.integration
+class TestThemeDiscoveryStructureContract:
+    """Theme structure checks against canned search results (no network)."""
+
+    @patch('agents.theme_discovery.agent.DuckDuckGoClient')
+    def test_theme_structure_contract(self, mock_ddg):
+        """Test that discovered themes have proper structure."""
+        mock_ddg.return_value.search_themes.side_effect = lambda query, max_results=5: [
+            {"title": f"Result for {query}", "body": "Description", "href": "https://example.com"},
+        ]
         agent = ThemeDiscoveryAgent()
-        start_time = time.time()
+        agent.llm_client = None  # Keep extraction on the deterministic path
+        
         themes = agent.discover_themes()
-        elapsed = time.time() - start_time
         
-        # Should complete within 30 seconds (reasonable for multiple API calls)
-        assert elapsed < 30, f"Theme discovery took too long: {elapsed:.2f}s"
-        print(f"\n⏱️  Theme discovery completed in {elapsed:.2f} seconds")
+        assert themes
+        for theme in themes:
+            # Required fields
+            assert "name" in theme, f"Theme missing 'name': {theme}"
+            assert "type" in theme, f"Theme missing 'type': {theme}"
+            assert "source" in theme, f"Theme missing 'source': {theme}"
+            
+            # Type validation
+            assert theme["type"] in [
+                "indian_cultural",
+                "indian_achievement",
+                "global"
+            ], f"Invalid theme type: {theme['type']}"
+            
+            # Name should not be empty
+            assert theme["name"], f"Theme name is empty: {theme}"
@@ -7,7 +7,7 @@ import pytest
 from agents.theme_selection.agent import ThemeSelectionAgent
 from agents.theme_selection.domain import Theme
 from agents.theme_selection.ranker import ThemeRanker
-from agents.theme_selection.strategy import PipelineRankingStrategy
+from agents.theme_selection.strategy import PipelineRankingStrategy, ThemeRankingStrategy
 from agents.theme_selection.stages import (
     InitialScoringStage,
     NormalizationStage,
@@ -16,10 +16,43 @@ from agents.theme_selection.stages import (
 )
 
 
+@pytest.fixture(scope="module")
+def diwali_selection():
+    """Select once from a single Diwali theme and share the result."""
+    agent = ThemeSelectionAgent()
+    themes = [
+        {
+            "name": "Diwali",
+            "description": "Festival of Lights",
+            "type": "indian_cultural",
+            "source": "search",
+        }
+    ]
+    return agent, agent.select_theme(themes)
+
+
+@pytest.fixture(scope="module")
+def pipeline_strategy():
+    """Default ranking pipeline, shared since stages hold no per-run state."""
+    return PipelineRankingStrategy(stages=[
+        InitialScoringStage(prefer_indian_culture=True),
+        NormalizationStage(),
+        CombinedScoringStage(base_weight=0.4, llm_weight=0.6),
+        FinalSortStage(),
+    ])
+
+
 @pytest.mark.integration
 class TestThemeSelectionAgentIntegration:
     """Integration tests for Theme Selection Agent."""
     
+    @pytest.fixture
+    def make_ranker(self):
+        """Factory for rankers wrapping a given strategy."""
+        def _make(strategy):
+            return ThemeRanker(strategy)
+        return _make
+    
     def test_select_theme_from_discovered_themes(self):
         """Test selecting theme from discovered themes."""
         agent = ThemeSelectionAgent()
@@ -57,17 +90,9 @@ class TestThemeSelectionAgentIntegration:
         # Should prioritize Indian cultural or achievement themes
         assert selected["type"] in ["indian_cultural", "indian_achievement", "global"]
     
-    def test_theme_ranking_pipeline(self):
+    def test_theme_ranking_pipeline(self, pipeline_strategy, make_ranker):
         """Test full ranking pipeline."""
-        stages = [
-            InitialScoringStage(prefer_indian_culture=True),
-            NormalizationStage(),
-            CombinedScoringStage(base_weight=0.4, llm_weight=0.6),
-            FinalSortStage(),
-        ]
-        
-        strategy = PipelineRankingStrategy(stages=stages)
-        ranker = ThemeRanker(strategy)
+        ranker = make_ranker(pipeline_strategy)
         
         themes = [
             Theme(name="Diwali", type="indian_cultural", description="Festival"),
@@ -83,17 +108,15 @@ class TestThemeSelectionAgentIntegration:
         # Indian cultural should rank highest
         assert ranked[0].type == "indian_cultural"
     
-    def test_custom_ranking_strategy(self):
+    def test_custom_ranking_strategy(self, make_ranker):
         """Test using custom ranking strategy."""
         # Create a simple custom strategy (just sort by name)
-        from agents.theme_selection.strategy import ThemeRankingStrategy
-        
         class SimpleNameStrategy(ThemeRankingStrategy):
             def rank(self, themes):
                 return sorted(themes, key=lambda t: t.name)
         
         custom_strategy = SimpleNameStrategy()
-        ranker = ThemeRanker(custom_strategy)
+        ranker = make_ranker(custom_strategy)
         
         themes = [
             Theme(name="Zebra", type="global"),
@@ -136,20 +159,9 @@ class TestThemeSelectionAgentIntegration:
         assert len(result1) == 2
         assert len(result2) == 2
     
-    def test_theme_selection_with_scores(self):
+    def test_theme_selection_with_scores(self, diwali_selection):
         """Test that selected theme includes all scoring information."""
-        agent = ThemeSelectionAgent()
-        
-        themes = [
-            {
-                "name": "Test Theme",
-                "description": "Test description",
-                "type": "indian_cultural",
-                "source": "search",
-            }
-        ]
-        
-        selected = agent.select_theme(themes)
+        _, selected = diwali_selection
         
         # Verify all score fields are present
         assert "base_score" in selected
@@ -159,20 +171,9 @@ class TestThemeSelectionAgentIntegration:
         assert isinstance(selected["llm_score"], (int, float))
         assert isinstance(selected["final_score"], (int, float))
     
-    def test_style_guidelines_structure(self):
+    def test_style_guidelines_structure(self, diwali_selection):
         """Test that style guidelines have correct structure."""
-        agent = ThemeSelectionAgent()
-        
-        themes = [
-            {
-                "name": "Diwali",
-                "description": "Festival of Lights",
-                "type": "indian_cultural",
-                "source": "search",
-            }
-        ]
-        
-        selected = agent.select_theme(themes)
+        _, selected = diwali_selection
         guidelines = selected["style_guidelines"]
         
         assert "color_palette" in guidelines
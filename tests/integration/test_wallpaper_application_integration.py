@@ -3,31 +3,28 @@ Integration tests for Wallpaper Application Agent.
 
 Tests the full wallpaper application workflow with real system calls.
 """
+import platform
 import pytest
 from pathlib import Path
 from agents.wallpaper_application.agent import WallpaperApplicationAgent
 from agents.wallpaper_application.domain import ApplicationRequest
 
 
+pytestmark = pytest.mark.skipif(
+    platform.system() != 'Darwin',
+    reason="macOS integration test - skipping on non-macOS system",
+)
+
 @pytest.mark.integration
 class TestWallpaperApplicationAgentIntegration:
     """Integration tests for Wallpaper Application Agent."""
     
-    def test_apply_wallpaper_real_file(self, tmp_path):
+    def test_apply_wallpaper_real_file(self, dummy_png: Path):
         """Test applying a real wallpaper file."""
-        import platform
-        
-        if platform.system() != 'Darwin':
-            pytest.skip("macOS integration test - skipping on non-macOS system")
-        
-        # Create a dummy image file for testing
-        test_image = tmp_path / "test_wallpaper.png"
-        test_image.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 100)  # Minimal PNG header
-        
         agent = WallpaperApplicationAgent()
         
         request = ApplicationRequest(
-            file_path=test_image,
+            file_path=dummy_png,
         )
         
         result = agent.apply_wallpaper(request)
@@ -42,11 +39,6 @@ class TestWallpaperApplicationAgentIntegration:
     
     def test_get_desktop_count_real(self):
         """Test getting real desktop count on macOS."""
-        import platform
-        
-        if platform.system() != 'Darwin':
-            pytest.skip("macOS integration test - skipping on non-macOS system")
-        
         agent = WallpaperApplicationAgent()
         count = agent._get_desktop_count()
         
@@ -56,11 +48,6 @@ class TestWallpaperApplicationAgentIntegration:
     
     def test_select_desktop_index_logic(self):
         """Test desktop index selection logic with real desktop count."""
-        import platform
-        
-        if platform.system() != 'Darwin':
-            pytest.skip("macOS integration test - skipping on non-macOS system")
-        
         agent = WallpaperApplicationAgent()
         
         # Test with None (auto-select)
@@ -74,26 +61,13 @@ class TestWallpaperApplicationAgentIntegration:
         index = agent._select_desktop_index(1)
         assert index == 1
     
-    def test_application_request_validation(self):
+    def test_application_request_validation(self, dummy_png: Path):
         """Test request validation with real file."""
-        import platform
-        
-        if platform.system() != 'Darwin':
-            pytest.skip("macOS integration test - skipping on non-macOS system")
-        
         agent = WallpaperApplicationAgent()
         
         # Valid request with existing file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            tmp.write(b'\x89PNG\r\n\x1a\n' + b'\x00' * 100)
-            tmp_path = Path(tmp.name)
-        
-        try:
-            request = ApplicationRequest(file_path=tmp_path)
-            assert agent._validate_request(request) is True
-        finally:
-            tmp_path.unlink()
+        request = ApplicationRequest(file_path=dummy_png)
+        assert agent._validate_request(request) is True
         
         # Invalid request
         invalid_request = ApplicationRequest(file_path=None)
@@ -0,0 +1,210 @@
+"""
+Shared fixtures for unit tests.
+
+Session-scoped fixtures are built once per pytest-xdist worker; pytest.ini's
+--dist=loadfile keeps every module on a single worker, so a module's tests
+always share them.
+"""
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from api_clients import DuckDuckGoClient
+from agents.theme_discovery.agent import ThemeDiscoveryAgent
+from agents.theme_selection.agent import ThemeSelectionAgent
+from agents.wallpaper_application.domain import ApplicationRequest
+from agents.wallpaper_generation.domain import WallpaperRequest
+from src.orchestrator.main import WallpaperOrchestrator
+from src.agents.wallpaper_generation.domain import WallpaperResult
+from src.agents.wallpaper_application.domain import ApplicationResult
+from tests._helpers import WALLPAPER_PATH, FakeLLM
+
+# Successful stage results; the orchestrator only reads them, so one instance
+# is shared by every test
+SUCCESS_WALLPAPER = WallpaperResult(success=True, file_path=WALLPAPER_PATH)
+SUCCESS_APPLICATION = ApplicationResult(success=True, desktop_index=0)
+
+_CANNED_STYLE_JSON = (
+    '{"color_palette": ["#000000"], "key_elements": ["lights"], '
+    '"style_description": "dark", "prompt": "minimalistic dark theme"}'
+)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark every test under tests/unit as ``unit`` so ``-m unit`` selects them."""
+    unit_dir = Path(__file__).parent
+    for item in items:
+        if unit_dir in item.path.parents:
+            item.add_marker(pytest.mark.unit)
+
+
+@pytest.fixture
+def agents(mocker):
+    """
+    Patch the orchestrator's four agent classes and return their instances.
+
+    Tests configure only the stages they exercise, e.g.
+    ``agents.disc.discover_themes.return_value = [...]``. Wallpaper generation
+    and application succeed by default; tests simulating their failure
+    override them.
+    """
+    agents = SimpleNamespace(
+        disc=mocker.patch('src.orchestrator.main.ThemeDiscoveryAgent', autospec=True).return_value,
+        sel=mocker.patch('src.orchestrator.main.ThemeSelectionAgent', autospec=True).return_value,
+        gen=mocker.patch('src.orchestrator.main.WallpaperGenerationAgent', autospec=True).return_value,
+        app=mocker.patch('src.orchestrator.main.WallpaperApplicationAgent', autospec=True).return_value,
+    )
+    agents.gen.generate_wallpaper.return_value = SUCCESS_WALLPAPER
+    agents.app.apply_wallpaper.return_value = SUCCESS_APPLICATION
+    return agents
+
+
+@pytest.fixture
+def diwali_theme():
+    """Selected-theme dict as returned by ThemeSelectionAgent.select_theme."""
+    return {
+        "name": "Diwali",
+        "description": "Festival of lights",
+        "type": "indian_cultural",
+        "final_score": 0.95,
+        "style_guidelines": {"prompt": "minimalistic dark diwali theme"},
+    }
+
+
+@pytest.fixture
+def diwali_discovery(diwali_theme):
+    """Discovery result containing only the Diwali theme."""
+    return [diwali_theme]
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Make the orchestrator's retry backoff return immediately."""
+    monkeypatch.setattr('src.orchestrator.main.time.sleep', lambda *_: None)
+
+
+@pytest.fixture(scope="session")
+def default_orchestrator():
+    """Default-configured WallpaperOrchestrator for read-only inspection tests."""
+    with WallpaperOrchestrator() as orchestrator:
+        yield orchestrator
+
+
+@pytest.fixture(scope="session", autouse=True)
+def orchestrator_logger():
+    """Null logger handed to every WallpaperOrchestrator built in the session."""
+    logger = Mock(spec=logging.Logger)
+    with patch('src.orchestrator.main.get_logger', return_value=logger):
+        yield logger
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_imports():
+    """
+    Import PIL.Image once per session.
+
+    WallpaperGenerationAgent imports Pillow lazily, so without this the first
+    test that reaches it pays the ~15ms import and skews --durations. The
+    agent modules themselves are already imported at collection time.
+    """
+    import PIL.Image  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def base_discovery_agent():
+    """Default ThemeDiscoveryAgent, built once for the session."""
+    return ThemeDiscoveryAgent()
+
+
+@pytest.fixture
+def discovery_agent(base_discovery_agent):
+    """
+    Per-test copy of the session ThemeDiscoveryAgent.
+
+    A shallow copy isolates attribute reassignments (e.g. swapping
+    ``search_client``) without re-running ``load_config`` and client setup in
+    every test; each copy gets its own empty LLM response cache and lock.
+    """
+    agent = copy.copy(base_discovery_agent)
+    agent._response_cache = OrderedDict()
+    agent._response_cache_lock = threading.Lock()
+    return agent
+
+
+@pytest.fixture
+def patched_ddg(discovery_agent):
+    """
+    Mock search client installed on ``discovery_agent``.
+
+    Tests set ``patched_ddg.search_themes.return_value`` (or ``side_effect``).
+    """
+    client = Mock(spec=DuckDuckGoClient)
+    discovery_agent.search_client = client
+    return client
+
+
+@pytest.fixture(scope="session")
+def stub_llm():
+    """Offline LLM client for tests that do not exercise LLM behaviour."""
+    return FakeLLM(response=_CANNED_STYLE_JSON)
+
+
+@pytest.fixture(scope="session")
+def base_selection_agent(stub_llm):
+    """
+    ThemeSelectionAgent built once for the session around ``stub_llm``.
+
+    The stub keeps ranking and style generation offline and deterministic;
+    its style JSON does not parse as ranking scores, so every theme gets the
+    neutral LLM score.
+    """
+    return ThemeSelectionAgent(llm_client=stub_llm)
+
+
+@pytest.fixture
+def selection_agent(base_selection_agent):
+    """Per-test shallow copy of the session ThemeSelectionAgent."""
+    return copy.copy(base_selection_agent)
+
+
+@pytest.fixture(scope="session")
+def application_request():
+    """
+    ApplicationRequest for WALLPAPER_PATH with an auto-selected desktop.
+
+    Shared by the session and never mutated by the agents; derive variants
+    with ``dataclasses.replace``.
+    """
+    return ApplicationRequest(file_path=WALLPAPER_PATH)
+
+
+@pytest.fixture(scope="session")
+def wallpaper_request():
+    """Valid full-size WallpaperRequest; derive variants with ``dataclasses.replace``."""
+    return WallpaperRequest(
+        theme_name="Test Theme",
+        style_guidelines={"prompt": "Test prompt"},
+        width=3024,
+        height=1964,
+    )
+
+
+@pytest.fixture(scope="session")
+def diwali_request(wallpaper_request):
+    """WallpaperRequest for Diwali with a color palette and key elements."""
+    return replace(
+        wallpaper_request,
+        theme_name="Diwali",
+        style_guidelines={
+            "prompt": "Minimalistic dark-themed wallpaper",
+            "color_palette": ["#1a1a1a", "#2d2d2d"],
+            "key_elements": ["lights", "diya"],
+        },
+    )
@@ -1,7 +1,11 @@
 """
 Tests for API client utilities.
 """
+import re
 import pytest
+from contextlib import contextmanager
+from operator import attrgetter
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 import requests
 
@@ -12,6 +16,12 @@ from api_clients import (
 )
 
 
+@contextmanager
+def _fake_ddgs(text):
+    """Stand-in for the DDGS context manager exposing only ``text``."""
+    yield SimpleNamespace(text=text)
+
+
 class TestDuckDuckGoClient:
     """Test DuckDuckGo search client."""
 
@@ -28,25 +38,20 @@ class TestDuckDuckGoClient:
             {"title": "Diwali 2024", "body": "Festival of Lights"},
             {"title": "ISRO Launch", "body": "Rocket launch news"},
         ]
-        mock_ddgs_instance = MagicMock()
-        mock_ddgs_instance.__enter__ = MagicMock(return_value=mock_ddgs_instance)
-        mock_ddgs_instance.__exit__ = MagicMock(return_value=False)
-        mock_ddgs_instance.text.return_value = mock_results
-        mock_ddgs_class.return_value = mock_ddgs_instance
+        text = Mock(return_value=mock_results)
+        mock_ddgs_class.side_effect = lambda *args, **kwargs: _fake_ddgs(text)
 
         client = DuckDuckGoClient()
         results = client.search_themes("Indian festivals")
 
         assert len(results) == 2
         assert results[0]["title"] == "Diwali 2024"
-        mock_ddgs_instance.text.assert_called_once()
+        text.assert_called_once()
 
     @patch('api_clients.duckduckgo_client.DDGS')
     def test_search_themes_empty_results(self, mock_ddgs):
         """Test search with empty results."""
-        mock_ddgs_instance = MagicMock()
-        mock_ddgs_instance.text.return_value = []
-        mock_ddgs.return_value = mock_ddgs_instance
+        mock_ddgs.side_effect = lambda *args, **kwargs: _fake_ddgs(lambda *a, **k: [])
 
         client = DuckDuckGoClient()
         results = client.search_themes("nonexistent query")
@@ -56,9 +61,8 @@ class TestDuckDuckGoClient:
     @patch('api_clients.duckduckgo_client.DDGS')
     def test_search_themes_error_handling(self, mock_ddgs):
         """Test error handling in search."""
-        mock_ddgs_instance = MagicMock()
-        mock_ddgs_instance.text.side_effect = Exception("API Error")
-        mock_ddgs.return_value = mock_ddgs_instance
+        text = Mock(side_effect=Exception("API Error"))
+        mock_ddgs.side_effect = lambda *args, **kwargs: _fake_ddgs(text)
 
         client = DuckDuckGoClient()
         results = client.search_themes("test query")
@@ -66,36 +70,34 @@ class TestDuckDuckGoClient:
         assert results == []
 
 
+POLLINATIONS_URL = re.compile(r"https://image\.pollinations\.ai/.*")
+
+
 class TestPollinationsClient:
     """Test Pollinations.ai image generation client."""
 
+    @pytest.fixture(autouse=True)
+    def pollinations_mock(self, requests_mock):
+        """Serve Pollinations requests from requests-mock; tests re-register to vary."""
+        requests_mock.get(POLLINATIONS_URL, content=b"fake_image_data", status_code=200)
+        return requests_mock
+
     def test_pollinations_client_initialization(self):
         """Test Pollinations client initialization."""
         client = PollinationsClient()
         assert client.base_url == "https://image.pollinations.ai/prompt/"
 
-    @patch('api_clients.pollinations_client.requests.get')
-    def test_generate_image_success(self, mock_get):
+    def test_generate_image_success(self, pollinations_mock):
         """Test successful image generation."""
-        # Mock response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b"fake_image_data"
-        mock_get.return_value = mock_response
-
         client = PollinationsClient()
         image_data = client.generate_image("minimalistic dark theme wallpaper")
 
         assert image_data == b"fake_image_data"
-        mock_get.assert_called_once()
+        assert pollinations_mock.call_count == 1
 
-    @patch('api_clients.pollinations_client.requests.get')
-    def test_generate_image_with_parameters(self, mock_get):
+    def test_generate_image_with_parameters(self, pollinations_mock):
         """Test image generation with custom parameters."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.content = b"image_data"
-        mock_get.return_value = mock_response
+        pollinations_mock.get(POLLINATIONS_URL, content=b"image_data")
 
         client = PollinationsClient()
         image_data = client.generate_image(
@@ -107,78 +109,113 @@ class TestPollinationsClient:
 
         assert image_data == b"image_data"
         # Verify URL contains parameters
-        call_args = mock_get.call_args
-        assert "3024" in call_args[0][0] or "width=3024" in str(call_args)
+        query = pollinations_mock.last_request.qs
+        assert query["width"] == ["3024"]
+        assert query["height"] == ["1964"]
+        assert query["model"] == ["flux"]
 
-    @patch('api_clients.pollinations_client.requests.get')
-    def test_generate_image_error_handling(self, mock_get):
+    def test_generate_image_error_handling(self, pollinations_mock):
         """Test error handling in image generation."""
-        mock_get.side_effect = requests.RequestException("Network error")
+        pollinations_mock.get(POLLINATIONS_URL, exc=requests.RequestException("Network error"))
 
         client = PollinationsClient()
         image_data = client.generate_image("test prompt")
 
         assert image_data is None
 
-    @patch('api_clients.pollinations_client.requests.get')
-    def test_generate_image_http_error(self, mock_get):
+    def test_generate_image_http_error(self, pollinations_mock):
         """Test handling of HTTP errors."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_get.return_value = mock_response
+        pollinations_mock.get(POLLINATIONS_URL, status_code=500)
 
         client = PollinationsClient()
         image_data = client.generate_image("test prompt")
 
         assert image_data is None
 
+    def test_generate_image_uses_shared_session(self):
+        """Test that an injected session is used for requests."""
+        mock_session = Mock()
+        mock_session.get.return_value = Mock(status_code=200, content=b"image_data")
+
+        client = PollinationsClient(session=mock_session)
+        image_data = client.generate_image("test prompt")
+
+        assert image_data == b"image_data"
+        mock_session.get.assert_called_once()
+
 
 class TestLLMClient:
     """Test LLM client (Anthropic/OpenAI)."""
 
-    def test_llm_client_initialization_anthropic(self):
-        """Test LLM client initialization with Anthropic."""
-        client = LLMClient(provider="anthropic", api_key="test_key")
-        assert client.provider == "anthropic"
+    @pytest.mark.parametrize("provider, default_attr", [
+        ("anthropic", "DEFAULT_ANTHROPIC_MODEL"),
+        ("openai", "DEFAULT_OPENAI_MODEL"),
+    ])
+    def test_llm_client_initialization(self, provider, default_attr):
+        """Test LLM client initialization for each provider."""
+        client = LLMClient(provider=provider, api_key="test_key")
+        assert client.provider == provider
         assert client.api_key == "test_key"
-        assert client.model == LLMClient.DEFAULT_ANTHROPIC_MODEL
+        assert client.model == getattr(LLMClient, default_attr)
+
+    @pytest.mark.parametrize("provider, anthropic_key, openai_key, expected_key", [
+        ("anthropic", "anthropic_key", None, "anthropic_key"),
+        ("openai", None, "openai_key", "openai_key"),
+    ])
+    def test_from_config(self, provider, anthropic_key, openai_key, expected_key):
+        """Test building a client for the configured provider."""
+        config = SimpleNamespace(
+            llm_provider=provider,
+            anthropic_api_key=anthropic_key,
+            openai_api_key=openai_key,
+            llm_model="custom-model",
+        )
 
-    def test_llm_client_initialization_openai(self):
-        """Test LLM client initialization with OpenAI."""
-        client = LLMClient(provider="openai", api_key="test_key")
-        assert client.provider == "openai"
-        assert client.api_key == "test_key"
-        assert client.model == LLMClient.DEFAULT_OPENAI_MODEL
+        client = LLMClient.from_config(config)
 
-    @patch('anthropic.Anthropic')
-    def test_generate_text_anthropic(self, mock_anthropic_class):
-        """Test text generation with Anthropic."""
-        mock_client = MagicMock()
-        mock_message = MagicMock()
-        mock_message.content = [MagicMock(text="Generated text")]
-        mock_client.messages.create.return_value = mock_message
-        mock_anthropic_class.return_value = mock_client
+        assert client.provider == provider
+        assert client.api_key == expected_key
+        assert client.model == "custom-model"
 
-        client = LLMClient(provider="anthropic", api_key="test_key")
-        result = client.generate_text("test prompt")
-
-        assert result == "Generated text"
-        mock_client.messages.create.assert_called_once()
+    def test_from_config_without_api_key(self):
+        """Test that no client is built when no API key is configured."""
+        config = SimpleNamespace(
+            llm_provider="anthropic",
+            anthropic_api_key=None,
+            openai_api_key=None,
+            llm_model=None,
+        )
 
-    @patch('openai.OpenAI')
-    def test_generate_text_openai(self, mock_openai_class):
-        """Test text generation with OpenAI."""
+        assert LLMClient.from_config(config) is None
+
+    @pytest.mark.parametrize("provider, sdk_class, endpoint, response", [
+        (
+            "anthropic",
+            "anthropic.Anthropic",
+            "messages",
+            SimpleNamespace(content=[SimpleNamespace(text="Generated text")]),
+        ),
+        (
+            "openai",
+            "openai.OpenAI",
+            "chat.completions",
+            SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="Generated text"))]
+            ),
+        ),
+    ])
+    def test_generate_text(self, provider, sdk_class, endpoint, response):
+        """Test text generation with each provider's SDK."""
         mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock(message=MagicMock(content="Generated text"))]
-        mock_client.chat.completions.create.return_value = mock_response
-        mock_openai_class.return_value = mock_client
+        create_endpoint = attrgetter(endpoint)(mock_client)
+        create_endpoint.create = MagicMock(return_value=response)
 
-        client = LLMClient(provider="openai", api_key="test_key")
-        result = client.generate_text("test prompt")
+        with patch(sdk_class, return_value=mock_client):
+            client = LLMClient(provider=provider, api_key="test_key")
+            result = client.generate_text("test prompt")
 
         assert result == "Generated text"
-        mock_client.chat.completions.create.assert_called_once()
+        create_endpoint.create.assert_called_once()
 
     def test_llm_client_custom_model(self):
         """Test LLM client with custom model."""
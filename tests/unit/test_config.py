@@ -1,6 +1,7 @@
 """
 Tests for configuration system.
 """
+import io
 import os
 import pytest
 from pathlib import Path
@@ -13,14 +14,60 @@ from config.preferences import (
     get_llm_config,
     get_theme_preferences,
 )
+from tests._helpers import cached_load_config, restored_environ
+
+
+DOTENV_KEYS = (
+    "WALLPAPER_DIR",
+    "LOG_DIR",
+    "WALLPAPER_WIDTH",
+    "WALLPAPER_HEIGHT",
+    "PREFER_INDIAN_CULTURE",
+    "PREFER_INDIAN_ACHIEVEMENTS",
+    "ANTHROPIC_API_KEY",
+    "LLM_PROVIDER",
+)
+
+CONFIG_ENV_KEYS = DOTENV_KEYS + ("OPENAI_API_KEY", "LLM_MODEL")
+
+
+@pytest.fixture(scope="session")
+def default_config():
+    """Config built once from a clean environment, for tests that only read defaults."""
+    with pytest.MonkeyPatch.context() as mp:
+        for key in CONFIG_ENV_KEYS:
+            mp.delenv(key, raising=False)
+        return Config()
+
+
+@pytest.fixture(scope="module")
+def dotenv_config(tmp_path_factory):
+    """Config parsed once per module from a written .env file, with its directory."""
+    cfg_dir = tmp_path_factory.mktemp("cfg")
+    env_file = cfg_dir / ".env"
+    env_file.write_text(f"""WALLPAPER_DIR={cfg_dir / "test_wallpapers"}
+LOG_DIR={cfg_dir / "test_logs"}
+WALLPAPER_WIDTH=2560
+WALLPAPER_HEIGHT=1440
+PREFER_INDIAN_CULTURE=true
+PREFER_INDIAN_ACHIEVEMENTS=true
+ANTHROPIC_API_KEY=test_key_123
+LLM_PROVIDER=anthropic
+""")
+
+    # load_dotenv writes into os.environ (without overriding existing keys),
+    # so clear those keys first and restore the environment once parsed
+    with restored_environ(clear=DOTENV_KEYS):
+        config = cached_load_config(env_file)
+    return config, cfg_dir
 
 
 class TestConfig:
     """Test configuration loading and management."""
 
-    def test_config_initialization(self):
+    def test_config_initialization(self, default_config):
         """Test Config class initialization with default values."""
-        config = Config()
+        config = default_config
         assert config.wallpaper_dir == Path("./wallpapers")
         assert config.log_dir == Path("./logs")
         assert config.wallpaper_width == 3024
@@ -33,12 +80,16 @@ class TestConfig:
         test_wallpaper_dir = tmp_path / "wallpapers"
         test_log_dir = tmp_path / "logs"
         
-        monkeypatch.setenv("WALLPAPER_DIR", str(test_wallpaper_dir))
-        monkeypatch.setenv("LOG_DIR", str(test_log_dir))
-        monkeypatch.setenv("WALLPAPER_WIDTH", "1920")
-        monkeypatch.setenv("WALLPAPER_HEIGHT", "1080")
-        monkeypatch.setenv("PREFER_INDIAN_CULTURE", "false")
-        monkeypatch.setenv("PREFER_INDIAN_ACHIEVEMENTS", "false")
+        env = {
+            "WALLPAPER_DIR": str(test_wallpaper_dir),
+            "LOG_DIR": str(test_log_dir),
+            "WALLPAPER_WIDTH": "1920",
+            "WALLPAPER_HEIGHT": "1080",
+            "PREFER_INDIAN_CULTURE": "false",
+            "PREFER_INDIAN_ACHIEVEMENTS": "false",
+        }
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
 
         config = Config()
         assert config.wallpaper_dir == test_wallpaper_dir
@@ -48,40 +99,33 @@ class TestConfig:
         assert config.prefer_indian_culture is False
         assert config.prefer_indian_achievements is False
 
-    def test_load_config_from_dotenv(self, tmp_path, monkeypatch):
+    def test_load_config_from_dotenv(self, dotenv_config):
         """Test loading configuration from .env file."""
-        env_file = tmp_path / ".env"
-        test_wallpaper_dir = tmp_path / "test_wallpapers"
-        test_log_dir = tmp_path / "test_logs"
-        
-        env_content = f"""WALLPAPER_DIR={test_wallpaper_dir}
-LOG_DIR={test_log_dir}
-WALLPAPER_WIDTH=2560
-WALLPAPER_HEIGHT=1440
-PREFER_INDIAN_CULTURE=true
-PREFER_INDIAN_ACHIEVEMENTS=true
-ANTHROPIC_API_KEY=test_key_123
-LLM_PROVIDER=anthropic
-"""
-        env_file.write_text(env_content)
-
-        config = load_config(env_file_path=env_file)
-        assert config.wallpaper_dir == test_wallpaper_dir
-        assert config.log_dir == test_log_dir
+        config, cfg_dir = dotenv_config
+        assert config.wallpaper_dir == cfg_dir / "test_wallpapers"
+        assert config.log_dir == cfg_dir / "test_logs"
         assert config.wallpaper_width == 2560
         assert config.wallpaper_height == 1440
         assert config.anthropic_api_key == "test_key_123"
         assert config.llm_provider == "anthropic"
 
-    def test_get_wallpaper_config(self, monkeypatch):
-        """Test getting wallpaper configuration."""
-        # Ensure clean environment
-        monkeypatch.delenv("WALLPAPER_WIDTH", raising=False)
-        monkeypatch.delenv("WALLPAPER_HEIGHT", raising=False)
-        monkeypatch.delenv("WALLPAPER_DIR", raising=False)
+    def test_load_config_from_stream(self, monkeypatch):
+        """Test loading configuration from an in-memory .env stream."""
+        # load_dotenv writes into os.environ; point it at a throwaway copy
+        monkeypatch.setattr(os, "environ", os.environ.copy())
+        for key in DOTENV_KEYS:
+            monkeypatch.delenv(key, raising=False)
         
-        config = Config()
-        wallpaper_config = get_wallpaper_config(config)
+        env_stream = io.StringIO("WALLPAPER_WIDTH=2560\nWALLPAPER_HEIGHT=1440\nLLM_PROVIDER=openai\n")
+        config = load_config(env_stream=env_stream)
+        
+        assert config.wallpaper_width == 2560
+        assert config.wallpaper_height == 1440
+        assert config.llm_provider == "openai"
+
+    def test_get_wallpaper_config(self, default_config):
+        """Test getting wallpaper configuration."""
+        wallpaper_config = get_wallpaper_config(default_config)
 
         assert "width" in wallpaper_config
         assert "height" in wallpaper_config
@@ -92,9 +136,13 @@ LLM_PROVIDER=anthropic
 
     def test_get_llm_config(self, monkeypatch):
         """Test getting LLM configuration."""
-        monkeypatch.setenv("ANTHROPIC_API_KEY", "test_anthropic_key")
-        monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
-        monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+        env = {
+            "ANTHROPIC_API_KEY": "test_anthropic_key",
+            "OPENAI_API_KEY": "test_openai_key",
+            "LLM_PROVIDER": "anthropic",
+        }
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
 
         config = Config()
         llm_config = get_llm_config(config)
@@ -128,10 +176,9 @@ LLM_PROVIDER=anthropic
         llm_config = get_llm_config(config)
         assert llm_config["provider"] == "anthropic"
 
-    def test_get_theme_preferences(self):
+    def test_get_theme_preferences(self, default_config):
         """Test getting theme preferences."""
-        config = Config()
-        preferences = get_theme_preferences(config)
+        preferences = get_theme_preferences(default_config)
 
         assert "prefer_indian_culture" in preferences
         assert "prefer_indian_achievements" in preferences
@@ -154,22 +201,20 @@ LLM_PROVIDER=anthropic
         assert wallpaper_dir.exists()
         assert log_dir.exists()
 
-    def test_config_validation(self):
+    def test_config_validation(self, default_config, subtests):
         """Test configuration validation."""
-        config = Config()
+        config = default_config
         # Valid config should not raise errors
-        assert config.wallpaper_width > 0
-        assert config.wallpaper_height > 0
-        assert isinstance(config.prefer_indian_culture, bool)
-        assert isinstance(config.prefer_indian_achievements, bool)
-
-    def test_missing_api_key_handling(self, monkeypatch):
+        for field in ("wallpaper_width", "wallpaper_height"):
+            with subtests.test(field=field):
+                assert getattr(config, field) > 0
+        for field in ("prefer_indian_culture", "prefer_indian_achievements"):
+            with subtests.test(field=field):
+                assert isinstance(getattr(config, field), bool)
+
+    def test_missing_api_key_handling(self, default_config):
         """Test handling of missing API keys."""
-        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
-        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-
-        config = Config()
-        llm_config = get_llm_config(config)
+        llm_config = get_llm_config(default_config)
 
         # Should still return config, but with None keys
         assert "anthropic_api_key" in llm_config
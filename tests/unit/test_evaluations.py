@@ -1,17 +1,47 @@
 """
 Tests for Evaluation Framework.
 """
+import copy
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, patch
 from pathlib import Path
 from datetime import datetime
 from evaluations.evaluator import AgentEvaluator
+from evaluations.discovery_evaluator import DiscoveryEvaluator
 from evaluations.metrics import EvaluationResult, EvaluationMetrics
 
 
+# Fixed timestamp keeps to_dict() output deterministic
+_SAMPLE_RESULT = EvaluationResult(
+    agent_name="TestAgent",
+    timestamp=datetime(2024, 1, 1),
+    overall_score=85.0,
+    metrics={
+        "test_metric": EvaluationMetrics(
+            score=85.0,
+            threshold=80.0,
+            passed=True,
+        ),
+    },
+)
+
+
+@pytest.fixture(scope="module")
+def discovery_evaluator():
+    """DiscoveryEvaluator without an LLM client, shared by the module."""
+    return DiscoveryEvaluator()
+
+
 class TestAgentEvaluator:
     """Test Agent Evaluator."""
     
+    @pytest.fixture
+    def make_discovery_evaluator(self):
+        """Factory for DiscoveryEvaluators wired to a given LLM client."""
+        def _make(llm_client):
+            return DiscoveryEvaluator(llm_client=llm_client)
+        return _make
+    
     def test_evaluator_initialization(self):
         """Test evaluator initialization."""
         evaluator = AgentEvaluator()
@@ -70,13 +100,12 @@ class TestAgentEvaluator:
         assert "preference_adherence" in result.metrics
         assert "style_quality" in result.metrics
     
-    def test_evaluate_generation_agent(self, tmp_path):
+    def test_evaluate_generation_agent(self, tiny_png):
         """Test generation agent evaluation."""
         evaluator = AgentEvaluator(llm_client=None)
         
-        # Create a dummy image
-        image_path = tmp_path / "test_wallpaper.png"
-        image_path.write_bytes(b'\x89PNG\r\n\x1a\n' + b'\x00' * 1000)
+        # Real (decodable) image so metrics don't take the error fallback
+        image_path = tiny_png
         
         theme = {"name": "Diwali", "description": "Festival"}
         
@@ -101,14 +130,12 @@ class TestAgentEvaluator:
         assert "application_success" in result.metrics
         assert result.metrics["application_success"].score == 100.0
     
-    def test_evaluate_relevance_with_llm(self):
+    def test_evaluate_relevance_with_llm(self, make_discovery_evaluator):
         """Test relevance evaluation with LLM."""
-        from evaluations.discovery_evaluator import DiscoveryEvaluator
-        
-        mock_llm = MagicMock()
+        mock_llm = Mock()
         mock_llm.generate_text.return_value = '{"average_relevance": 85.5}'
         
-        evaluator = DiscoveryEvaluator(llm_client=mock_llm)
+        evaluator = make_discovery_evaluator(mock_llm)
         
         themes = [
             {"name": "Diwali", "description": "Festival"},
@@ -120,11 +147,9 @@ class TestAgentEvaluator:
         assert score == 85.5
         mock_llm.generate_text.assert_called_once()
     
-    def test_evaluate_quality(self):
+    def test_evaluate_quality(self, discovery_evaluator):
         """Test quality evaluation."""
-        from evaluations.discovery_evaluator import DiscoveryEvaluator
-        
-        evaluator = DiscoveryEvaluator()
+        evaluator = discovery_evaluator
         
         themes = [
             {
@@ -139,11 +164,9 @@ class TestAgentEvaluator:
         assert 0.0 <= score <= 100.0
         assert score > 50.0  # Should be decent quality
     
-    def test_evaluate_deduplication(self):
+    def test_evaluate_deduplication(self, discovery_evaluator):
         """Test deduplication evaluation."""
-        from evaluations.discovery_evaluator import DiscoveryEvaluator
-        
-        evaluator = DiscoveryEvaluator()
+        evaluator = discovery_evaluator
         
         themes = [
             {"name": "Diwali"},
@@ -156,11 +179,9 @@ class TestAgentEvaluator:
         # Should detect some duplication
         assert 0.0 <= score <= 100.0
     
-    def test_evaluate_coverage(self):
+    def test_evaluate_coverage(self, discovery_evaluator):
         """Test coverage evaluation."""
-        from evaluations.discovery_evaluator import DiscoveryEvaluator
-        
-        evaluator = DiscoveryEvaluator()
+        evaluator = discovery_evaluator
         
         themes = [
             {"type": "indian_cultural"},
@@ -175,18 +196,7 @@ class TestAgentEvaluator:
     
     def test_evaluation_result_to_dict(self):
         """Test converting evaluation result to dictionary."""
-        result = EvaluationResult(
-            agent_name="TestAgent",
-            timestamp=datetime.now(),
-            overall_score=85.0,
-            metrics={
-                "test_metric": EvaluationMetrics(
-                    score=85.0,
-                    threshold=80.0,
-                    passed=True,
-                ),
-            },
-        )
+        result = copy.deepcopy(_SAMPLE_RESULT)
         
         result_dict = result.to_dict()
         
@@ -194,4 +204,5 @@ class TestAgentEvaluator:
         assert result_dict["agent_name"] == "TestAgent"
         assert result_dict["overall_score"] == 85.0
         assert "test_metric" in result_dict["metrics"]
+        assert result_dict["timestamp"] == "2024-01-01T00:00:00"
 
@@ -1,34 +1,48 @@
 """
 Tests for Generation Evaluator edge cases and image processing.
 """
+import subprocess
+import sys
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 from PIL import Image
 import numpy as np
 from evaluations.generation_evaluator import GenerationEvaluator
+from tests._helpers import solid_png_bytes, write_solid_png
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    """GenerationEvaluator without an LLM client, shared by the module."""
+    return GenerationEvaluator()
+
+
+@pytest.fixture(scope="module")
+def shared_tmp(tmp_path_factory):
+    """One temporary directory for every test in the module."""
+    return tmp_path_factory.mktemp("gen_eval")
 
 
 class TestGenerationEvaluatorEdgeCases:
     """Test Generation Evaluator edge cases."""
     
-    def test_evaluate_image_quality_file_not_exists(self, tmp_path):
+    @pytest.fixture
+    def tmp_file(self, shared_tmp, request):
+        """Build a path in the shared directory, prefixed with the test name."""
+        return lambda name: shared_tmp / f"{request.node.name}_{name}"
+    
+    def test_evaluate_image_quality_file_not_exists(self, evaluator, tmp_file):
         """Test image quality evaluation when file doesn't exist."""
-        evaluator = GenerationEvaluator()
-        
-        non_existent_path = tmp_path / "nonexistent.png"
+        non_existent_path = tmp_file("nonexistent.png")
         score = evaluator._evaluate_image_quality(non_existent_path)
         
         assert score == 0.0
     
-    def test_evaluate_image_quality_low_resolution(self, tmp_path):
+    def test_evaluate_image_quality_low_resolution(self, evaluator, tmp_file):
         """Test image quality with low resolution."""
-        evaluator = GenerationEvaluator()
-        
         # Create a small image (500x400)
-        img = Image.new('RGB', (500, 400), color='black')
-        image_path = tmp_path / "small.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("small.png"), 500, 400, color='black')
         
         score = evaluator._evaluate_image_quality(image_path)
         
@@ -36,81 +50,83 @@ class TestGenerationEvaluatorEdgeCases:
         assert 0.0 <= score <= 100.0
         assert score < 60.0  # Should not get full resolution points (40) + format (20)
     
-    def test_evaluate_image_quality_medium_resolution(self, tmp_path):
+    def test_evaluate_image_quality_medium_resolution(self, evaluator, tmp_file):
         """Test image quality with medium resolution."""
-        evaluator = GenerationEvaluator()
-        
         # Create a medium image (1200x900)
-        img = Image.new('RGB', (1200, 900), color='black')
-        image_path = tmp_path / "medium.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("medium.png"), 1200, 900, color='black')
         
         score = evaluator._evaluate_image_quality(image_path)
         
         # Should get partial resolution points
         assert score >= 20.0  # At least medium resolution points
     
-    def test_evaluate_image_quality_high_resolution(self, tmp_path):
+    def test_evaluate_image_quality_high_resolution(self, evaluator, tmp_file):
         """Test image quality with high resolution."""
-        evaluator = GenerationEvaluator()
-        
         # Create a high-res image (3000x2000)
-        img = Image.new('RGB', (3000, 2000), color='black')
-        image_path = tmp_path / "highres.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("highres.png"), 3000, 2000, color='black')
         
         score = evaluator._evaluate_image_quality(image_path)
         
         # Should get full resolution points
         assert score >= 40.0
     
-    def test_evaluate_image_quality_invalid_format(self, tmp_path):
+    def test_evaluate_image_quality_invalid_format(self, evaluator, tmp_file):
         """Test image quality with invalid format."""
-        evaluator = GenerationEvaluator()
-        
         # Create a file with invalid extension
-        invalid_path = tmp_path / "image.txt"
+        invalid_path = tmp_file("image.txt")
         invalid_path.write_text("not an image")
         
         score = evaluator._evaluate_image_quality(invalid_path)
         
         # Should handle gracefully
-        assert 0.0 <= score <= 100.0
+        assert score == 0.0
     
-    def test_evaluate_image_quality_small_file_size(self, tmp_path):
+    def test_evaluate_image_quality_small_file_size(self, evaluator, tmp_file):
         """Test image quality with very small file size."""
-        evaluator = GenerationEvaluator()
-        
         # Create a very small image
-        img = Image.new('RGB', (100, 100), color='black')
-        image_path = tmp_path / "tiny.png"
-        img.save(image_path, optimize=True)
+        image_path = write_solid_png(tmp_file("tiny.png"), 100, 100, color='black')
         
         score = evaluator._evaluate_image_quality(image_path)
         
         # Should get partial file size points
         assert 0.0 <= score <= 100.0
     
-    def test_evaluate_image_quality_large_file_size(self, tmp_path):
+    def test_evaluate_image_quality_large_file_size(self, evaluator, tmp_file):
         """Test image quality with very large file size."""
-        evaluator = GenerationEvaluator()
-        
         # Create a large image (uncompressed)
-        img = Image.new('RGB', (5000, 5000), color='black')
-        image_path = tmp_path / "large.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("large.png"), 5000, 5000, color='black')
         
         score = evaluator._evaluate_image_quality(image_path)
         
         # Should handle large files
         assert 0.0 <= score <= 100.0
     
-    def test_evaluate_image_quality_image_verify_fails(self, tmp_path):
-        """Test image quality when image.verify() fails."""
-        evaluator = GenerationEvaluator()
+    def test_evaluate_image_quality_reads_png_header_dimensions(self, evaluator, tmp_file):
+        """Test that PNG resolution is scored from the header without PIL."""
+        image_path = tmp_file("header.png")
+        write_solid_png(image_path, 2000, 1500, mode='L')
+        
+        with patch('PIL.Image.open', wraps=Image.open) as mock_open:
+            score = evaluator._evaluate_image_quality(image_path)
         
+        # PIL is only opened once, to verify the body
+        assert mock_open.call_count == 1
+        assert score >= 80.0
+    
+    def test_evaluate_image_quality_png_header_with_corrupt_body(self, evaluator, tmp_file):
+        """Test that a valid PNG header does not rescue a corrupt body."""
+        image_path = tmp_file("broken_body.png")
+        header = solid_png_bytes(1920, 1080)[:33]  # signature + IHDR chunk
+        image_path.write_bytes(header + b'\x00garbage' * 20_000)
+        
+        score = evaluator._evaluate_image_quality(image_path)
+        
+        assert score == 0.0
+    
+    def test_evaluate_image_quality_image_verify_fails(self, evaluator, tmp_file):
+        """Test image quality when image.verify() fails."""
         # Create a corrupted image file
-        corrupted_path = tmp_path / "corrupted.png"
+        corrupted_path = tmp_file("corrupted.png")
         corrupted_path.write_bytes(b'PNG\x00\x00\x00\x00invalid')
         
         with patch('PIL.Image.open') as mock_open:
@@ -126,94 +142,65 @@ class TestGenerationEvaluatorEdgeCases:
             assert 0.0 <= score <= 100.0
             assert score < 100.0  # Should not get full score
     
-    def test_evaluate_image_quality_exception_handling(self, tmp_path):
+    def test_evaluate_image_quality_exception_handling(self, evaluator, tmp_file):
         """Test image quality evaluation exception handling."""
-        evaluator = GenerationEvaluator()
-        
-        image_path = tmp_path / "test.png"
+        image_path = tmp_file("test.png")
         
         with patch('PIL.Image.open', side_effect=Exception("IO Error")):
             score = evaluator._evaluate_image_quality(image_path)
             
             assert score == 0.0
     
-    def test_evaluate_dark_theme_compliance_file_not_exists(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_file_not_exists(self, evaluator, tmp_file):
         """Test dark theme compliance when file doesn't exist."""
-        evaluator = GenerationEvaluator()
-        
-        non_existent_path = tmp_path / "nonexistent.png"
+        non_existent_path = tmp_file("nonexistent.png")
         score = evaluator._evaluate_dark_theme_compliance(non_existent_path)
         
         assert score == 0.0
     
-    def test_evaluate_dark_theme_compliance_very_dark(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_very_dark(self, evaluator, tmp_file):
         """Test dark theme compliance with very dark image."""
-        evaluator = GenerationEvaluator()
-        
         # Create a very dark image (brightness < 50)
-        img_array = np.zeros((100, 100, 3), dtype=np.uint8)  # All black
-        img = Image.fromarray(img_array)
-        image_path = tmp_path / "very_dark.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("very_dark.png"), 100, 100, color=(0, 0, 0))  # All black
         
         score = evaluator._evaluate_dark_theme_compliance(image_path)
         
         assert score == 100.0
     
-    def test_evaluate_dark_theme_compliance_dark(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_dark(self, evaluator, tmp_file):
         """Test dark theme compliance with dark image."""
-        evaluator = GenerationEvaluator()
-        
         # Create a dark image (brightness ~75)
-        img_array = np.full((100, 100, 3), 75, dtype=np.uint8)
-        img = Image.fromarray(img_array)
-        image_path = tmp_path / "dark.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("dark.png"), 100, 100, color=(75, 75, 75))
         
         score = evaluator._evaluate_dark_theme_compliance(image_path)
         
         # Should get high score (between 70-90)
         assert 70.0 <= score <= 90.0
     
-    def test_evaluate_dark_theme_compliance_medium(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_medium(self, evaluator, tmp_file):
         """Test dark theme compliance with medium brightness image."""
-        evaluator = GenerationEvaluator()
-        
         # Create a medium brightness image (brightness ~110)
-        img_array = np.full((100, 100, 3), 110, dtype=np.uint8)
-        img = Image.fromarray(img_array)
-        image_path = tmp_path / "medium.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("medium.png"), 100, 100, color=(110, 110, 110))
         
         score = evaluator._evaluate_dark_theme_compliance(image_path)
         
         # Should get lower score (between 50-70)
         assert 50.0 <= score <= 70.0
     
-    def test_evaluate_dark_theme_compliance_bright(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_bright(self, evaluator, tmp_file):
         """Test dark theme compliance with bright image."""
-        evaluator = GenerationEvaluator()
-        
         # Create a bright image (brightness > 128)
-        img_array = np.full((100, 100, 3), 200, dtype=np.uint8)
-        img = Image.fromarray(img_array)
-        image_path = tmp_path / "bright.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("bright.png"), 100, 100, color=(200, 200, 200))
         
         score = evaluator._evaluate_dark_theme_compliance(image_path)
         
         # Should get low score (< 50)
         assert 0.0 <= score < 50.0
     
-    def test_evaluate_dark_theme_compliance_grayscale(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_grayscale(self, evaluator, tmp_file):
         """Test dark theme compliance with grayscale image."""
-        evaluator = GenerationEvaluator()
-        
         # Create a grayscale image
-        img_array = np.full((100, 100), 50, dtype=np.uint8)  # Dark grayscale
-        img = Image.fromarray(img_array, mode='L')
-        image_path = tmp_path / "grayscale.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("grayscale.png"), 100, 100, color=50, mode='L')  # Dark grayscale
         
         score = evaluator._evaluate_dark_theme_compliance(image_path)
         
@@ -221,11 +208,44 @@ class TestGenerationEvaluatorEdgeCases:
         assert 0.0 <= score <= 100.0
         assert score >= 80.0  # Dark grayscale should score high
     
-    def test_evaluate_dark_theme_compliance_exception_handling(self, tmp_path):
-        """Test dark theme compliance exception handling."""
-        evaluator = GenerationEvaluator()
+    def test_evaluate_dark_theme_compliance_large_image(self, evaluator, tmp_file):
+        """Test that large images are scored on their exact mean brightness."""
+        # Top half black, bottom half 200: mean brightness is exactly 100
+        img_array = np.zeros((1000, 1000), dtype=np.uint8)
+        img_array[500:] = 200
+        image_path = tmp_file("split.png")
+        Image.fromarray(img_array, mode='L').save(image_path)
         
-        image_path = tmp_path / "test.png"
+        score = evaluator._evaluate_dark_theme_compliance(image_path)
+        
+        assert score == 70.0
+    
+    def test_evaluate_dark_theme_compliance_ignores_alpha(self, evaluator, tmp_file):
+        """Test that an opaque alpha channel does not count as brightness."""
+        img_array = np.zeros((100, 100, 4), dtype=np.uint8)
+        img_array[..., 3] = 255  # Opaque black
+        image_path = tmp_file("rgba.png")
+        Image.fromarray(img_array, mode='RGBA').save(image_path)
+        
+        score = evaluator._evaluate_dark_theme_compliance(image_path)
+        
+        assert score == 100.0
+    
+    def test_evaluate_dark_theme_compliance_reuses_decoded_brightness(self, evaluator, tmp_file):
+        """Test that an unchanged file is not decoded again."""
+        image_path = tmp_file("cached.png")
+        write_solid_png(image_path, 100, 100)
+        first = evaluator._evaluate_dark_theme_compliance(image_path)
+        
+        with patch('PIL.Image.open') as mock_open:
+            second = evaluator._evaluate_dark_theme_compliance(image_path)
+        
+        assert second == first
+        mock_open.assert_not_called()
+    
+    def test_evaluate_dark_theme_compliance_exception_handling(self, evaluator, tmp_file):
+        """Test dark theme compliance exception handling."""
+        image_path = tmp_file("test.png")
         
         with patch('PIL.Image.open', side_effect=Exception("IO Error")):
             score = evaluator._evaluate_dark_theme_compliance(image_path)
@@ -233,50 +253,39 @@ class TestGenerationEvaluatorEdgeCases:
             # Should return default fallback (50.0) or 0.0 if file doesn't exist check happens first
             assert score in [0.0, 50.0]
     
-    def test_evaluate_dark_theme_compliance_numpy_error(self, tmp_path):
+    def test_evaluate_dark_theme_compliance_numpy_error(self, evaluator, tmp_file):
         """Test dark theme compliance when numpy conversion fails."""
-        evaluator = GenerationEvaluator()
+        image_path = tmp_file("test.png")
+        write_solid_png(image_path, 100, 100)
         
-        image_path = tmp_path / "test.png"
-        img = Image.new('RGB', (100, 100), color='black')
-        img.save(image_path)
-        
-        with patch('numpy.array', side_effect=Exception("Numpy error")):
+        with patch('numpy.asarray', side_effect=Exception("Numpy error")):
             score = evaluator._evaluate_dark_theme_compliance(image_path)
             
             assert score == 50.0  # Default fallback
     
-    def test_evaluate_theme_adherence_no_llm_client(self, tmp_path):
-        """Test theme adherence without LLM client."""
-        evaluator = GenerationEvaluator(llm_client=None)
-        
-        image_path = tmp_path / "test.png"
-        img = Image.new('RGB', (100, 100), color='black')
-        img.save(image_path)
+    def test_evaluate_theme_adherence_no_llm_client(self, evaluator, tmp_file):
+        """Test theme adherence without LLM client returns the default without file I/O."""
+        image_path = tmp_file("test.png")
         
         theme = {"name": "Diwali", "description": "Festival"}
-        score = evaluator._evaluate_theme_adherence(image_path, theme)
+        with patch.object(Path, 'exists') as mock_exists:
+            score = evaluator._evaluate_theme_adherence(image_path, theme)
         
         assert score == 75.0  # Default score
+        mock_exists.assert_not_called()
     
-    def test_evaluate_theme_adherence_file_not_exists(self, tmp_path):
+    def test_evaluate_theme_adherence_file_not_exists(self, evaluator, tmp_file):
         """Test theme adherence when file doesn't exist."""
-        evaluator = GenerationEvaluator()
-        
-        non_existent_path = tmp_path / "nonexistent.png"
+        non_existent_path = tmp_file("nonexistent.png")
         theme = {"name": "Diwali"}
         score = evaluator._evaluate_theme_adherence(non_existent_path, theme)
         
         assert score == 75.0  # Default score
     
-    def test_evaluate_full_pipeline_edge_cases(self, tmp_path):
+    def test_evaluate_full_pipeline_edge_cases(self, evaluator, tmp_file):
         """Test full evaluation pipeline with edge cases."""
-        evaluator = GenerationEvaluator()
-        
         # Create a valid but low-quality image
-        img = Image.new('RGB', (500, 400), color=(200, 200, 200))  # Bright, small
-        image_path = tmp_path / "low_quality.png"
-        img.save(image_path)
+        image_path = write_solid_png(tmp_file("low_quality.png"), 500, 400, color=(200, 200, 200))  # Bright, small
         
         theme = {"name": "Test", "description": "Test theme"}
         result = evaluator.evaluate(image_path, theme)
@@ -288,4 +297,21 @@ class TestGenerationEvaluatorEdgeCases:
         assert result.overall_score >= 0.0
         # Should have warnings for low dark theme compliance
         assert len(result.warnings) > 0 or result.metrics["dark_theme_compliance"].score < 80.0
-
+    
+    def test_import_defers_numpy_and_pil(self):
+        """Test that importing the evaluator does not load NumPy or PIL."""
+        src_dir = Path(__file__).resolve().parents[2] / "src"
+        code = (
+            "import sys; import evaluations.generation_evaluator; "
+            "print(sorted(m for m in ('numpy', 'PIL.Image') if m in sys.modules))"
+        )
+        
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=src_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        
+        assert result.stdout.strip() == "[]"
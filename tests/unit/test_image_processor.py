@@ -38,6 +38,26 @@ class TestImageProcessor:
         # The actual aspect will be target aspect (3024/1964 ≈ 1.54) since we crop to fit
         assert resized.size == (3024, 1964)  # Should match target dimensions
 
+    def test_resize_image_uniform_preserves_color(self):
+        """Test that solid-color images are resized to the same solid fill."""
+        original_image = Image.new("RGBA", (10, 10), color=(12, 34, 56, 78))
+        
+        resized = resize_image(original_image, width=300, height=200, maintain_aspect=True)
+        
+        assert resized.size == (300, 200)
+        assert resized.mode == "RGBA"
+        assert resized.getextrema() == ((12, 12), (34, 34), (56, 56), (78, 78))
+
+    def test_resize_image_uses_resample_filter(self):
+        """Test that the resampling filter is forwarded to PIL."""
+        original_image = Image.new("L", (2, 1))
+        original_image.putpixel((1, 0), 255)
+        
+        with patch.object(Image.Image, "resize", autospec=True) as mock_resize:
+            resize_image(original_image, width=4, height=2, resample=Image.Resampling.BILINEAR)
+        
+        mock_resize.assert_called_once_with(original_image, (4, 2), Image.Resampling.BILINEAR)
+
     def test_ensure_dark_theme(self):
         """Test dark theme enforcement."""
         # Create a light image
@@ -50,6 +70,25 @@ class TestImageProcessor:
         assert dark_image is not None
         assert isinstance(dark_image, Image.Image)
 
+    def test_ensure_dark_theme_reduces_brightness_to_threshold(self):
+        """Test that bright images are darkened to the threshold."""
+        light_image = Image.new("RGB", (100, 100), color=(200, 200, 200))
+        
+        dark_image = ensure_dark_theme(light_image, threshold=0.5)
+        
+        brightness = dark_image.convert("L").getpixel((50, 50)) / 255.0
+        assert brightness == pytest.approx(0.5, abs=0.01)
+
+    def test_ensure_dark_theme_preserves_alpha(self):
+        """Test that darkening leaves the alpha channel untouched."""
+        light_image = Image.new("RGBA", (10, 10), color=(255, 255, 255, 128))
+        
+        dark_image = ensure_dark_theme(light_image, threshold=0.5)
+        
+        r, g, b, a = dark_image.getpixel((5, 5))
+        assert r < 255 and g < 255 and b < 255
+        assert a == 128
+
     def test_ensure_dark_theme_already_dark(self):
         """Test dark theme on already dark image."""
         dark_image = Image.new("RGB", (100, 100), color="black")
@@ -118,4 +157,9 @@ class TestImageProcessor:
         
         assert result_path == output_path
         assert output_path.exists()
+        
+        # Darkened before upscaling, so the saved wallpaper sits at the threshold
+        processed = Image.open(output_path)
+        assert processed.size == (3024, 1964)
+        assert processed.convert("L").getpixel((0, 0)) / 255.0 == pytest.approx(0.5, abs=0.01)
 
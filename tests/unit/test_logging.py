@@ -9,6 +9,12 @@ from unittest.mock import patch, mock_open
 from utils.logger import setup_logging, get_logger
 
 
+def _flush_logging():
+    """Push records buffered by the file handler's MemoryHandler to disk."""
+    for handler in logging.getLogger("wallpaper_agent").handlers:
+        handler.flush()
+
+
 class TestLogging:
     """Test logging system."""
 
@@ -48,6 +54,7 @@ class TestLogging:
         
         logger = get_logger("test")
         logger.info("Test message")
+        _flush_logging()
         
         # Check that log file exists and contains message
         log_file = log_dir / "wallpaper_agent.log"
@@ -62,6 +69,7 @@ class TestLogging:
         
         logger = get_logger("test")
         logger.info("Test message")
+        _flush_logging()
         
         # Logger should format with timestamp, level, etc.
         log_file = log_dir / "wallpaper_agent.log"
@@ -86,3 +94,46 @@ class TestLogging:
             content = log_file.read_text()
             assert "Error occurred" in content or "Test error" in content
 
+    def test_records_carry_no_rendered_output(self, tmp_path):
+        """Test that handlers downstream of the formatter get a standard record."""
+        log_dir = tmp_path / "logs"
+        setup_logging(log_dir=log_dir)
+        
+        records = []
+        extra = logging.Handler()
+        extra.emit = records.append
+        root_logger = logging.getLogger("wallpaper_agent")
+        root_logger.addHandler(extra)
+        try:
+            get_logger("test").info("Lazy %s", "message")
+        finally:
+            root_logger.removeHandler(extra)
+        
+        # Formatter.format() adds only "message" and "asctime" to a record
+        standard = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+        assert set(records[0].__dict__) <= standard
+
+    def test_logger_buffers_file_writes_until_error(self, tmp_path):
+        """Test that INFO records are batched and ERROR flushes the buffer."""
+        log_dir = tmp_path / "logs"
+        setup_logging(log_dir=log_dir)
+        log_file = log_dir / "wallpaper_agent.log"
+        
+        logger = get_logger("test")
+        logger.info("Buffered message")
+        assert "Buffered message" not in log_file.read_text()
+        
+        logger.error("Flushing error")
+        content = log_file.read_text()
+        assert "Buffered message" in content
+        assert "Flushing error" in content
+
+    def test_setup_logging_flushes_previous_handlers(self, tmp_path):
+        """Test that reconfiguring logging does not drop buffered records."""
+        first_dir = tmp_path / "first"
+        setup_logging(log_dir=first_dir)
+        get_logger("test").info("Before reconfigure")
+        
+        setup_logging(log_dir=tmp_path / "second")
+        
+        assert "Before reconfigure" in (first_dir / "wallpaper_agent.log").read_text()
@@ -1,10 +1,57 @@
 """
 Tests for MacOSWallpaperApplier.
 """
+import subprocess
+import sys
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
-from pathlib import Path
-from agents.wallpaper_application.macos_applier import MacOSWallpaperApplier
+from agents.wallpaper_application.macos_applier import MacOSWallpaperApplier, _OsascriptSession
+from tests._helpers import WALLPAPER_PATH
+
+
+# Stand-in for `osascript -i`: echoes string literals and set files, answers
+# the desktop count, and runs the try block's error handler for scripts
+# mentioning a missing file
+FAKE_OSASCRIPT = """
+import sys
+failing = False
+for line in sys.stdin:
+    line = line.strip()
+    if line == 'try':
+        failing = False
+    elif line.startswith('"ERR:"'):
+        if failing:
+            print('>> => "ERR:File not found. (-43)"', flush=True)
+    elif line.startswith('"'):
+        print('>> => ' + line, flush=True)
+    elif 'count of desktops' in line:
+        print('>> => 3', flush=True)
+    elif 'missing' in line:
+        failing = True
+    elif 'POSIX file' in line:
+        print('>> => file ' + line.split('POSIX file ')[1], flush=True)
+"""
+
+
+@pytest.fixture
+def fake_osascript_session(monkeypatch):
+    """Launch FAKE_OSASCRIPT in place of `osascript -i`; yields launched argv lists."""
+    real_popen = subprocess.Popen
+    launches = []
+    
+    def fake_popen(args, **kwargs):
+        launches.append(args)
+        return real_popen([sys.executable, '-c', FAKE_OSASCRIPT], **kwargs)
+    
+    monkeypatch.setattr('agents.wallpaper_application.macos_applier.subprocess.Popen', fake_popen)
+    return launches
+
+
+@pytest.fixture(autouse=True)
+def no_appkit(monkeypatch):
+    """Keep applier tests on the osascript path even where PyObjC is installed."""
+    monkeypatch.setattr('agents.wallpaper_application.macos_applier._load_appkit', lambda: None)
 
 
 class TestMacOSWallpaperApplier:
@@ -24,7 +71,7 @@ class TestMacOSWallpaperApplier:
         # Mock get_desktop_count to avoid extra subprocess call
         with patch.object(applier, 'get_desktop_count', return_value=1):
             success, error = applier.apply_wallpaper(
-                file_path=Path("/tmp/wallpaper.png"),
+                file_path=WALLPAPER_PATH,
                 desktop_index=0,
             )
             
@@ -40,7 +87,7 @@ class TestMacOSWallpaperApplier:
         
         applier = MacOSWallpaperApplier()
         success, error = applier.apply_wallpaper(
-            file_path=Path("/tmp/wallpaper.png"),
+            file_path=WALLPAPER_PATH,
             desktop_index=0,
         )
         
@@ -57,7 +104,7 @@ class TestMacOSWallpaperApplier:
         # Mock get_desktop_count to avoid extra subprocess call
         with patch.object(applier, 'get_desktop_count', return_value=1):
             success, error = applier.apply_wallpaper(
-                file_path=Path("/tmp/wallpaper.png"),
+                file_path=WALLPAPER_PATH,
                 desktop_index=0,
             )
             
@@ -72,14 +119,14 @@ class TestMacOSWallpaperApplier:
         applier = MacOSWallpaperApplier()
         with patch.object(applier, 'get_desktop_count', return_value=1):
             success, error = applier.apply_wallpaper(
-                file_path=Path("/tmp/wallpaper.png"),
+                file_path=WALLPAPER_PATH,
                 desktop_index=0,
             )
             
             assert success is True
             # Should use Finder method for single desktop
             call_args = mock_run.call_args[0][0]
-            assert 'Finder' in ' '.join(call_args)
+            assert any('Finder' in arg for arg in call_args)
     
     @patch('agents.wallpaper_application.macos_applier.subprocess.run')
     def test_apply_wallpaper_second_desktop(self, mock_run):
@@ -89,14 +136,14 @@ class TestMacOSWallpaperApplier:
         applier = MacOSWallpaperApplier()
         with patch.object(applier, 'get_desktop_count', return_value=2):
             success, error = applier.apply_wallpaper(
-                file_path=Path("/tmp/wallpaper.png"),
+                file_path=WALLPAPER_PATH,
                 desktop_index=1,  # Second desktop
             )
             
             assert success is True
             # Should use System Events method for specific desktop
             call_args = mock_run.call_args[0][0]
-            assert 'System Events' in ' '.join(call_args) or 'desktop 2' in ' '.join(call_args)
+            assert any('System Events' in arg or 'desktop 2' in arg for arg in call_args)
     
     @patch('agents.wallpaper_application.macos_applier.subprocess.run')
     def test_get_desktop_count(self, mock_run):
@@ -109,6 +156,33 @@ class TestMacOSWallpaperApplier:
         assert count == 2
         mock_run.assert_called_once()
     
+    @patch('agents.wallpaper_application.macos_applier.subprocess.run')
+    def test_get_desktop_count_cached(self, mock_run):
+        """Test that desktop count is queried once until invalidated."""
+        mock_run.return_value = Mock(returncode=0, stdout='2\n')
+        
+        applier = MacOSWallpaperApplier()
+        assert applier.get_desktop_count() == 2
+        assert applier.get_desktop_count() == 2
+        mock_run.assert_called_once()
+        
+        mock_run.return_value = Mock(returncode=0, stdout='3\n')
+        applier.invalidate_desktop_count()
+        
+        assert applier.get_desktop_count() == 3
+        assert mock_run.call_count == 2
+    
+    @patch('agents.wallpaper_application.macos_applier.subprocess.run')
+    def test_get_desktop_count_error_not_cached(self, mock_run):
+        """Test that a failed query is retried on the next call."""
+        mock_run.return_value = Mock(returncode=1)
+        
+        applier = MacOSWallpaperApplier()
+        applier.get_desktop_count()
+        applier.get_desktop_count()
+        
+        assert mock_run.call_count == 2
+    
     @patch('agents.wallpaper_application.macos_applier.subprocess.run')
     def test_get_desktop_count_error(self, mock_run):
         """Test handling of desktop count error."""
@@ -130,4 +204,92 @@ class TestMacOSWallpaperApplier:
         
         # Should default to 1 on ValueError
         assert count == 1
-
+    
+    def test_persistent_session_reuses_process(self, fake_osascript_session, tmp_path):
+        """Test that persistent mode runs every script through one osascript process."""
+        applier = MacOSWallpaperApplier(persistent=True)
+        try:
+            assert applier.get_desktop_count() == 3
+            assert applier.apply_wallpaper(tmp_path / "wallpaper.png", desktop_index=1) == (True, None)
+            assert applier.apply_wallpaper(tmp_path / "wallpaper.png", desktop_index=0) == (True, None)
+        finally:
+            applier.close()
+        
+        assert fake_osascript_session == [['osascript', '-i']]
+    
+    def test_persistent_session_reports_errors(self, fake_osascript_session, tmp_path):
+        """Test that script errors from the persistent session fail the application."""
+        applier = MacOSWallpaperApplier(persistent=True)
+        try:
+            success, error = applier.apply_wallpaper(tmp_path / "missing.png", desktop_index=0)
+        finally:
+            applier.close()
+        
+        assert success is False
+        assert error == 'File not found. (-43)'
+    
+    def test_persistent_session_ignores_error_in_path(self, fake_osascript_session, tmp_path):
+        """Test that output mentioning 'error' is not mistaken for a failure."""
+        applier = MacOSWallpaperApplier(persistent=True)
+        try:
+            assert applier.apply_wallpaper(tmp_path / "terror.png", desktop_index=0) == (True, None)
+        finally:
+            applier.close()
+    
+    def test_persistent_session_strips_only_prompts(self):
+        """Test that leading '=' or '!' in real output survives prompt stripping."""
+        assert _OsascriptSession._strip_prompts('>> >> => =!value\n') == '=!value\n'
+    
+    @pytest.fixture
+    def fake_appkit(self):
+        """Minimal stand-in for the PyObjC AppKit/Foundation classes."""
+        workspace = Mock()
+        workspace.setDesktopImageURL_forScreen_options_error_.return_value = (True, None)
+        return SimpleNamespace(
+            NSURL=Mock(fileURLWithPath_=lambda path: f"file://{path}"),
+            NSScreen=Mock(mainScreen=Mock(return_value="main-screen")),
+            NSWorkspace=Mock(sharedWorkspace=Mock(return_value=workspace)),
+            workspace=workspace,
+        )
+    
+    @patch('agents.wallpaper_application.macos_applier.subprocess.run')
+    def test_apply_wallpaper_uses_nsworkspace(self, mock_run, fake_appkit, monkeypatch):
+        """Test that the current desktop is set through NSWorkspace when PyObjC is available."""
+        monkeypatch.setattr('agents.wallpaper_application.macos_applier._load_appkit', lambda: fake_appkit)
+        applier = MacOSWallpaperApplier()
+        file_path = WALLPAPER_PATH
+        
+        with patch.object(applier, 'get_desktop_count', return_value=1):
+            success, error = applier.apply_wallpaper(file_path, desktop_index=0)
+        
+        assert (success, error) == (True, None)
+        fake_appkit.workspace.setDesktopImageURL_forScreen_options_error_.assert_called_once_with(
+            "file:///tmp/wallpaper.png", "main-screen", {}, None
+        )
+        mock_run.assert_not_called()
+    
+    @patch('agents.wallpaper_application.macos_applier.subprocess.run')
+    def test_apply_wallpaper_nsworkspace_error(self, mock_run, fake_appkit, monkeypatch):
+        """Test that NSWorkspace errors are reported as failures."""
+        monkeypatch.setattr('agents.wallpaper_application.macos_applier._load_appkit', lambda: fake_appkit)
+        fake_appkit.workspace.setDesktopImageURL_forScreen_options_error_.return_value = (False, "denied")
+        applier = MacOSWallpaperApplier()
+        
+        with patch.object(applier, 'get_desktop_count', return_value=1):
+            success, error = applier.apply_wallpaper(WALLPAPER_PATH, desktop_index=0)
+        
+        assert (success, error) == (False, "denied")
+    
+    @patch('agents.wallpaper_application.macos_applier.subprocess.run')
+    def test_apply_wallpaper_specific_desktop_skips_nsworkspace(self, mock_run, fake_appkit, monkeypatch):
+        """Test that targeting another Space still goes through System Events."""
+        monkeypatch.setattr('agents.wallpaper_application.macos_applier._load_appkit', lambda: fake_appkit)
+        mock_run.return_value = Mock(returncode=0)
+        applier = MacOSWallpaperApplier()
+        
+        with patch.object(applier, 'get_desktop_count', return_value=2):
+            success, _ = applier.apply_wallpaper(WALLPAPER_PATH, desktop_index=1)
+        
+        assert success is True
+        assert 'System Events' in mock_run.call_args[0][0][2]
+        fake_appkit.workspace.setDesktopImageURL_forScreen_options_error_.assert_not_called()
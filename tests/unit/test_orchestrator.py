@@ -1,71 +1,94 @@
 """
 Tests for Main Orchestrator.
 """
+import re
 import pytest
-from unittest.mock import Mock, MagicMock, patch
-from pathlib import Path
+from unittest.mock import Mock
+from src.orchestrator import main as orchestrator_main
 from src.orchestrator.main import WallpaperOrchestrator
 from src.orchestrator.domain import OrchestrationResult, OrchestrationStatus
+from src.agents.wallpaper_generation.domain import WallpaperResult
+from src.agents.wallpaper_application.domain import ApplicationResult
+from tests._helpers import WALLPAPER_PATH
 
 
+# Keywords expected in the error message when a stage fails
+DISCOVERY_ERROR_RE = re.compile(r"discovery|theme|no themes", re.IGNORECASE)
+SELECTION_ERROR_RE = re.compile(r"selection|theme|failed to select", re.IGNORECASE)
+GENERATION_ERROR_RE = re.compile(r"generation|wallpaper", re.IGNORECASE)
+APPLICATION_ERROR_RE = re.compile(r"application|wallpaper", re.IGNORECASE)
+
+# Retry backoff never needs to wait in these tests
+pytestmark = pytest.mark.usefixtures("no_sleep")
+
+
+def _set_successful_stages(agents, themes, selected_theme):
+    """Configure discovery and selection; later stages succeed by default."""
+    agents.disc.discover_themes.return_value = themes
+    agents.sel.select_theme.return_value = selected_theme
+
+
+def _set_stage_failure(agents, fail_stage):
+    """Make one agent stage return its unsuccessful result."""
+    if fail_stage == "disc":
+        agents.disc.discover_themes.return_value = []
+    elif fail_stage == "sel":
+        agents.sel.select_theme.return_value = None
+    elif fail_stage == "gen":
+        agents.gen.generate_wallpaper.return_value = WallpaperResult(
+            success=False,
+            error="Generation failed",
+        )
+    elif fail_stage == "app":
+        agents.app.apply_wallpaper.return_value = ApplicationResult(
+            success=False,
+            error="Application failed",
+        )
+
+
+@pytest.mark.timeout(0.5, func_only=True)
 class TestWallpaperOrchestrator:
     """Test Main Orchestrator."""
     
-    def test_orchestrator_initialization(self):
+    def test_orchestrator_initialization(self, default_orchestrator):
         """Test orchestrator initialization."""
-        orchestrator = WallpaperOrchestrator()
+        orchestrator = default_orchestrator
         assert orchestrator is not None
         assert hasattr(orchestrator, 'theme_discovery_agent')
         assert hasattr(orchestrator, 'theme_selection_agent')
         assert hasattr(orchestrator, 'wallpaper_generation_agent')
         assert hasattr(orchestrator, 'wallpaper_application_agent')
     
-    @patch('src.orchestrator.main.ThemeDiscoveryAgent')
-    @patch('src.orchestrator.main.ThemeSelectionAgent')
-    @patch('src.orchestrator.main.WallpaperGenerationAgent')
-    @patch('src.orchestrator.main.WallpaperApplicationAgent')
-    def test_run_full_workflow_success(
-        self,
-        mock_app_agent,
-        mock_gen_agent,
-        mock_sel_agent,
-        mock_disc_agent,
-    ):
+    def test_orchestrator_shares_clients_across_agents(self, agents, mocker):
+        """Test that agents receive the same LLM client and HTTP session."""
+        mock_llm_class = mocker.patch('src.orchestrator.main.LLMClient')
+        config = Mock()
+        
+        with WallpaperOrchestrator(config=config) as orchestrator:
+            shared_llm = mock_llm_class.from_config.return_value
+            assert orchestrator_main.ThemeDiscoveryAgent.call_args.kwargs["llm_client"] is shared_llm
+            assert orchestrator_main.ThemeSelectionAgent.call_args.kwargs["llm_client"] is shared_llm
+            
+            image_client = orchestrator_main.WallpaperGenerationAgent.call_args.kwargs["image_client"]
+            assert image_client.session is orchestrator.http_session
+        
+        mock_llm_class.from_config.assert_called_once_with(config)
+    
+    def test_run_full_workflow_success(self, agents, diwali_theme):
         """Test successful full workflow execution."""
         # Setup mocks
         mock_disc_result = [
             {"name": "Diwali", "description": "Festival of lights", "type": "indian_cultural"},
             {"name": "New Year", "description": "Global celebration", "type": "global"},
         ]
-        mock_disc_agent.return_value.discover_themes.return_value = mock_disc_result
+        agents.disc.discover_themes.return_value = mock_disc_result
         
         # select_theme returns a dict, not a Theme object
-        mock_sel_theme = {
-            "name": "Diwali",
-            "description": "Festival of lights",
-            "type": "indian_cultural",
-            "final_score": 0.95,
-            "style_guidelines": {"prompt": "minimalistic dark diwali theme"},
-        }
-        mock_sel_agent.return_value.select_theme.return_value = mock_sel_theme
-        
-        from src.agents.wallpaper_generation.domain import WallpaperResult
-        mock_wallpaper_result = WallpaperResult(
-            success=True,
-            file_path=Path("/tmp/wallpaper.png"),
-        )
-        mock_gen_agent.return_value.generate_wallpaper.return_value = mock_wallpaper_result
-        
-        from src.agents.wallpaper_application.domain import ApplicationResult
-        mock_app_result = ApplicationResult(
-            success=True,
-            desktop_index=0,
-        )
-        mock_app_agent.return_value.apply_wallpaper.return_value = mock_app_result
+        agents.sel.select_theme.return_value = diwali_theme
         
         # Run orchestrator
-        orchestrator = WallpaperOrchestrator()
-        result = orchestrator.run()
+        with WallpaperOrchestrator() as orchestrator:
+            result = orchestrator.run()
         
         # Verify result
         assert result is not None
@@ -75,196 +98,63 @@ class TestWallpaperOrchestrator:
         assert result.error is None
         
         # Verify all agents were called
-        mock_disc_agent.return_value.discover_themes.assert_called_once()
-        mock_sel_agent.return_value.select_theme.assert_called_once()
-        mock_gen_agent.return_value.generate_wallpaper.assert_called_once()
-        mock_app_agent.return_value.apply_wallpaper.assert_called_once()
+        agents.disc.discover_themes.assert_called_once()
+        agents.sel.select_theme.assert_called_once()
+        agents.gen.generate_wallpaper.assert_called_once()
+        agents.app.apply_wallpaper.assert_called_once()
     
-    @patch('src.orchestrator.main.ThemeDiscoveryAgent')
-    def test_run_theme_discovery_failure(self, mock_disc_agent):
-        """Test handling of theme discovery failure."""
-        # Mock discovery failure
-        mock_disc_agent.return_value.discover_themes.return_value = []
-        
-        orchestrator = WallpaperOrchestrator()
-        result = orchestrator.run()
-        
-        assert result.status.value == "failed"
-        assert result.error is not None
-        assert "discovery" in result.error.lower() or "theme" in result.error.lower() or "no themes" in result.error.lower()
-        assert result.selected_theme is None
-    
-    @patch('src.orchestrator.main.ThemeDiscoveryAgent')
-    @patch('src.orchestrator.main.ThemeSelectionAgent')
-    def test_run_theme_selection_failure(
+    @pytest.mark.parametrize(
+        "fail_stage, expected_status, error_re",
+        [
+            ("disc", "failed", DISCOVERY_ERROR_RE),
+            ("sel", "failed", SELECTION_ERROR_RE),
+            ("gen", "failed", GENERATION_ERROR_RE),
+            # Wallpaper generated but not applied
+            ("app", "partial", APPLICATION_ERROR_RE),
+        ],
+    )
+    def test_run_stage_failure(
         self,
-        mock_sel_agent,
-        mock_disc_agent,
+        agents,
+        diwali_discovery,
+        diwali_theme,
+        fail_stage,
+        expected_status,
+        error_re,
     ):
-        """Test handling of theme selection failure."""
-        # Mock discovery success
-        mock_disc_result = [
-            {"name": "Diwali", "description": "Festival of lights", "type": "indian_cultural"},
-        ]
-        mock_disc_agent.return_value.discover_themes.return_value = mock_disc_result
+        """Test handling of a stage returning an unsuccessful result."""
+        _set_successful_stages(agents, diwali_discovery, diwali_theme)
+        _set_stage_failure(agents, fail_stage)
         
-        # Mock selection failure
-        mock_sel_agent.return_value.select_theme.return_value = None
+        with WallpaperOrchestrator() as orchestrator:
+            result = orchestrator.run()
         
-        orchestrator = WallpaperOrchestrator()
-        result = orchestrator.run()
-        
-        assert result.status.value == "failed"
+        assert result.status.value == expected_status
         assert result.error is not None
-        assert "selection" in result.error.lower() or "theme" in result.error.lower() or "failed to select" in result.error.lower()
+        assert error_re.search(result.error)
+        if fail_stage == "disc":
+            assert result.selected_theme is None
+        if fail_stage == "app":
+            # Wallpaper should still be generated even if application fails
+            assert result.wallpaper_path is not None
     
-    @patch('src.orchestrator.main.ThemeDiscoveryAgent')
-    @patch('src.orchestrator.main.ThemeSelectionAgent')
-    @patch('src.orchestrator.main.WallpaperGenerationAgent')
-    def test_run_wallpaper_generation_failure(
-        self,
-        mock_gen_agent,
-        mock_sel_agent,
-        mock_disc_agent,
-    ):
-        """Test handling of wallpaper generation failure."""
-        # Mock discovery and selection success
-        mock_disc_result = [
-            {"name": "Diwali", "description": "Festival of lights", "type": "indian_cultural"},
-        ]
-        mock_disc_agent.return_value.discover_themes.return_value = mock_disc_result
-        
-        # select_theme returns a dict
-        mock_sel_theme = {
-            "name": "Diwali",
-            "description": "Festival of lights",
-            "type": "indian_cultural",
-            "final_score": 0.95,
-        }
-        mock_sel_agent.return_value.select_theme.return_value = mock_sel_theme
-        
-        # Mock generation failure
-        from src.agents.wallpaper_generation.domain import WallpaperResult
-        mock_wallpaper_result = WallpaperResult(
-            success=False,
-            error="Generation failed",
-        )
-        mock_gen_agent.return_value.generate_wallpaper.return_value = mock_wallpaper_result
-        
-        orchestrator = WallpaperOrchestrator()
-        result = orchestrator.run()
-        
-        assert result.status.value == "failed"
-        assert result.error is not None
-        assert "generation" in result.error.lower() or "wallpaper" in result.error.lower()
-    
-    @patch('src.orchestrator.main.ThemeDiscoveryAgent')
-    @patch('src.orchestrator.main.ThemeSelectionAgent')
-    @patch('src.orchestrator.main.WallpaperGenerationAgent')
-    @patch('src.orchestrator.main.WallpaperApplicationAgent')
-    def test_run_wallpaper_application_failure(
-        self,
-        mock_app_agent,
-        mock_gen_agent,
-        mock_sel_agent,
-        mock_disc_agent,
-    ):
-        """Test handling of wallpaper application failure."""
-        # Mock discovery, selection, and generation success
-        mock_disc_result = [
-            {"name": "Diwali", "description": "Festival of lights", "type": "indian_cultural"},
-        ]
-        mock_disc_agent.return_value.discover_themes.return_value = mock_disc_result
-        
-        # select_theme returns a dict
-        mock_sel_theme = {
-            "name": "Diwali",
-            "description": "Festival of lights",
-            "type": "indian_cultural",
-            "final_score": 0.95,
-        }
-        mock_sel_agent.return_value.select_theme.return_value = mock_sel_theme
-        
-        from src.agents.wallpaper_generation.domain import WallpaperResult
-        mock_wallpaper_result = WallpaperResult(
-            success=True,
-            file_path=Path("/tmp/wallpaper.png"),
-        )
-        mock_gen_agent.return_value.generate_wallpaper.return_value = mock_wallpaper_result
-        
-        # Mock application failure
-        from src.agents.wallpaper_application.domain import ApplicationResult
-        mock_app_result = ApplicationResult(
-            success=False,
-            error="Application failed",
-        )
-        mock_app_agent.return_value.apply_wallpaper.return_value = mock_app_result
-        
-        orchestrator = WallpaperOrchestrator()
-        result = orchestrator.run()
-        
-        # Application failure should result in PARTIAL status (wallpaper generated but not applied)
-        assert result.status.value == "partial"
-        assert result.error is not None
-        assert "application" in result.error.lower() or "wallpaper" in result.error.lower()
-        # Wallpaper should still be generated even if application fails
-        assert result.wallpaper_path is not None
-    
-    @patch('src.orchestrator.main.ThemeDiscoveryAgent')
-    @patch('src.orchestrator.main.ThemeSelectionAgent')
-    @patch('src.orchestrator.main.WallpaperGenerationAgent')
-    @patch('src.orchestrator.main.WallpaperApplicationAgent')
-    @patch('src.orchestrator.main.get_logger')
-    def test_run_logging(
-        self,
-        mock_logger,
-        mock_app_agent,
-        mock_gen_agent,
-        mock_sel_agent,
-        mock_disc_agent,
-    ):
+    def test_run_logging(self, agents, orchestrator_logger, diwali_discovery, diwali_theme):
         """Test that orchestrator logs workflow steps."""
-        # Setup successful workflow
-        mock_disc_result = [
-            {"name": "Diwali", "description": "Festival of lights", "type": "indian_cultural"},
-        ]
-        mock_disc_agent.return_value.discover_themes.return_value = mock_disc_result
-        
-        # select_theme returns a dict
-        mock_sel_theme = {
-            "name": "Diwali",
-            "description": "Festival of lights",
-            "type": "indian_cultural",
-            "final_score": 0.95,
-        }
-        mock_sel_agent.return_value.select_theme.return_value = mock_sel_theme
-        
-        from src.agents.wallpaper_generation.domain import WallpaperResult
-        mock_wallpaper_result = WallpaperResult(
-            success=True,
-            file_path=Path("/tmp/wallpaper.png"),
-        )
-        mock_gen_agent.return_value.generate_wallpaper.return_value = mock_wallpaper_result
+        _set_successful_stages(agents, diwali_discovery, diwali_theme)
+        orchestrator_logger.reset_mock()
         
-        from src.agents.wallpaper_application.domain import ApplicationResult
-        mock_app_result = ApplicationResult(success=True)
-        mock_app_agent.return_value.apply_wallpaper.return_value = mock_app_result
-        
-        mock_log = MagicMock()
-        mock_logger.return_value = mock_log
-        
-        orchestrator = WallpaperOrchestrator()
-        result = orchestrator.run()
+        with WallpaperOrchestrator() as orchestrator:
+            result = orchestrator.run()
         
         # Verify logging was called
-        assert mock_log.info.called or mock_log.debug.called
+        assert orchestrator_logger.info.called or orchestrator_logger.debug.called
     
     def test_orchestrator_result_to_dict(self):
         """Test converting orchestrator result to dictionary."""
         result = OrchestrationResult(
             status=OrchestrationStatus.SUCCESS,
             selected_theme={"name": "Diwali"},
-            wallpaper_path=Path("/tmp/wallpaper.png"),
+            wallpaper_path=WALLPAPER_PATH,
         )
         
         result_dict = result.to_dict()
@@ -272,10 +162,3 @@ class TestWallpaperOrchestrator:
         assert isinstance(result_dict, dict)
         assert result_dict["status"] == "success"
         assert result_dict["wallpaper_path"] == "/tmp/wallpaper.png"
-    
-    def test_orchestration_status_enum(self):
-        """Test OrchestrationStatus enum values."""
-        assert OrchestrationStatus.SUCCESS.value == "success"
-        assert OrchestrationStatus.FAILED.value == "failed"
-        assert OrchestrationStatus.PARTIAL.value == "partial"
-
@@ -0,0 +1,111 @@
+"""
+Tests for Orchestrator checkpointing and run resumption.
+"""
+import os
+import time
+import pytest
+from src.orchestrator.main import CHECKPOINT_TTL_SECONDS, WallpaperOrchestrator
+from src.agents.wallpaper_generation.domain import WallpaperResult
+from src.agents.wallpaper_application.domain import ApplicationResult
+
+
+@pytest.fixture
+def wallpaper_path(tmp_path):
+    """Generated wallpaper file; checkpoints are only reused while it exists."""
+    path = tmp_path / "wallpaper.png"
+    path.write_bytes(b"png")
+    return path
+
+
+@pytest.fixture
+def checkpointed_agents(agents, diwali_discovery, diwali_theme, wallpaper_path):
+    """
+    Agents whose first three stages succeed and whose application fails.
+
+    A failing application leaves the run partial, so every run re-enters the
+    pipeline and has to decide which checkpoints to reuse.
+    """
+    agents.disc.discover_themes.return_value = diwali_discovery
+    agents.sel.select_theme.return_value = diwali_theme
+    agents.gen.generate_wallpaper.return_value = WallpaperResult(
+        success=True,
+        file_path=wallpaper_path,
+    )
+    agents.app.apply_wallpaper.return_value = ApplicationResult(
+        success=False,
+        error="Application failed",
+    )
+    return agents
+
+
+def _run(tmp_path, run_id="abc"):
+    """Run a single-attempt orchestrator with checkpoints under ``tmp_path``."""
+    with WallpaperOrchestrator(
+        max_retries=1,
+        run_id=run_id,
+        checkpoint_dir=tmp_path / "cache",
+    ) as orchestrator:
+        return orchestrator, orchestrator.run()
+
+
+class TestOrchestratorCheckpointing:
+    """Test resumable runs via on-disk checkpoints."""
+    
+    def test_checkpoints_written_for_completed_steps(self, checkpointed_agents, tmp_path):
+        """Test that each completed step is checkpointed under the run directory."""
+        orchestrator, _ = _run(tmp_path)
+        
+        run_dir = tmp_path / "cache" / "run_abc"
+        assert orchestrator.run_dir == run_dir
+        assert (run_dir / "1_themes.json").exists()
+        assert (run_dir / "2_selected_theme.json").exists()
+        assert (run_dir / "3_wallpaper.json").exists()
+    
+    def test_resume_skips_completed_steps(self, checkpointed_agents, diwali_theme, wallpaper_path, tmp_path):
+        """Test that re-running the same run only repeats unfinished steps."""
+        _run(tmp_path)
+        _, result = _run(tmp_path)
+        
+        assert result.status.value == "partial"
+        assert result.wallpaper_path == wallpaper_path
+        assert result.selected_theme == diwali_theme
+        checkpointed_agents.disc.discover_themes.assert_called_once()
+        checkpointed_agents.sel.select_theme.assert_called_once()
+        checkpointed_agents.gen.generate_wallpaper.assert_called_once()
+        assert checkpointed_agents.app.apply_wallpaper.call_count == 2
+    
+    def test_wallpaper_regenerated_when_file_missing(self, checkpointed_agents, wallpaper_path, tmp_path):
+        """Test that a wallpaper checkpoint is ignored if its file was deleted."""
+        _run(tmp_path)
+        wallpaper_path.unlink()
+        _run(tmp_path)
+        
+        checkpointed_agents.disc.discover_themes.assert_called_once()
+        assert checkpointed_agents.gen.generate_wallpaper.call_count == 2
+    
+    def test_rerun_step_discards_downstream_checkpoints(self, checkpointed_agents, tmp_path):
+        """Test that an expired selection also invalidates the wallpaper built from it."""
+        _run(tmp_path)
+        selection_checkpoint = tmp_path / "cache" / "run_abc" / "2_selected_theme.json"
+        expired = time.time() - CHECKPOINT_TTL_SECONDS - 60
+        os.utime(selection_checkpoint, (expired, expired))
+        _run(tmp_path)
+        
+        checkpointed_agents.disc.discover_themes.assert_called_once()
+        assert checkpointed_agents.sel.select_theme.call_count == 2
+        assert checkpointed_agents.gen.generate_wallpaper.call_count == 2
+    
+    def test_no_checkpoints_without_run_id(self, checkpointed_agents, tmp_path):
+        """Test that checkpointing is disabled for anonymous runs."""
+        orchestrator, _ = _run(tmp_path, run_id=None)
+        
+        assert orchestrator.run_dir is None
+        assert not (tmp_path / "cache").exists()
+    
+    def test_run_id_not_read_from_environment(self, agents, tmp_path, monkeypatch):
+        """Test that checkpointing is only enabled through the constructor."""
+        monkeypatch.setenv("WALLPAPER_RUN_ID", "weekly")
+        
+        with WallpaperOrchestrator(checkpoint_dir=tmp_path) as orchestrator:
+            assert orchestrator.run_id is None
+            assert orchestrator.run_dir is None
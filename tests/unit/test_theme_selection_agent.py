@@ -2,7 +2,7 @@
 Tests for Theme Selection Agent.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, patch
 from agents.theme_selection.agent import ThemeSelectionAgent
 from agents.theme_selection.domain import Theme
 from agents.theme_selection.ranker import ThemeRanker
@@ -12,14 +12,31 @@ from agents.theme_selection.stages import (
     NormalizationStage,
     FinalSortStage,
 )
+from tests._helpers import FakeLLM
+
+
+@pytest.fixture(scope="module", autouse=True)
+def llm_client_class(base_selection_agent):
+    """
+    Patch config loading and LLM client creation once for the module.
+
+    Agents built in these tests reuse the session agent's Config instead of
+    re-reading the environment, and get the mock client returned by
+    ``LLMClient.from_config``.
+    """
+    with (
+        patch('agents.theme_selection.agent.load_config', return_value=base_selection_agent.config),
+        patch('agents.theme_selection.agent.LLMClient') as llm_client_class,
+    ):
+        yield llm_client_class
 
 
 class TestThemeSelectionAgent:
     """Test Theme Selection Agent."""
     
-    def test_agent_initialization(self):
+    def test_agent_initialization(self, selection_agent):
         """Test agent initialization."""
-        agent = ThemeSelectionAgent()
+        agent = selection_agent
         
         assert agent is not None
         assert agent.ranker is not None
@@ -31,31 +48,24 @@ class TestThemeSelectionAgent:
         
         assert agent.ranker == custom_ranker
     
-    @patch('agents.theme_selection.agent.load_config')
-    @patch('agents.theme_selection.agent.get_llm_config')
-    def test_agent_initialization_with_llm(self, mock_llm_config, mock_config):
+    def test_agent_initialization_with_llm(self, llm_client_class):
         """Test agent initialization with LLM client."""
-        mock_config.return_value = Mock()
-        mock_llm_config.return_value = {
-            "provider": "anthropic",
-            "anthropic_api_key": "test_key",
-        }
+        agent = ThemeSelectionAgent()
         
-        with patch('agents.theme_selection.agent.LLMClient') as mock_llm_class:
-            agent = ThemeSelectionAgent()
-            # LLM client should be initialized if API key is available
-            # (actual initialization depends on config)
+        # LLM client is created from the agent's config
+        assert agent.llm_client is llm_client_class.from_config.return_value
+        llm_client_class.from_config.assert_called_with(agent.config)
     
-    def test_select_theme_empty_list(self):
+    def test_select_theme_empty_list(self, selection_agent):
         """Test selecting theme from empty list."""
-        agent = ThemeSelectionAgent()
+        agent = selection_agent
         result = agent.select_theme([])
         
         assert result is None
     
-    def test_select_theme_single_theme(self):
+    def test_select_theme_single_theme(self, selection_agent):
         """Test selecting theme from single theme."""
-        agent = ThemeSelectionAgent()
+        agent = selection_agent
         themes = [
             {
                 "name": "Diwali",
@@ -71,9 +81,9 @@ class TestThemeSelectionAgent:
         assert result["name"] == "Diwali"
         assert "style_guidelines" in result
     
-    def test_select_theme_multiple_themes(self):
+    def test_select_theme_multiple_themes(self, selection_agent):
         """Test selecting best theme from multiple themes."""
-        agent = ThemeSelectionAgent()
+        agent = selection_agent
         themes = [
             {
                 "name": "Global Theme",
@@ -96,9 +106,9 @@ class TestThemeSelectionAgent:
         assert result["name"] == "Diwali"
         assert result["type"] == "indian_cultural"
     
-    def test_select_theme_includes_scores(self):
+    def test_select_theme_includes_scores(self, selection_agent):
         """Test that selected theme includes scoring information."""
-        agent = ThemeSelectionAgent()
+        agent = selection_agent
         themes = [
             {
                 "name": "Test Theme",
@@ -114,9 +124,9 @@ class TestThemeSelectionAgent:
         assert "base_score" in result
         assert "llm_score" in result
     
-    def test_select_theme_style_guidelines(self):
+    def test_select_theme_style_guidelines(self, selection_agent):
         """Test that selected theme includes style guidelines."""
-        agent = ThemeSelectionAgent()
+        agent = selection_agent
         themes = [
             {
                 "name": "Test Theme",
@@ -135,12 +145,9 @@ class TestThemeSelectionAgent:
         assert "style_description" in guidelines
         assert "prompt" in guidelines
     
-    @patch('agents.theme_selection.agent.LLMClient')
-    def test_select_theme_with_llm_style_generation(self, mock_llm_class):
+    def test_select_theme_with_llm_style_generation(self):
         """Test theme selection with LLM style generation."""
-        mock_llm = MagicMock()
-        mock_llm.generate_text.return_value = '{"color_palette": ["#000000"], "key_elements": ["test"], "style_description": "dark", "prompt": "test prompt"}'
-        mock_llm_class.return_value = mock_llm
+        mock_llm = FakeLLM(response='{"color_palette": ["#000000"], "key_elements": ["test"], "style_description": "dark", "prompt": "test prompt"}')
         
         agent = ThemeSelectionAgent(llm_client=mock_llm)
         themes = [
@@ -155,7 +162,7 @@ class TestThemeSelectionAgent:
         result = agent.select_theme(themes)
         
         assert result is not None
-        assert "style_guidelines" in result
-        # LLM should be called for style generation
-        # (may be called multiple times for ranking and style)
+        assert result["style_guidelines"]["prompt"] == "test prompt"
+        # LLM is called for both ranking and style generation
+        assert mock_llm.call_count == 2
 
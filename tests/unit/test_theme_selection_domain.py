@@ -4,72 +4,59 @@ Tests for Theme Selection domain model.
 import pytest
 from agents.theme_selection.domain import Theme
 
+# Theme.to_dict() values for fields left at their defaults
+THEME_DEFAULTS = {
+    "name": "",
+    "description": "",
+    "type": "",
+    "source": "search",
+    "base_score": 0.0,
+    "llm_score": 0.0,
+    "final_score": 0.0,
+    "metadata": {},
+}
+
 
 class TestTheme:
     """Test Theme domain model."""
     
-    def test_theme_creation(self):
-        """Test creating a theme."""
-        theme = Theme(
-            name="Diwali",
-            description="Festival of Lights",
-            type="indian_cultural",
-        )
-        
-        assert theme.name == "Diwali"
-        assert theme.description == "Festival of Lights"
-        assert theme.type == "indian_cultural"
-        assert theme.base_score == 0.0
-        assert theme.llm_score == 0.0
-        assert theme.final_score == 0.0
-    
-    def test_theme_to_dict(self):
-        """Test converting theme to dictionary."""
-        theme = Theme(
-            name="Diwali",
-            description="Festival",
-            type="indian_cultural",
-            base_score=100.0,
-            llm_score=85.0,
-            final_score=90.0,
-        )
-        
-        data = theme.to_dict()
+    @pytest.mark.parametrize("data", [
+        {
+            "name": "Diwali",
+            "description": "Festival",
+            "type": "indian_cultural",
+            "base_score": 100.0,
+            "llm_score": 85.0,
+            "final_score": 90.0,
+        },
+        {"name": "Test"},
+    ], ids=["scored", "defaults"])
+    def test_theme_round_trip(self, data):
+        """Test construction, defaults and to_dict/from_dict round-trip."""
+        theme = Theme.from_dict(data)
         
-        assert data["name"] == "Diwali"
-        assert data["description"] == "Festival"
-        assert data["type"] == "indian_cultural"
-        assert data["base_score"] == 100.0
-        assert data["llm_score"] == 85.0
-        assert data["final_score"] == 90.0
+        assert theme == Theme(**data)
+        assert theme.to_dict() == {**THEME_DEFAULTS, **data}
+        assert Theme.from_dict(theme.to_dict()) == theme
     
-    def test_theme_from_dict(self):
-        """Test creating theme from dictionary."""
-        data = {
-            "name": "New Year",
-            "description": "Global celebration",
-            "type": "global",
-            "base_score": 40.0,
-            "llm_score": 90.0,
-            "final_score": 70.0,
-        }
-        
-        theme = Theme.from_dict(data)
+    def test_theme_uses_slots(self):
+        """Test that themes store fields in slots rather than a per-instance dict."""
+        theme = Theme(name="Diwali")
         
-        assert theme.name == "New Year"
-        assert theme.description == "Global celebration"
-        assert theme.type == "global"
-        assert theme.base_score == 40.0
-        assert theme.llm_score == 90.0
-        assert theme.final_score == 70.0
+        assert not hasattr(theme, "__dict__")
+        with pytest.raises(AttributeError):
+            theme.unknown_field = 1
     
-    def test_theme_defaults(self):
-        """Test theme default values."""
-        theme = Theme(name="Test")
+    def test_theme_build_batch(self):
+        """Test that batch-built themes match individually constructed ones."""
+        themes = Theme.build_batch(
+            ["Diwali", "New Year"],
+            ["indian_cultural", "global"],
+            ["Festival of Lights", ""],
+        )
         
-        assert theme.description == ""
-        assert theme.type == ""
-        assert theme.source == "search"
-        assert theme.base_score == 0.0
-        assert theme.metadata == {}
-
+        assert themes == [
+            Theme(name="Diwali", type="indian_cultural", description="Festival of Lights"),
+            Theme(name="New Year", type="global"),
+        ]
+        assert themes[0].metadata is not themes[1].metadata
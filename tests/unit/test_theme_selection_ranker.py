@@ -28,10 +28,7 @@ class TestThemeRanker:
         strategy = PipelineRankingStrategy(stages=stages)
         ranker = ThemeRanker(strategy)
         
-        themes = [
-            Theme(name="Theme 1", type="indian_cultural"),
-            Theme(name="Theme 2", type="global"),
-        ]
+        themes = Theme.build_batch(["Theme 1", "Theme 2"], ["indian_cultural", "global"])
         
         result = ranker.rank(themes)
         
@@ -1,8 +1,9 @@
 """
 Tests for theme ranking stages.
 """
+import copy
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock
 from agents.theme_selection.domain import Theme
 from agents.theme_selection.stages import (
     InitialScoringStage,
@@ -11,48 +12,48 @@ from agents.theme_selection.stages import (
     CombinedScoringStage,
     FinalSortStage,
 )
+from tests._helpers import FakeLLM
+
+# Template themes; stages mutate scores in place, so tests work on copies
+DIWALI = Theme(name="Diwali", type="indian_cultural")
+NEW_YEAR = Theme(name="New Year", type="global")
+ISRO_LAUNCH = Theme(name="ISRO Launch", type="indian_achievement")
+THEME_1 = Theme(name="Theme 1", type="indian_cultural")
+THEME_2 = Theme(name="Theme 2", type="global")
+THEME_3 = Theme(name="Theme 3")
+
+
+def _copy(template, **scores):
+    """Shallow-copy a template theme and set the given score fields."""
+    theme = copy.copy(template)
+    for name, value in scores.items():
+        setattr(theme, name, value)
+    return theme
 
 
 class TestInitialScoringStage:
     """Test InitialScoringStage."""
     
-    def test_initial_scoring_indian_cultural(self):
-        """Test scoring Indian cultural themes."""
-        stage = InitialScoringStage(prefer_indian_culture=True)
-        themes = [
-            Theme(name="Diwali", type="indian_cultural"),
-            Theme(name="New Year", type="global"),
-        ]
-        
-        result = stage.apply(themes)
-        
-        assert result[0].base_score == 100.0 * 1.5  # 150.0
-        assert result[1].base_score == 40.0
-    
-    def test_initial_scoring_indian_achievement(self):
-        """Test scoring Indian achievement themes."""
-        stage = InitialScoringStage(prefer_indian_achievements=True)
-        themes = [
-            Theme(name="ISRO Launch", type="indian_achievement"),
-        ]
-        
-        result = stage.apply(themes)
-        
-        assert result[0].base_score == 80.0 * 1.3  # 104.0
-    
-    def test_initial_scoring_no_preferences(self):
-        """Test scoring without preferences."""
+    @pytest.mark.parametrize(
+        "template, prefer_culture, prefer_achievements, expected",
+        [
+            (DIWALI, True, True, 100.0 * 1.5),
+            (NEW_YEAR, True, True, 40.0),
+            (ISRO_LAUNCH, True, True, 80.0 * 1.3),
+            (DIWALI, False, False, 100.0),  # No multiplier
+        ],
+        ids=["indian_cultural", "global", "indian_achievement", "no_preferences"],
+    )
+    def test_initial_scoring(self, template, prefer_culture, prefer_achievements, expected):
+        """Test base score by theme type and preference flags."""
         stage = InitialScoringStage(
-            prefer_indian_culture=False,
-            prefer_indian_achievements=False,
+            prefer_indian_culture=prefer_culture,
+            prefer_indian_achievements=prefer_achievements,
         )
-        themes = [
-            Theme(name="Diwali", type="indian_cultural"),
-        ]
         
-        result = stage.apply(themes)
+        result = stage.apply([_copy(template)])
         
-        assert result[0].base_score == 100.0  # No multiplier
+        assert result[0].base_score == expected
 
 
 class TestLLMRankingStage:
@@ -60,25 +61,21 @@ class TestLLMRankingStage:
     
     def test_llm_ranking_with_client(self):
         """Test LLM ranking with LLM client."""
-        mock_llm = MagicMock()
-        mock_llm.generate_text.return_value = '{"0": 85, "1": 72}'
+        mock_llm = FakeLLM(response='{"0": 85, "1": 72}')
         
         stage = LLMRankingStage(llm_client=mock_llm)
-        themes = [
-            Theme(name="Theme 1", type="indian_cultural"),
-            Theme(name="Theme 2", type="global"),
-        ]
+        themes = [_copy(THEME_1), _copy(THEME_2)]
         
         result = stage.apply(themes)
         
         assert result[0].llm_score == 85.0
         assert result[1].llm_score == 72.0
-        mock_llm.generate_text.assert_called_once()
+        assert mock_llm.call_count == 1
     
     def test_llm_ranking_no_client(self):
         """Test LLM ranking without LLM client."""
         stage = LLMRankingStage(llm_client=None)
-        themes = [Theme(name="Theme 1", type="indian_cultural")]
+        themes = [_copy(THEME_1)]
         
         result = stage.apply(themes)
         
@@ -86,11 +83,10 @@ class TestLLMRankingStage:
     
     def test_llm_ranking_error_handling(self):
         """Test LLM ranking error handling."""
-        mock_llm = MagicMock()
-        mock_llm.generate_text.side_effect = Exception("API Error")
+        mock_llm = FakeLLM(exc=Exception("API Error"))
         
         stage = LLMRankingStage(llm_client=mock_llm)
-        themes = [Theme(name="Theme 1", type="indian_cultural")]
+        themes = [_copy(THEME_1)]
         
         result = stage.apply(themes)
         
@@ -98,91 +94,86 @@ class TestLLMRankingStage:
     
     def test_llm_ranking_empty_themes(self):
         """Test LLM ranking with empty themes list."""
-        mock_llm = MagicMock()
+        mock_llm = FakeLLM()
         stage = LLMRankingStage(llm_client=mock_llm)
         
         result = stage.apply([])
         
         assert result == []
-        mock_llm.generate_text.assert_not_called()
+        assert not mock_llm.called
 
 
 class TestNormalizationStage:
     """Test NormalizationStage."""
     
-    def test_normalization(self):
+    @pytest.mark.parametrize(
+        "scores, expected",
+        [
+            # Each score is divided by the maximum of its kind
+            ([(200.0, 100.0), (100.0, 50.0)], [(1.0, 1.0), (0.5, 0.5)]),
+            # All-zero scores are left as they are
+            ([(0.0, 0.0)], [(0.0, 0.0)]),
+        ],
+        ids=["scaled", "zero_scores"],
+    )
+    def test_normalization(self, scores, expected):
         """Test score normalization."""
         stage = NormalizationStage()
+        templates = (THEME_1, THEME_2)
         themes = [
-            Theme(name="Theme 1", base_score=200.0, llm_score=100.0),
-            Theme(name="Theme 2", base_score=100.0, llm_score=50.0),
-        ]
-        
-        result = stage.apply(themes)
-        
-        assert result[0].base_score == 1.0  # 200/200
-        assert result[0].llm_score == 1.0  # 100/100
-        assert result[1].base_score == 0.5  # 100/200
-        assert result[1].llm_score == 0.5  # 50/100
-    
-    def test_normalization_zero_scores(self):
-        """Test normalization with zero scores."""
-        stage = NormalizationStage()
-        themes = [
-            Theme(name="Theme 1", base_score=0.0, llm_score=0.0),
+            _copy(template, base_score=base, llm_score=llm)
+            for template, (base, llm) in zip(templates, scores)
         ]
         
         result = stage.apply(themes)
         
-        assert result[0].base_score == 0.0
-        assert result[0].llm_score == 0.0
+        assert [(t.base_score, t.llm_score) for t in result] == expected
 
 
 class TestCombinedScoringStage:
     """Test CombinedScoringStage."""
     
-    def test_combined_scoring(self):
+    @pytest.mark.parametrize(
+        "base_weight, llm_weight, llm_score, expected",
+        [
+            (0.4, 0.6, 0.8, 0.88),  # 1.0 * 0.4 + 0.8 * 0.6
+            (0.3, 0.7, 0.5, 0.65),  # 1.0 * 0.3 + 0.5 * 0.7
+        ],
+        ids=["default_weights", "custom_weights"],
+    )
+    def test_combined_scoring(self, base_weight, llm_weight, llm_score, expected):
         """Test combining base and LLM scores."""
-        stage = CombinedScoringStage(base_weight=0.4, llm_weight=0.6)
-        themes = [
-            Theme(name="Theme 1", base_score=1.0, llm_score=0.8),
-        ]
+        stage = CombinedScoringStage(base_weight=base_weight, llm_weight=llm_weight)
+        themes = [_copy(THEME_1, base_score=1.0, llm_score=llm_score)]
         
         result = stage.apply(themes)
         
-        # 1.0 * 0.4 + 0.8 * 0.6 = 0.4 + 0.48 = 0.88
-        assert result[0].final_score == pytest.approx(0.88)
-    
-    def test_combined_scoring_custom_weights(self):
-        """Test combined scoring with custom weights."""
-        stage = CombinedScoringStage(base_weight=0.3, llm_weight=0.7)
-        themes = [
-            Theme(name="Theme 1", base_score=1.0, llm_score=0.5),
-        ]
-        
-        result = stage.apply(themes)
-        
-        # 1.0 * 0.3 + 0.5 * 0.7 = 0.3 + 0.35 = 0.65
-        assert result[0].final_score == pytest.approx(0.65)
+        assert result[0].final_score == pytest.approx(expected)
 
 
 class TestFinalSortStage:
     """Test FinalSortStage."""
     
-    def test_final_sort(self):
-        """Test final sorting by score."""
-        stage = FinalSortStage()
+    @pytest.mark.parametrize(
+        "top_k, expected",
+        [
+            (None, ["Theme 2", "Theme 3", "Theme 1"]),
+            (1, ["Theme 2"]),
+        ],
+        ids=["full_sort", "top_1"],
+    )
+    def test_final_sort(self, top_k, expected):
+        """Test final sorting by score, optionally keeping only the top themes."""
+        stage = FinalSortStage(top_k=top_k)
         themes = [
-            Theme(name="Theme 1", final_score=0.5),
-            Theme(name="Theme 2", final_score=0.9),
-            Theme(name="Theme 3", final_score=0.7),
+            _copy(THEME_1, final_score=0.5),
+            _copy(THEME_2, final_score=0.9),
+            _copy(THEME_3, final_score=0.7),
         ]
         
         result = stage.apply(themes)
         
-        assert result[0].name == "Theme 2"  # Highest score
-        assert result[1].name == "Theme 3"
-        assert result[2].name == "Theme 1"  # Lowest score
+        assert [theme.name for theme in result] == expected
     
     def test_final_sort_empty(self):
         """Test sorting empty list."""
@@ -1,6 +1,7 @@
 """
 Tests for theme ranking strategies.
 """
+import copy
 import pytest
 from unittest.mock import Mock
 from agents.theme_selection.domain import Theme
@@ -12,28 +13,41 @@ from agents.theme_selection.stages import (
 )
 
 
+@pytest.fixture(scope="module")
+def ranking_strategy():
+    """Rule-based pipeline shared by the module; its stages keep no per-call state."""
+    return PipelineRankingStrategy(stages=[
+        InitialScoringStage(),
+        NormalizationStage(),
+        FinalSortStage(),
+    ])
+
+
 class TestPipelineRankingStrategy:
     """Test PipelineRankingStrategy."""
     
-    def test_pipeline_strategy(self):
-        """Test pipeline strategy with multiple stages."""
-        stages = [
-            InitialScoringStage(),
-            NormalizationStage(),
-            FinalSortStage(),
-        ]
-        strategy = PipelineRankingStrategy(stages=stages)
-        
-        themes = [
+    @pytest.mark.parametrize("themes", [
+        [
             Theme(name="Theme 1", type="indian_cultural"),
             Theme(name="Theme 2", type="global"),
-        ]
+        ],
+        [
+            Theme(name="Theme 1", type="global"),
+            Theme(name="Theme 2", type="indian_achievement"),
+            Theme(name="Theme 3", type="indian_cultural"),
+        ],
+    ], ids=["two_themes", "three_themes"])
+    def test_pipeline_strategy(self, ranking_strategy, themes):
+        """Test pipeline strategy with multiple stages."""
+        # Stages score in place, so rank copies of the parametrized themes
+        themes = [copy.copy(theme) for theme in themes]
         
-        result = strategy.rank(themes)
+        result = ranking_strategy.rank(themes)
         
         # Should be sorted by final score (after normalization)
-        assert len(result) == 2
-        assert result[0].final_score >= result[1].final_score
+        assert len(result) == len(themes)
+        scores = [theme.final_score for theme in result]
+        assert scores == sorted(scores, reverse=True)
     
     def test_pipeline_strategy_empty_stages(self):
         """Test pipeline strategy with no stages."""
@@ -2,10 +2,48 @@
 Tests for Wallpaper Application Agent.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from dataclasses import replace
+from unittest.mock import Mock
 from pathlib import Path
 from agents.wallpaper_application.agent import WallpaperApplicationAgent
-from agents.wallpaper_application.domain import ApplicationRequest, ApplicationResult
+
+
+@pytest.fixture(scope="module")
+def darwin_agent():
+    """
+    WallpaperApplicationAgent built once for the module for macOS.
+
+    Tests replace applier/agent methods with ``monkeypatch`` so the shared
+    instance is restored after each test.
+    """
+    return WallpaperApplicationAgent(target_platform='macos')
+
+
+@pytest.fixture(scope="module")
+def windows_agent():
+    """WallpaperApplicationAgent built once for the module for Windows."""
+    return WallpaperApplicationAgent(target_platform='windows')
+
+
+@pytest.fixture
+def wallpaper_exists(monkeypatch):
+    """Make every wallpaper path look present on disk."""
+    monkeypatch.setattr('pathlib.Path.exists', lambda self: True)
+
+
+@pytest.fixture
+def stub_applier(darwin_agent, monkeypatch):
+    """
+    Install a Mock ``apply_wallpaper`` on ``darwin_agent``'s applier.
+
+    Call it with the ``(success, error)`` tuple the applier should return; it
+    returns the Mock. The original method is restored after the test.
+    """
+    def install(result):
+        apply = Mock(return_value=result)
+        monkeypatch.setattr(darwin_agent._applier, 'apply_wallpaper', apply)
+        return apply
+    return install
 
 
 class TestWallpaperApplicationAgent:
@@ -17,208 +55,183 @@ class TestWallpaperApplicationAgent:
         assert agent is not None
         assert hasattr(agent, 'platform')
     
-    def test_agent_initialization_macos(self):
-        """Test agent initialization on macOS."""
-        with patch('platform.system', return_value='Darwin'):
-            agent = WallpaperApplicationAgent()
-            assert agent.platform == 'macos'
+    @pytest.mark.parametrize("system, expected", [
+        ('Darwin', 'macos'),
+        ('Windows', 'windows'),
+        ('Linux', 'unknown'),
+    ])
+    def test_agent_initialization_platform(self, system, expected, monkeypatch):
+        """Test platform detection from platform.system()."""
+        monkeypatch.setattr('platform.system', lambda: system)
+        assert WallpaperApplicationAgent().platform == expected
     
-    def test_agent_initialization_windows(self):
-        """Test agent initialization on Windows."""
-        with patch('platform.system', return_value='Windows'):
-            agent = WallpaperApplicationAgent()
-            assert agent.platform == 'windows'
+    def test_agent_initialization_explicit_platform(self, monkeypatch):
+        """Test that an explicit platform skips detection."""
+        monkeypatch.setattr('platform.system', lambda: 'Linux')
+        agent = WallpaperApplicationAgent(target_platform='macos')
+        
+        assert agent.platform == 'macos'
+        assert agent._applier is not None
+    
+    @pytest.mark.parametrize("target_platform", ['linux', 'unknown', 'Darwin'])
+    def test_agent_initialization_rejects_unsupported_platform(self, target_platform):
+        """Test that an unsupported explicit platform raises ValueError."""
+        with pytest.raises(ValueError, match="Unsupported platform"):
+            WallpaperApplicationAgent(target_platform=target_platform)
     
-    @patch('platform.system', return_value='Darwin')
-    def test_apply_wallpaper_macos_success(self, mock_platform):
+    @pytest.mark.usefixtures("wallpaper_exists")
+    def test_apply_wallpaper_macos_success(
+        self,
+        darwin_agent,
+        application_request,
+        stub_applier,
+        monkeypatch,
+    ):
         """Test successful wallpaper application on macOS."""
-        with patch.object(WallpaperApplicationAgent, '_get_desktop_count', return_value=1):
-            agent = WallpaperApplicationAgent()
-            
-            # Mock the applier's apply_wallpaper method
-            with patch.object(agent._applier, 'apply_wallpaper', return_value=(True, None)):
-                request = ApplicationRequest(
-                    file_path=Path("/tmp/wallpaper.png"),
-                    desktop_index=0,
-                )
-                
-                # Mock file exists
-                with patch('pathlib.Path.exists', return_value=True):
-                    result = agent.apply_wallpaper(request)
-                    
-                    assert result is not None
-                    assert result.success is True
-                    agent._applier.apply_wallpaper.assert_called_once()
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 1)
+        apply = stub_applier((True, None))
+        
+        request = replace(application_request, desktop_index=0)
+        
+        result = darwin_agent.apply_wallpaper(request)
+        
+        assert result is not None
+        assert result.success is True
+        apply.assert_called_once()
     
-    @patch('platform.system', return_value='Darwin')
-    def test_apply_wallpaper_macos_single_desktop(self, mock_platform):
+    @pytest.mark.usefixtures("wallpaper_exists")
+    def test_apply_wallpaper_macos_single_desktop(
+        self,
+        darwin_agent,
+        application_request,
+        stub_applier,
+        monkeypatch,
+    ):
         """Test applying wallpaper on single desktop (macOS)."""
-        with patch.object(WallpaperApplicationAgent, '_get_desktop_count', return_value=1):
-            agent = WallpaperApplicationAgent()
-            
-            # Mock the applier's apply_wallpaper method
-            with patch.object(agent._applier, 'apply_wallpaper', return_value=(True, None)):
-                request = ApplicationRequest(
-                    file_path=Path("/tmp/wallpaper.png"),
-                )
-                
-                # Mock file exists
-                with patch('pathlib.Path.exists', return_value=True):
-                    result = agent.apply_wallpaper(request)
-                    
-                    # Should apply to desktop 0 (only desktop)
-                    assert result.success is True
-                    assert result.desktop_index == 0
-                    agent._applier.apply_wallpaper.assert_called_once()
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 1)
+        apply = stub_applier((True, None))
+        
+        result = darwin_agent.apply_wallpaper(application_request)
+        
+        # Should apply to desktop 0 (only desktop)
+        assert result.success is True
+        assert result.desktop_index == 0
+        apply.assert_called_once()
     
-    @patch('platform.system', return_value='Darwin')
-    def test_apply_wallpaper_macos_two_desktops(self, mock_platform):
+    @pytest.mark.usefixtures("wallpaper_exists")
+    def test_apply_wallpaper_macos_two_desktops(
+        self,
+        darwin_agent,
+        application_request,
+        stub_applier,
+        monkeypatch,
+    ):
         """Test applying wallpaper on second desktop when two desktops exist."""
-        with patch.object(WallpaperApplicationAgent, '_get_desktop_count', return_value=2):
-            agent = WallpaperApplicationAgent()
-            
-            # Mock the applier's apply_wallpaper method
-            with patch.object(agent._applier, 'apply_wallpaper', return_value=(True, None)):
-                request = ApplicationRequest(
-                    file_path=Path("/tmp/wallpaper.png"),
-                )
-                
-                # Mock file exists
-                with patch('pathlib.Path.exists', return_value=True):
-                    result = agent.apply_wallpaper(request)
-                    
-                    # Should apply to desktop 1 (second desktop)
-                    assert result.success is True
-                    assert result.desktop_index == 1
-                    agent._applier.apply_wallpaper.assert_called_once()
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 2)
+        apply = stub_applier((True, None))
+        
+        result = darwin_agent.apply_wallpaper(application_request)
+        
+        # Should apply to desktop 1 (second desktop)
+        assert result.success is True
+        assert result.desktop_index == 1
+        apply.assert_called_once()
     
-    @patch('platform.system', return_value='Darwin')
-    def test_apply_wallpaper_macos_custom_desktop(self, mock_platform):
+    @pytest.mark.usefixtures("wallpaper_exists")
+    def test_apply_wallpaper_macos_custom_desktop(
+        self,
+        darwin_agent,
+        application_request,
+        stub_applier,
+        monkeypatch,
+    ):
         """Test applying wallpaper to specific desktop."""
-        agent = WallpaperApplicationAgent()
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 2)
+        apply = stub_applier((True, None))
+        
+        request = replace(application_request, desktop_index=0)  # Explicitly set to first desktop
+        
+        result = darwin_agent.apply_wallpaper(request)
         
-        # Mock the applier's apply_wallpaper method
-        with patch.object(agent._applier, 'apply_wallpaper', return_value=(True, None)):
-            request = ApplicationRequest(
-                file_path=Path("/tmp/wallpaper.png"),
-                desktop_index=0,  # Explicitly set to first desktop
-            )
-            
-            # Mock file exists
-            with patch('pathlib.Path.exists', return_value=True):
-                result = agent.apply_wallpaper(request)
-                
-                assert result.success is True
-                assert result.desktop_index == 0
+        assert result.success is True
+        assert result.desktop_index == 0
+        apply.assert_called_once_with(file_path=request.file_path, desktop_index=0)
     
-    @patch('platform.system', return_value='Darwin')
-    def test_apply_wallpaper_file_not_found(self, mock_platform):
+    def test_apply_wallpaper_file_not_found(self, darwin_agent, application_request):
         """Test handling of missing wallpaper file."""
-        agent = WallpaperApplicationAgent()
-        
-        request = ApplicationRequest(
-            file_path=Path("/nonexistent/wallpaper.png"),
-        )
+        request = replace(application_request, file_path=Path("/nonexistent/wallpaper.png"))
         
-        result = agent.apply_wallpaper(request)
+        result = darwin_agent.apply_wallpaper(request)
         
         assert result is not None
         assert result.success is False
         assert result.error is not None
         assert "not found" in result.error.lower() or "does not exist" in result.error.lower()
     
-    @patch('platform.system', return_value='Darwin')
-    def test_apply_wallpaper_osascript_failure(self, mock_platform):
+    @pytest.mark.usefixtures("wallpaper_exists")
+    def test_apply_wallpaper_osascript_failure(
+        self,
+        darwin_agent,
+        application_request,
+        stub_applier,
+        monkeypatch,
+    ):
         """Test handling of osascript command failure."""
-        with patch.object(WallpaperApplicationAgent, '_get_desktop_count', return_value=1):
-            agent = WallpaperApplicationAgent()
-            
-            # Mock the applier's apply_wallpaper method to return failure
-            with patch.object(agent._applier, 'apply_wallpaper', return_value=(False, "osascript error")):
-                request = ApplicationRequest(
-                    file_path=Path("/tmp/wallpaper.png"),
-                )
-                
-                # Mock file exists
-                with patch('pathlib.Path.exists', return_value=True):
-                    result = agent.apply_wallpaper(request)
-                    
-                    assert result.success is False
-                    assert result.error is not None
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 1)
+        # Make the applier's apply_wallpaper method return failure
+        stub_applier((False, "osascript error"))
+        
+        result = darwin_agent.apply_wallpaper(application_request)
+        
+        assert result.success is False
+        assert result.error is not None
     
-    @patch('platform.system', return_value='Darwin')
-    def test_get_desktop_count(self, mock_platform):
+    def test_get_desktop_count(self, darwin_agent, monkeypatch):
         """Test getting desktop count on macOS."""
-        agent = WallpaperApplicationAgent()
+        monkeypatch.setattr(darwin_agent._applier, 'get_desktop_count', Mock(return_value=2))
         
-        # Mock the applier's get_desktop_count method
-        with patch.object(agent._applier, 'get_desktop_count', return_value=2):
-            count = agent._get_desktop_count()
-            
-            assert count == 2
-            agent._applier.get_desktop_count.assert_called_once()
+        count = darwin_agent._get_desktop_count()
+        
+        assert count == 2
+        darwin_agent._applier.get_desktop_count.assert_called_once()
     
-    @patch('platform.system', return_value='Darwin')
-    def test_get_desktop_count_error(self, mock_platform):
+    def test_get_desktop_count_error(self, darwin_agent, monkeypatch):
         """Test handling of desktop count detection error."""
-        agent = WallpaperApplicationAgent()
+        # The applier's get_desktop_count returns 1 (default on error)
+        monkeypatch.setattr(darwin_agent._applier, 'get_desktop_count', lambda: 1)
+        
+        count = darwin_agent._get_desktop_count()
         
-        # Mock the applier's get_desktop_count method to return 1 (default on error)
-        with patch.object(agent._applier, 'get_desktop_count', return_value=1):
-            count = agent._get_desktop_count()
-            
-            # Should default to 1 on error
-            assert count == 1
+        # Should default to 1 on error
+        assert count == 1
     
-    @patch('platform.system', return_value='Darwin')
-    def test_select_desktop_index(self, mock_platform):
+    def test_select_desktop_index(self, darwin_agent, monkeypatch):
         """Test desktop index selection logic."""
-        agent = WallpaperApplicationAgent()
-        
         # Single desktop - should use 0
-        with patch.object(agent, '_get_desktop_count', return_value=1):
-            index = agent._select_desktop_index(None)
-            assert index == 0
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 1)
+        assert darwin_agent._select_desktop_index(None) == 0
         
         # Two desktops - should use 1 (second desktop)
-        with patch.object(agent, '_get_desktop_count', return_value=2):
-            index = agent._select_desktop_index(None)
-            assert index == 1
+        monkeypatch.setattr(darwin_agent, '_get_desktop_count', lambda: 2)
+        assert darwin_agent._select_desktop_index(None) == 1
         
         # Explicit index provided
-        index = agent._select_desktop_index(0)
-        assert index == 0
+        assert darwin_agent._select_desktop_index(0) == 0
     
-    @patch('platform.system', return_value='Windows')
-    def test_apply_wallpaper_windows_not_implemented(self, mock_platform):
+    @pytest.mark.usefixtures("wallpaper_exists")
+    def test_apply_wallpaper_windows_not_implemented(self, windows_agent, application_request):
         """Test that Windows implementation is not yet available."""
-        agent = WallpaperApplicationAgent()
-        
-        request = ApplicationRequest(
-            file_path=Path("/tmp/wallpaper.png"),
-        )
+        result = windows_agent.apply_wallpaper(application_request)
         
-        # Mock file exists to get past file validation
-        with patch('pathlib.Path.exists', return_value=True):
-            result = agent.apply_wallpaper(request)
-            
-            assert result.success is False
-            assert "not implemented" in result.error.lower() or "windows" in result.error.lower()
+        assert result.success is False
+        assert "not implemented" in result.error.lower() or "windows" in result.error.lower()
     
-    @patch('platform.system', return_value='Darwin')
-    def test_validate_request(self, mock_platform):
+    def test_validate_request(self, darwin_agent, application_request):
         """Test request validation."""
-        agent = WallpaperApplicationAgent()
-        
         # Valid request
-        valid_request = ApplicationRequest(
-            file_path=Path("/tmp/wallpaper.png"),
-        )
-        assert agent._validate_request(valid_request) is True
+        assert darwin_agent._validate_request(application_request) is True
         
         # Invalid - no file path
-        invalid_request = ApplicationRequest(
-            file_path=None,
-        )
-        assert agent._validate_request(invalid_request) is False
+        invalid_request = replace(application_request, file_path=None)
+        assert darwin_agent._validate_request(invalid_request) is False
 
@@ -2,10 +2,107 @@
 Tests for Wallpaper Generation Agent.
 """
 import pytest
-from unittest.mock import Mock, MagicMock, patch, mock_open
+from dataclasses import replace
 from pathlib import Path
 from agents.wallpaper_generation.agent import WallpaperGenerationAgent
-from agents.wallpaper_generation.domain import WallpaperRequest, WallpaperResult
+
+# Path the patched process_wallpaper reports for the processed image
+PROCESSED_PATH = Path("/tmp/wallpaper.jpg")
+
+
+class FakeImageClient:
+    """
+    Minimal stand-in for ``PollinationsClient``.
+
+    ``calls`` captures the ``(args, kwargs)`` of every ``generate_image``
+    call; ``exc`` (if given) is raised instead of returning ``response``.
+    """
+
+    __slots__ = ("response", "exc", "calls")
+
+    def __init__(self, response=b"fake_image_data", exc=None):
+        self.response = response
+        self.exc = exc
+        self.calls = []
+
+    def generate_image(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if self.exc is not None:
+            raise self.exc
+        return self.response
+
+
+# Wallpaper settings every agent in this module is built with
+WALLPAPER_CONFIG = {
+    "width": 3024,
+    "height": 1964,
+    "directory": "./wallpapers",
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def wallpaper_config(module_mocker):
+    """Serve WALLPAPER_CONFIG from get_wallpaper_config for the whole module."""
+    module_mocker.patch('agents.wallpaper_generation.agent.get_wallpaper_config', return_value=WALLPAPER_CONFIG)
+    return WALLPAPER_CONFIG
+
+
+@pytest.fixture(scope="module")
+def agent(wallpaper_config, module_mocker):
+    """
+    WallpaperGenerationAgent shared by the module.
+
+    Tests install their own ``image_client`` with ``monkeypatch``.
+    """
+    return WallpaperGenerationAgent(config=module_mocker.Mock(), image_client=module_mocker.Mock())
+
+
+# generate_wallpaper scenarios: base request fixture, field overrides,
+# injected failures, and expectations. Every request reaches the image
+# client, so each also checks the prompt.
+GENERATE_CASES = {
+    "success": {
+        "base": "wallpaper_request",
+        "overrides": {"theme_name": "Diwali"},
+        "prompt_contains": "Diwali",
+        "success": True,
+    },
+    "builds_prompt": {
+        "base": "diwali_request",
+        "prompt_contains": "featuring lights, diya",
+        "success": True,
+    },
+    "uses_style_guidelines": {
+        "base": "wallpaper_request",
+        "overrides": {
+            "style_guidelines": {
+                "prompt": "Custom prompt from style guidelines",
+                "color_palette": ["#000000"],
+            },
+        },
+        "prompt_contains": "Custom prompt",
+        "success": True,
+    },
+    "default_dimensions": {
+        # No width/height: the agent falls back to WALLPAPER_CONFIG
+        "base": "wallpaper_request",
+        "overrides": {"width": None, "height": None},
+        "prompt_contains": "Test prompt",
+        "success": True,
+    },
+    "image_generation_failure": {
+        "base": "wallpaper_request",
+        "generate_error": Exception("API Error"),
+        "prompt_contains": "Test prompt",
+        "success": False,
+    },
+    "image_processing_failure": {
+        "base": "wallpaper_request",
+        "process_error": Exception("Processing Error"),
+        "prompt_contains": "Test prompt",
+        "success": False,
+    },
+}
 
 
 class TestWallpaperGenerationAgent:
@@ -18,269 +115,91 @@ class TestWallpaperGenerationAgent:
         assert hasattr(agent, 'image_client')
         assert hasattr(agent, 'config')
     
-    def test_agent_initialization_with_custom_clients(self):
+    def test_agent_initialization_with_custom_clients(self, mocker):
         """Test agent initialization with custom clients."""
-        mock_image_client = Mock()
-        mock_config = Mock()
-        
-        # Mock get_wallpaper_config to return proper dict
-        with patch('agents.wallpaper_generation.agent.get_wallpaper_config') as mock_get_config:
-            mock_get_config.return_value = {
-                "width": 3024,
-                "height": 1964,
-                "directory": "./wallpapers",
-            }
-            
-            agent = WallpaperGenerationAgent(
-                config=mock_config,
-                image_client=mock_image_client,
-            )
-            
-            assert agent.image_client == mock_image_client
-            assert agent.config == mock_config
-    
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    @patch('PIL.Image.open')
-    def test_generate_wallpaper_success(self, mock_image_open, mock_client_class):
-        """Test successful wallpaper generation."""
-        # Mock image client
-        mock_client = MagicMock()
-        mock_client.generate_image.return_value = b"fake_image_data"
-        mock_client_class.return_value = mock_client
+        mock_image_client = mocker.Mock()
+        mock_config = mocker.Mock()
         
-        # Mock PIL Image
-        mock_image = MagicMock()
-        mock_image_open.return_value = mock_image
+        agent = WallpaperGenerationAgent(
+            config=mock_config,
+            image_client=mock_image_client,
+        )
         
-        # Mock image processor
-        with patch('agents.wallpaper_generation.agent.process_wallpaper') as mock_process:
-            mock_process.return_value = Path("/tmp/wallpaper.jpg")
-            
-            agent = WallpaperGenerationAgent(image_client=mock_client)
-            
-            request = WallpaperRequest(
-                theme_name="Diwali",
-                style_guidelines={
-                    "prompt": "Minimalistic dark-themed wallpaper",
-                    "color_palette": ["#1a1a1a", "#2d2d2d"],
-                },
-                width=3024,
-                height=1964,
-            )
-            
-            result = agent.generate_wallpaper(request)
-            
-            assert result is not None
-            assert result.success is True
-            assert result.file_path is not None
-            mock_client.generate_image.assert_called_once()
-            mock_process.assert_called_once()
+        assert agent.image_client == mock_image_client
+        assert agent.config == mock_config
     
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    def test_generate_wallpaper_image_generation_failure(self, mock_client_class):
-        """Test handling of image generation failure."""
-        mock_client = MagicMock()
-        mock_client.generate_image.side_effect = Exception("API Error")
-        mock_client_class.return_value = mock_client
-        
-        agent = WallpaperGenerationAgent(image_client=mock_client)
-        
-        request = WallpaperRequest(
-            theme_name="Test Theme",
-            style_guidelines={"prompt": "Test prompt"},
-            width=3024,
-            height=1964,
+    @pytest.mark.parametrize("case", list(GENERATE_CASES))
+    def test_generate_wallpaper(self, case, agent, monkeypatch, mocker, request):
+        """Test wallpaper generation outcomes, prompt building and dimensions."""
+        spec = GENERATE_CASES[case]
+        wallpaper_request = replace(request.getfixturevalue(spec["base"]), **spec.get("overrides", {}))
+        
+        image_client = FakeImageClient(exc=spec.get("generate_error"))
+        monkeypatch.setattr(agent, "image_client", image_client)
+        
+        mocker.patch('PIL.Image.open')
+        mock_process = mocker.patch(
+            'utils.image_processor.process_wallpaper',
+            return_value=PROCESSED_PATH,
+            side_effect=spec.get("process_error"),
         )
         
-        result = agent.generate_wallpaper(request)
+        result = agent.generate_wallpaper(wallpaper_request)
         
-        assert result is not None
-        assert result.success is False
-        assert result.error is not None
-    
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    def test_generate_wallpaper_image_processing_failure(self, mock_client_class):
-        """Test handling of image processing failure."""
-        mock_client = MagicMock()
-        mock_client.generate_image.return_value = b"fake_image_data"
-        mock_client_class.return_value = mock_client
+        [(_, kwargs)] = image_client.calls
+        prompt = kwargs["prompt"]
+        assert spec["prompt_contains"] in prompt
         
-        with patch('agents.wallpaper_generation.agent.process_wallpaper') as mock_process:
-            mock_process.side_effect = Exception("Processing Error")
-            
-            agent = WallpaperGenerationAgent(image_client=mock_client)
-            
-            request = WallpaperRequest(
-                theme_name="Test Theme",
-                style_guidelines={"prompt": "Test prompt"},
-                width=3024,
-                height=1964,
-            )
-            
-            result = agent.generate_wallpaper(request)
-            
-            assert result is not None
+        if spec["success"]:
+            assert result.success is True
+            assert result.file_path == PROCESSED_PATH
+            mock_process.assert_called_once()
+            call_kwargs = mock_process.call_args.kwargs
+            assert call_kwargs["target_width"] == WALLPAPER_CONFIG["width"]
+            assert call_kwargs["target_height"] == WALLPAPER_CONFIG["height"]
+        else:
             assert result.success is False
             assert result.error is not None
     
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    def test_generate_wallpaper_builds_prompt(self, mock_client_class):
-        """Test that agent builds proper prompt for image generation."""
-        mock_client = MagicMock()
-        mock_client.generate_image.return_value = b"fake_image_data"
-        mock_client_class.return_value = mock_client
-        
-        with patch('agents.wallpaper_generation.agent.process_wallpaper') as mock_process:
-            mock_process.return_value = Path("/tmp/wallpaper.jpg")
-            
-            agent = WallpaperGenerationAgent(image_client=mock_client)
-            
-            request = WallpaperRequest(
-                theme_name="Diwali",
-                style_guidelines={
-                    "prompt": "Minimalistic dark-themed wallpaper featuring Diwali",
-                    "color_palette": ["#1a1a1a", "#2d2d2d"],
-                    "key_elements": ["lights", "diya"],
-                },
-                width=3024,
-                height=1964,
-            )
-            
-            result = agent.generate_wallpaper(request)
-            
-            # Verify prompt was built correctly
-            call_args = mock_client.generate_image.call_args
-            assert call_args is not None
-            prompt = call_args[0][0] if call_args[0] else call_args[1].get('prompt', '')
-            assert "Diwali" in prompt or "diwali" in prompt.lower()
-    
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    def test_generate_wallpaper_uses_style_guidelines(self, mock_client_class):
-        """Test that agent uses style guidelines in prompt."""
-        mock_client = MagicMock()
-        mock_client.generate_image.return_value = b"fake_image_data"
-        mock_client_class.return_value = mock_client
-        
-        with patch('agents.wallpaper_generation.agent.process_wallpaper') as mock_process:
-            mock_process.return_value = Path("/tmp/wallpaper.jpg")
-            
-            agent = WallpaperGenerationAgent(image_client=mock_client)
-            
-            request = WallpaperRequest(
-                theme_name="Test Theme",
-                style_guidelines={
-                    "prompt": "Custom prompt from style guidelines",
-                    "color_palette": ["#000000"],
-                },
-                width=3024,
-                height=1964,
-            )
-            
-            result = agent.generate_wallpaper(request)
-            
-            # Verify custom prompt was used
-            call_args = mock_client.generate_image.call_args
-            prompt = call_args[0][0] if call_args[0] else call_args[1].get('prompt', '')
-            assert "Custom prompt" in prompt
-    
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    @patch('PIL.Image.open')
-    def test_generate_wallpaper_default_dimensions(self, mock_image_open, mock_client_class):
-        """Test that agent uses default dimensions from config."""
-        mock_client = MagicMock()
-        mock_client.generate_image.return_value = b"fake_image_data"
-        mock_client_class.return_value = mock_client
-        
-        # Mock PIL Image
-        mock_image = MagicMock()
-        mock_image_open.return_value = mock_image
-        
-        mock_config = Mock()
-        
-        with patch('agents.wallpaper_generation.agent.get_wallpaper_config') as mock_get_config:
-            mock_get_config.return_value = {
-                "width": 3024,
-                "height": 1964,
-                "directory": "./wallpapers",
-            }
-            
-            with patch('agents.wallpaper_generation.agent.process_wallpaper') as mock_process:
-                mock_process.return_value = Path("/tmp/wallpaper.jpg")
-                
-                agent = WallpaperGenerationAgent(config=mock_config, image_client=mock_client)
-                
-                request = WallpaperRequest(
-                    theme_name="Test Theme",
-                    style_guidelines={"prompt": "Test prompt"},
-                    # No width/height specified
-                )
-                
-                result = agent.generate_wallpaper(request)
-                
-                # Verify process_wallpaper was called with config dimensions
-                mock_process.assert_called_once()
-                call_kwargs = mock_process.call_args[1]  # keyword arguments
-                # Check that dimensions match config
-                assert call_kwargs.get("target_width") == 3024
-                assert call_kwargs.get("target_height") == 1964
-    
-    def test_build_prompt_from_style_guidelines(self):
-        """Test building prompt from style guidelines."""
-        agent = WallpaperGenerationAgent()
-        
-        style_guidelines = {
-            "prompt": "Minimalistic dark-themed wallpaper",
-            "color_palette": ["#1a1a1a", "#2d2d2d"],
-            "key_elements": ["lights", "diya"],
-        }
-        
-        prompt = agent._build_prompt("Diwali", style_guidelines)
-        
-        assert "Diwali" in prompt
-        assert "dark" in prompt.lower() or "minimalistic" in prompt.lower()
-    
-    def test_build_prompt_fallback(self):
-        """Test prompt building with minimal style guidelines."""
-        agent = WallpaperGenerationAgent()
-        
-        style_guidelines = {
-            "prompt": "Simple prompt",
-        }
-        
-        prompt = agent._build_prompt("Test Theme", style_guidelines)
-        
-        assert "Test Theme" in prompt
-        assert "Simple prompt" in prompt
+    @pytest.mark.parametrize("theme_name, style_guidelines, expected", [
+        (
+            "Diwali",
+            {
+                "prompt": "Minimalistic dark-themed wallpaper",
+                "color_palette": ["#1a1a1a", "#2d2d2d"],
+                "key_elements": ["lights", "diya"],
+            },
+            ["Diwali", "color palette: #1a1a1a, #2d2d2d", "dark background"],
+        ),
+        ("Test Theme", {"prompt": "Simple prompt"}, ["Test Theme", "Simple prompt"]),
+        ("Holi", {}, ["Minimalistic dark-themed wallpaper featuring Holi"]),
+    ], ids=["style_guidelines", "minimal_guidelines", "no_prompt"])
+    def test_build_prompt(self, agent, theme_name, style_guidelines, expected):
+        """Test building the image prompt from a theme name and style guidelines."""
+        prompt = agent._build_prompt(theme_name, style_guidelines)
+        
+        for fragment in expected:
+            assert fragment in prompt
     
-    def test_validate_request(self):
+    def test_validate_request(self, wallpaper_request):
         """Test request validation."""
         agent = WallpaperGenerationAgent()
         
         # Valid request
-        valid_request = WallpaperRequest(
-            theme_name="Test",
-            style_guidelines={"prompt": "Test"},
-            width=3024,
-            height=1964,
-        )
-        assert agent._validate_request(valid_request) is True
+        assert agent._validate_request(wallpaper_request) is True
         
         # Invalid request - missing theme name
-        invalid_request = WallpaperRequest(
-            theme_name="",
-            style_guidelines={"prompt": "Test"},
-        )
+        invalid_request = replace(wallpaper_request, theme_name="")
         assert agent._validate_request(invalid_request) is False
     
-    @patch('agents.wallpaper_generation.agent.PollinationsClient')
-    def test_generate_wallpaper_invalid_request(self, mock_client_class):
+    def test_generate_wallpaper_invalid_request(self, wallpaper_request):
         """Test handling of invalid request."""
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
+        image_client = FakeImageClient()
         
-        agent = WallpaperGenerationAgent(image_client=mock_client)
+        agent = WallpaperGenerationAgent(image_client=image_client)
         
-        invalid_request = WallpaperRequest(
+        invalid_request = replace(
+            wallpaper_request,
             theme_name="",  # Invalid
             style_guidelines={},
         )
@@ -290,5 +209,5 @@ class TestWallpaperGenerationAgent:
         assert result is not None
         assert result.success is False
         assert result.error is not None
-        mock_client.generate_image.assert_not_called()
+        assert image_client.calls == []
 